@@ -1,4 +1,5 @@
 import logging
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -21,11 +22,96 @@ class Settings(BaseSettings):
     # LLM
     llm_provider: str = "claude"
     claude_api_key: str
+    # Ask the provider for schema-constrained JSON (tool use) where supported
+    llm_structured_output: bool = True
+    # Mark static system prompts for provider-side prefix caching
+    llm_prompt_caching: bool = True
+
+    # Model routing: call site -> tier -> model. Output failing validation on a
+    # cheaper tier is retried on the default tier. Prices are USD per million
+    # (input, output) tokens, used for per-route cost accounting.
+    llm_model_tiers: dict[str, str] = {
+        "default": "claude-sonnet-4-5",
+        "fast": "claude-haiku-4-5",
+    }
+    llm_route_tiers: dict[str, str] = {
+        "resume.parse": "fast",
+        "jobs.analyze": "fast",
+        "github.categorize_technologies": "fast",
+        "export.categorize_skills": "fast",
+    }
+    llm_model_prices: dict[str, tuple[float, float]] = {
+        "claude-sonnet-4-5": (3.0, 15.0),
+        "claude-haiku-4-5": (1.0, 5.0),
+    }
+
+    # On-disk cache for deterministic LLM prompts (opt-in per call site)
+    llm_cache_enabled: bool = False
+    llm_cache_path: str = ".cache/llm_responses.sqlite3"
+    llm_cache_max_mb: int = 64
+    llm_cache_stream_chunk_chars: int = 64
+
+    # Outbound LLM scheduling: in-flight cap and per-minute budgets (0 = unlimited)
+    llm_max_concurrency: int = 8
+    llm_requests_per_minute: int = 0
+    llm_tokens_per_minute: int = 0
+
+    # LLM retries (jittered backoff, Retry-After up to a cap) and circuit breaker
+    llm_max_retries: int = 3
+    llm_retry_base_delay: float = 0.5
+    llm_retry_max_delay: float = 8.0
+    llm_retry_after_max: float = 20.0
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_reset_seconds: float = 30.0
 
     # File limits
     max_file_size_mb: int = 10
     allowed_file_types: list[str] = ["pdf", "docx", "txt"]
 
+    # Optimization: "multi_call" (keywords, experience, interview prompts) or
+    # "single_call" (one merged prompt streamed section by section)
+    optimization_mode: Literal["multi_call", "single_call"] = "multi_call"
+    # Experience enhancement: roles enhanced in parallel, bullet budget per resume
+    optimization_experience_concurrency: int = 3
+    optimization_max_experience_bullets: int = 12
+    # ATS keyword matching: "fuzzy" adds token-set and bounded edit-distance
+    # matches on top of alias-resolved equality ("exact")
+    ats_keyword_matching: Literal["exact", "fuzzy"] = "fuzzy"
+    ats_fuzzy_max_distance: int = 2
+    # Semantic skill matching (needs the "semantic" extra): local CPU embeddings,
+    # cached per skill in a float32 store; cosine >= threshold counts as a match
+    semantic_matching_enabled: bool = False
+    semantic_model: str = "BAAI/bge-small-en-v1.5"
+    semantic_match_threshold: float = 0.82
+    semantic_store_path: str = ".cache/skill_embeddings"
+
+    # Export: WeasyPrint worker processes for HTML templates (fonts warmed at
+    # startup), the per-render deadline before falling back to ReportLab, and
+    # renders queued beyond the workers before a 503 with Retry-After
+    export_pdf_workers: int = 2
+    export_pdf_timeout_seconds: float = 15.0
+    export_pdf_queue_depth: int = 4
+    export_pdf_warm_on_startup: bool = True
+    # Export: worker processes for ReportLab/python-docx rendering and batches;
+    # jobs beyond workers + queue depth get a 503 with Retry-After
+    export_render_workers: int = 2
+    export_render_queue_depth: int = 8
+    export_render_retry_after_seconds: int = 2
+    # Export: directory for rendered documents waiting to be streamed (system temp dir if unset)
+    export_spool_dir: str | None = None
+    # Export: template preview thumbnails, rendered once per template version
+    export_preview_dir: str = ".cache/template_previews"
+    export_preview_width: int = 360
+    export_preview_warm_on_startup: bool = True
+    # Export: prepared resumes (categorized skills, escaped text) kept by content hash
+    export_prepared_cache_size: int = 128
+    # Export: add a Server-Timing header (per-stage durations) to export responses
+    export_server_timing: bool = False
+
+    # Resume parsing: rule-based fast path before the LLM
+    resume_fast_path_enabled: bool = True
+    resume_fast_path_min_confidence: float = 0.8
+
     class Config:
         env_file = ".env"
         extra = "ignore"
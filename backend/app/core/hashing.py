@@ -0,0 +1,9 @@
+import hashlib
+import json
+from typing import Any
+
+
+def content_hash(value: Any) -> str:
+    """Stable hash of JSON-serialisable content, independent of key order"""
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
@@ -1,35 +1,557 @@
+import asyncio
+import json
+import logging
+import math
 import os
+import re
+import time
+from collections.abc import AsyncIterator
+from collections.abc import Awaitable
+from collections.abc import Callable
+from dataclasses import asdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
 
 from litellm import completion
+from pydantic import BaseModel
+from pydantic import TypeAdapter
+from pydantic import ValidationError
 
 from app.core.config import settings
+from app.core.llm_cache import LLMResponseCache
+from app.core.llm_resilience import CircuitBreaker
+from app.core.llm_resilience import LLMBadRequestError  # noqa: F401 - re-exported
+from app.core.llm_resilience import LLMError
+from app.core.llm_resilience import LLMRateLimitError  # noqa: F401 - re-exported
+from app.core.llm_resilience import LLMUnavailableError  # noqa: F401 - re-exported
+from app.core.llm_resilience import RetryPolicy
+from app.core.llm_resilience import classify_error
+from app.core.llm_routing import DEFAULT_CALL_SITE
+from app.core.llm_routing import escalation_model
+from app.core.llm_routing import get_route_stats  # noqa: F401 - re-exported
+from app.core.llm_routing import model_for
+from app.core.llm_routing import record_cache_hit
+from app.core.llm_routing import record_call
+from app.core.llm_routing import record_error
+from app.core.llm_routing import record_escalation
+from app.core.llm_scheduler import LLMPriority
+from app.core.llm_scheduler import LLMScheduler
+from app.core.llm_scheduler import estimate_tokens
+
+logger = logging.getLogger(__name__)
 
 # Set API key for LiteLLM
 os.environ["ANTHROPIC_API_KEY"] = settings.claude_api_key
 
-async def get_llm_response(messages: list, model: str = "claude-sonnet-4-5") -> str:
-    """Get response from Claude via LiteLLM"""
-    try:
-        response = completion(
-            model=model,
-            messages=messages,
-            temperature=0.1
+LLM_TEMPERATURE = 0.1
+
+scheduler = LLMScheduler(
+    settings.llm_max_concurrency,
+    requests_per_minute=settings.llm_requests_per_minute,
+    tokens_per_minute=settings.llm_tokens_per_minute,
+)
+retry_policy = RetryPolicy(
+    settings.llm_max_retries,
+    base_delay=settings.llm_retry_base_delay,
+    max_delay=settings.llm_retry_max_delay,
+    max_retry_after=settings.llm_retry_after_max,
+)
+circuit_breaker = CircuitBreaker(
+    settings.llm_breaker_failure_threshold, settings.llm_breaker_reset_seconds
+)
+
+_response_cache: LLMResponseCache | None = None
+
+
+def build_messages(static: str, dynamic: str) -> list[dict]:
+    """Split a prompt into a static system block and a per-request user block.
+
+    ``static`` must be identical across calls (instructions, schema, rules)
+    so the provider can reuse its cached prefix; it is marked with
+    cache_control when llm_prompt_caching is on. Providers ignore the marker
+    for prefixes shorter than their minimum cacheable length.
+    """
+    system_block = {"type": "text", "text": static}
+    if settings.llm_prompt_caching:
+        system_block["cache_control"] = {"type": "ephemeral"}
+    return [
+        {"role": "system", "content": [system_block]},
+        {"role": "user", "content": dynamic},
+    ]
+
+
+def get_response_cache() -> LLMResponseCache | None:
+    """Shared response cache, or None when llm_cache_enabled is off"""
+    global _response_cache
+    if not settings.llm_cache_enabled:
+        return None
+    if _response_cache is None:
+        _response_cache = LLMResponseCache(
+            settings.llm_cache_path, settings.llm_cache_max_mb * 1024 * 1024
         )
-        return response.choices[0].message.content
-    except Exception as e:
-        raise Exception(f"LLM request failed: {e!s}")
+    return _response_cache
+
+
+def get_response_cache_stats() -> dict:
+    cache = get_response_cache()
+    return cache.stats() if cache else {"enabled": False}
+
+
+def _cache_key(model: str, messages: list, response_format: Any = None) -> str:
+    schema_name = getattr(response_format, "__name__", response_format)
+    return LLMResponseCache.make_key(
+        model, messages, LLM_TEMPERATURE, response_format=schema_name
+    )
+
+
+def get_scheduler_stats() -> dict:
+    return scheduler.stats()
+
+
+def get_circuit_breaker_stats() -> dict:
+    return circuit_breaker.stats()
+
+
+def ensure_llm_available() -> None:
+    """Raise LLMUnavailableError up front while the circuit breaker is open"""
+    circuit_breaker.ensure_available()
+
+
+def retry_after_seconds(error: LLMError) -> int:
+    """Whole seconds for a Retry-After header on a 503"""
+    return max(1, math.ceil(error.retry_after or settings.llm_retry_max_delay))
+
+
+def _usage_tokens(response: Any, messages: list, content: str) -> dict[str, int]:
+    """Token counts from the provider's usage block, estimated when absent.
+
+    ``input_tokens`` includes prompt-cache reads and writes, as litellm
+    reports them; those are broken out for cost accounting.
+    """
+    usage = getattr(response, "usage", None)
+
+    def count(name: str) -> int | None:
+        value = getattr(usage, name, None)
+        return value if isinstance(value, int) else None
+
+    return {
+        "input_tokens": count("prompt_tokens") or estimate_tokens(messages),
+        "output_tokens": count("completion_tokens") or len(content) // 4,
+        "cache_read_tokens": count("cache_read_input_tokens") or 0,
+        "cache_write_tokens": count("cache_creation_input_tokens") or 0,
+    }
+
+
+def _handle_failure(error: Exception, attempt: int, retryable: bool = True) -> tuple[LLMError, float | None]:
+    """Classify a failed attempt, feed the breaker and pick a retry delay"""
+    llm_error = classify_error(error)
+    circuit_breaker.record_failure(llm_error)
+    delay = retry_policy.delay(llm_error, attempt) if retryable else None
+    if delay is not None:
+        logger.warning("llm.request.retry", extra={
+            "attempt": attempt + 1, "delay_s": round(delay, 2), "error": str(llm_error),
+        })
+    return llm_error, delay
+
+
+async def get_llm_response(
+    messages: list,
+    model: str | None = None,
+    response_format: Any = None,
+    cache: bool = False,
+    priority: LLMPriority = LLMPriority.INTERACTIVE,
+    call_site: str = DEFAULT_CALL_SITE,
+) -> str:
+    """Get response from Claude via LiteLLM
+
+    ``model`` defaults to the tier routed for ``call_site``, under which
+    latency, tokens and cost are accounted. With ``cache=True`` (and llm_cache_enabled) identical requests are
+    served from the on-disk response cache. Provider calls wait for a
+    scheduler slot at ``priority`` and run off the event loop; transient
+    failures are retried per retry_policy.
+
+    Raises LLMError (LLMUnavailableError for outages and rate limits).
+    """
+    model = model or model_for(call_site)
+    response_cache = get_response_cache() if cache else None
+    if response_cache:
+        key = _cache_key(model, messages, response_format)
+        cached = response_cache.get(key)
+        if cached is not None:
+            record_cache_hit(call_site)
+            return cached
+
+    kwargs = {"response_format": response_format} if response_format is not None else {}
+    tokens = estimate_tokens(messages)
+    started = time.perf_counter()
+    attempt = 0
+    while True:
+        circuit_breaker.before_call()
+        try:
+            async with scheduler.slot(priority, tokens):
+                response = await asyncio.to_thread(
+                    completion,
+                    model=model,
+                    messages=messages,
+                    temperature=LLM_TEMPERATURE,
+                    **kwargs
+                )
+            content = response.choices[0].message.content
+        except Exception as e:
+            error, delay = _handle_failure(e, attempt)
+            if delay is None:
+                record_error(call_site)
+                raise error from e
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        circuit_breaker.record_success()
+        break
+
+    record_call(call_site, model, time.perf_counter() - started, **_usage_tokens(response, messages, content or ""))
+    if response_cache and content:
+        response_cache.set(key, content)
+    return content
+
+async def stream_llm_response(
+    messages: list,
+    model: str | None = None,
+    cache: bool = False,
+    priority: LLMPriority = LLMPriority.INTERACTIVE,
+    call_site: str = DEFAULT_CALL_SITE,
+):
+    """Stream response from Claude via LiteLLM
+
+    With ``cache=True`` a cached reply is replayed in chunks; a fresh reply
+    is only stored once the stream has completed without error. The
+    scheduler slot is held until the stream is exhausted. Failures before
+    the first chunk are retried like get_llm_response; later failures
+    raise, since the caller already holds partial output.
+
+    Raises LLMError (LLMUnavailableError for outages and rate limits).
+    """
+    model = model or model_for(call_site)
+    response_cache = get_response_cache() if cache else None
+    if response_cache:
+        key = _cache_key(model, messages)
+        cached = response_cache.get(key)
+        if cached is not None:
+            record_cache_hit(call_site)
+            size = settings.llm_cache_stream_chunk_chars
+            for start in range(0, len(cached), size):
+                yield cached[start:start + size]
+            return
+
+    chunks = []
+    tokens = estimate_tokens(messages)
+    started = time.perf_counter()
+    first_token_at: float | None = None
+    attempt = 0
+    while True:
+        circuit_breaker.before_call()
+        delay = None
+        async with scheduler.slot(priority, tokens):
+            try:
+                response = await asyncio.to_thread(
+                    completion,
+                    model=model,
+                    messages=messages,
+                    temperature=LLM_TEMPERATURE,
+                    stream=True
+                )
+                stream = iter(response)
+                while (chunk := await asyncio.to_thread(next, stream, None)) is not None:
+                    if chunk.choices[0].delta.content:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        chunks.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+            except Exception as e:
+                error, delay = _handle_failure(e, attempt, retryable=not chunks)
+                if delay is None:
+                    record_error(call_site)
+                    raise error from e
+        if delay is None:
+            circuit_breaker.record_success()
+            break
+        # Back off outside the slot so queued calls can use it
+        await asyncio.sleep(delay)
+        attempt += 1
+
+    text = "".join(chunks)
+    # Streams carry no usage block here, so tokens are estimated
+    record_call(
+        call_site, model, time.perf_counter() - started, tokens, len(text) // 4,
+        ttft=first_token_at - started if first_token_at is not None else None,
+    )
+    if response_cache and chunks:
+        response_cache.set(key, text)
+
+
+# ---------------------------------------------------------------------------
+# Structured JSON extraction
+# ---------------------------------------------------------------------------
+
+JSON_REPAIR_PROMPT = (
+    "Your previous reply could not be used: {error}. "
+    "Reply again with ONLY the corrected JSON - no prose, no code fences."
+)
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_json_decoder = json.JSONDecoder()
 
-async def stream_llm_response(messages: list, model: str = "claude-sonnet-4-5"):
-    """Stream response from Claude via LiteLLM"""
+
+class LLMJSONError(ValueError):
+    """LLM output could not be parsed or validated as the requested JSON"""
+
+
+@dataclass
+class JSONParseStats:
+    """Per call site counters for structured JSON requests"""
+    requests: int = 0
+    first_pass_failures: int = 0
+    repaired_locally: int = 0
+    repair_retries: int = 0
+    failures: int = 0
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.requests if self.requests else 0.0
+
+    @property
+    def first_pass_failure_rate(self) -> float:
+        return self.first_pass_failures / self.requests if self.requests else 0.0
+
+
+json_parse_stats: dict[str, JSONParseStats] = {}
+
+
+def get_json_parse_stats() -> dict[str, dict]:
+    """Snapshot of JSON parse counters and failure rates keyed by call site"""
+    return {
+        call_site: {
+            **asdict(stats),
+            "failure_rate": round(stats.failure_rate, 4),
+            "first_pass_failure_rate": round(stats.first_pass_failure_rate, 4),
+        }
+        for call_site, stats in json_parse_stats.items()
+    }
+
+
+def extract_json_text(text: str) -> str:
+    """Strip code fences and leading prose, returning text from the first { or ["""
+    text = text.strip()
+    fence = _FENCE_RE.search(text)
+    if fence:
+        text = fence.group(1).strip()
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    return text[min(starts):] if starts else text
+
+
+def repair_json(text: str) -> str:
+    """Best-effort repair of truncated or sloppy JSON.
+
+    Closes an unterminated string and any open brackets, drops a dangling
+    key or trailing comma at the cut-off point and removes trailing commas.
+    """
+    closers: list[str] = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]" and closers:
+            closers.pop()
+
+    repaired = text + '"' if in_string else text
+    repaired = repaired.rstrip()
+    repaired = re.sub(r',?\s*"[^"]*"\s*:\s*$', "", repaired)  # dangling "key":
+    repaired = re.sub(r",\s*$", "", repaired)
+    repaired += "".join(reversed(closers))
+    return _TRAILING_COMMA_RE.sub(r"\1", repaired)
+
+
+def parse_llm_json(text: str) -> tuple[Any, bool]:
+    """Parse JSON from an LLM reply. Returns (data, was_repaired).
+
+    Raises json.JSONDecodeError if the text is not recoverable.
+    """
+    candidate = extract_json_text(text)
     try:
-        response = completion(
-            model=model,
-            messages=messages,
-            temperature=0.1,
-            stream=True
-        )
-        for chunk in response:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
-    except Exception as e:
-        yield f"Error: {e!s}"
+        return _json_decoder.raw_decode(candidate)[0], False
+    except json.JSONDecodeError:
+        return _json_decoder.raw_decode(repair_json(candidate))[0], True
+
+
+@lru_cache(maxsize=64)
+def _type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def _structured_output_format(schema: Any) -> Any:
+    """Provider-side JSON schema constraint; only object-shaped models qualify"""
+    if not settings.llm_structured_output:
+        return None
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        return schema
+    return None
+
+
+def _discard_cached_reply(model: str, messages: list, response_format: Any) -> None:
+    """Evict an unusable reply so it is not replayed to every later caller"""
+    response_cache = get_response_cache()
+    if response_cache:
+        response_cache.delete(_cache_key(model, messages, response_format))
+
+
+async def request_json(
+    messages: list,
+    schema: Any = None,
+    *,
+    call_site: str,
+    complete: Callable[..., Awaitable[str]] | None = None,
+    cache: bool = False,
+    priority: LLMPriority | None = None,
+) -> Any:
+    """Request JSON from the LLM, validated against ``schema``.
+
+    ``schema`` is any type pydantic can validate (a model, ``list[Model]``,
+    ``dict[str, list[str]]``...). Object-shaped models are also sent to the
+    provider as a structured-output constraint. The model comes from the
+    routing table for ``call_site``. Malformed replies are repaired locally
+    first, then retried once: on the default model if a cheaper tier
+    produced them, otherwise with a short repair prompt.
+    ``complete`` is the text completion coroutine (defaults to
+    get_llm_response); LLM transport errors propagate unchanged. ``cache``
+    and ``priority`` are forwarded to it when set; a cached reply that
+    fails validation is evicted so later calls get a fresh one.
+
+    Raises LLMJSONError if the reply is still unusable after the retry.
+    """
+    complete = complete or get_llm_response
+    stats = json_parse_stats.setdefault(call_site, JSONParseStats())
+    stats.requests += 1
+
+    response_format = _structured_output_format(schema)
+    kwargs = {"response_format": response_format} if response_format is not None else {}
+    if cache:
+        kwargs["cache"] = True
+    if priority is not None:
+        kwargs["priority"] = priority
+
+    model = model_for(call_site)
+    conversation = list(messages)
+    error: Exception | None = None
+    for attempt in range(2):
+        response = await complete(conversation, model=model, call_site=call_site, **kwargs)
+        try:
+            data, repaired = parse_llm_json(response or "")
+            if schema is not None:
+                data = _type_adapter(schema).validate_python(data)
+            if repaired:
+                stats.repaired_locally += 1
+            return data
+        except (json.JSONDecodeError, ValidationError) as e:
+            error = e
+            if cache:
+                _discard_cached_reply(model, conversation, response_format)
+            if attempt == 0:
+                stats.first_pass_failures += 1
+                stats.repair_retries += 1
+                if model != escalation_model():
+                    # The larger model gets the original prompt, not the bad reply
+                    record_escalation(call_site)
+                    logger.info("llm.route.escalated", extra={
+                        "call_site": call_site, "from_model": model, "error": _short_error(e),
+                    })
+                    model = escalation_model()
+                    continue
+                conversation = [
+                    *messages,
+                    {"role": "assistant", "content": response or ""},
+                    {"role": "user", "content": JSON_REPAIR_PROMPT.format(error=_short_error(e))},
+                ]
+
+    stats.failures += 1
+    logger.warning("llm.json.parse_failed", extra={"call_site": call_site, "error": str(error)})
+    raise LLMJSONError(f"Failed to parse LLM response as JSON: {error!s}")
+
+
+def validate_llm_json(text: str, schema: Any, *, call_site: str) -> Any:
+    """Parse and validate one reply without a retry round trip.
+
+    For output that cannot be re-requested on its own, such as one section
+    of a streamed multi-part response. Counts towards json_parse_stats.
+
+    Raises LLMJSONError if the text is not valid ``schema`` JSON.
+    """
+    stats = json_parse_stats.setdefault(call_site, JSONParseStats())
+    stats.requests += 1
+    try:
+        data, repaired = parse_llm_json(text or "")
+        data = _type_adapter(schema).validate_python(data)
+    except (json.JSONDecodeError, ValidationError) as e:
+        stats.first_pass_failures += 1
+        stats.failures += 1
+        logger.warning("llm.json.parse_failed", extra={"call_site": call_site, "error": str(e)})
+        raise LLMJSONError(f"Failed to parse LLM response as JSON: {e!s}") from e
+    if repaired:
+        stats.repaired_locally += 1
+    return data
+
+
+async def stream_json_objects(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Yield the text of each top-level object in a streamed JSON array.
+
+    Objects are emitted as soon as their closing brace arrives, so callers
+    can validate and forward array items while the rest is still streaming.
+    Prose or code fences around the array are skipped.
+    """
+    depth = 0
+    object_depth: int | None = None
+    in_string = False
+    escaped = False
+    current: list[str] = []
+
+    async for chunk in chunks:
+        for char in chunk:
+            if object_depth is not None:
+                current.append(char)
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"' and depth:
+                in_string = True
+            elif char in "[{":
+                if char == "{" and object_depth is None and depth <= 1:
+                    object_depth = depth
+                    current = [char]
+                depth += 1
+            elif char in "]}" and depth:
+                depth -= 1
+                if object_depth is not None and depth == object_depth:
+                    yield "".join(current)
+                    object_depth = None
+
+
+def _short_error(error: Exception) -> str:
+    """Compact error description for the repair prompt"""
+    if isinstance(error, ValidationError):
+        first = error.errors()[0]
+        location = ".".join(str(part) for part in first["loc"]) or "root"
+        return f"schema validation failed at '{location}': {first['msg']}"
+    return f"invalid JSON ({error!s})"
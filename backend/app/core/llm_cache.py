@@ -0,0 +1,146 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_messages(messages: list) -> list:
+    """Canonical form of a message list for cache keys.
+
+    Whitespace runs collapse to one space (prompts are indented f-strings),
+    and content blocks keep only their text so provider hints such as
+    cache_control do not split the key space.
+    """
+    normalized = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(
+                block.get("text", "") if isinstance(block, dict) else str(block)
+                for block in content
+            )
+        normalized.append({
+            "role": message.get("role"),
+            "content": _WHITESPACE_RE.sub(" ", str(content or "")).strip(),
+        })
+    return normalized
+
+
+class LLMResponseCache:
+    """On-disk LLM response cache backed by SQLite with LRU size eviction"""
+
+    def __init__(self, path: str | Path, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+            )
+        return self._conn
+
+    @staticmethod
+    def make_key(model: str, messages: list, temperature: float, **extra: Any) -> str:
+        payload = {
+            "model": model,
+            "messages": normalize_messages(messages),
+            "temperature": temperature,
+            **{k: v for k, v in extra.items() if v is not None},
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used entries until the store fits max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall()
+        victims = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            conn = self._connect()
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
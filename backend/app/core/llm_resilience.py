@@ -0,0 +1,170 @@
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+
+class LLMError(Exception):
+    """An LLM request failed"""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMBadRequestError(LLMError):
+    """The provider rejected the request (4xx); retrying will not help"""
+
+
+class LLMUnavailableError(LLMError):
+    """The provider is down, overloaded or timing out; try again later"""
+
+
+class LLMRateLimitError(LLMUnavailableError):
+    """The provider returned 429; ``retry_after`` holds its hint when given"""
+
+
+def _status_code(error: Exception) -> int | None:
+    status = getattr(error, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Seconds from a Retry-After header on the provider error, if any"""
+    headers = getattr(error, "litellm_response_headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    try:
+        value = headers.get("retry-after") if headers is not None else None
+    except AttributeError:
+        return None
+    if not isinstance(value, str | int | float):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: Exception) -> LLMError:
+    """Map a provider/transport exception onto the LLMError hierarchy"""
+    if isinstance(error, LLMError):
+        return error
+
+    message = f"LLM request failed: {error!s}"
+    status = _status_code(error)
+    if status == 429:
+        return LLMRateLimitError(message, retry_after=_retry_after(error))
+    if isinstance(error, TimeoutError | ConnectionError) or status == 408 or (status or 0) >= 500:
+        return LLMUnavailableError(message, retry_after=_retry_after(error))
+    if status is not None and 400 <= status < 500:
+        return LLMBadRequestError(message)
+    return LLMError(message)
+
+
+class RetryPolicy:
+    """Decides whether and how long to wait before retrying a failed call.
+
+    429s wait for the provider's Retry-After (giving up at once if it is
+    longer than ``max_retry_after``); other outages use capped exponential
+    backoff with full jitter. Bad requests and unclassified errors are
+    never retried.
+    """
+
+    def __init__(self, max_retries: int, base_delay: float, max_delay: float, max_retry_after: float):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def delay(self, error: LLMError, attempt: int) -> float | None:
+        """Seconds to wait before retry number ``attempt + 1``, or None to give up"""
+        if not isinstance(error, LLMUnavailableError) or attempt >= self.max_retries:
+            return None
+        if isinstance(error, LLMRateLimitError) and error.retry_after is not None:
+            if error.retry_after > self.max_retry_after:
+                return None
+            return error.retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Fails LLM calls fast while the provider is having an outage.
+
+    Opens after ``failure_threshold`` consecutive outage errors (5xx,
+    timeouts, connection failures). While open every call is rejected with
+    LLMUnavailableError; after ``reset_seconds`` a single probe call is let
+    through and its outcome closes or re-opens the circuit. Rate limits and
+    bad requests prove the provider is reachable and count as successes.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started: float | None = None
+        self.trips = 0
+        self.rejected = 0
+
+    def _reject(self, retry_after: float) -> None:
+        self.rejected += 1
+        raise LLMUnavailableError(
+            "LLM provider temporarily unavailable", retry_after=max(retry_after, 1.0)
+        )
+
+    def ensure_available(self) -> None:
+        """Raise LLMUnavailableError if calls are currently being rejected"""
+        if self.state == "open":
+            remaining = self.opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0:
+                self._reject(remaining)
+
+    def before_call(self) -> None:
+        """Admit a call or raise; moves an expired open circuit to half-open"""
+        now = time.monotonic()
+        self.ensure_available()
+        if self.state == "open":
+            self.state = "half_open"
+            self.probe_started = None
+        if self.state == "half_open":
+            # A probe abandoned mid-call must not wedge the breaker half-open
+            if self.probe_started is not None and now - self.probe_started < self.reset_seconds:
+                self._reject(self.reset_seconds - (now - self.probe_started))
+            self.probe_started = now
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info("llm.circuit.closed", extra={"trips": self.trips})
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.probe_started = None
+
+    def record_failure(self, error: LLMError) -> None:
+        if not isinstance(error, LLMUnavailableError) or isinstance(error, LLMRateLimitError):
+            self.record_success()
+            return
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.probe_started = None
+            self.trips += 1
+            logger.warning("llm.circuit.opened", extra={
+                "consecutive_failures": self.consecutive_failures, "error": str(error),
+            })
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
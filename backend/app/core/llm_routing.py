@@ -0,0 +1,141 @@
+import threading
+from dataclasses import dataclass
+from dataclasses import field
+
+from app.core.config import settings
+
+DEFAULT_TIER = "default"
+DEFAULT_CALL_SITE = "default"
+
+
+def model_for_tier(tier: str) -> str:
+    return settings.llm_model_tiers.get(tier) or settings.llm_model_tiers[DEFAULT_TIER]
+
+
+def model_for(call_site: str) -> str:
+    """Model configured for a call site via llm_route_tiers"""
+    return model_for_tier(settings.llm_route_tiers.get(call_site, DEFAULT_TIER))
+
+
+def escalation_model() -> str:
+    """Model used when a cheaper tier's output fails validation"""
+    return model_for_tier(DEFAULT_TIER)
+
+
+# Prompt-cache pricing relative to the base input price
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
+) -> float:
+    """USD cost from llm_model_prices (per million input/output tokens).
+
+    ``input_tokens`` is the total prompt size including cache reads/writes.
+    """
+    input_price, output_price = settings.llm_model_prices.get(model, (0.0, 0.0))
+    uncached = max(0, input_tokens - cache_read_tokens - cache_write_tokens)
+    billed_input = (
+        uncached
+        + cache_write_tokens * CACHE_WRITE_MULTIPLIER
+        + cache_read_tokens * CACHE_READ_MULTIPLIER
+    )
+    return (billed_input * input_price + output_tokens * output_price) / 1_000_000
+
+
+@dataclass
+class RouteStats:
+    """Latency, token and cost counters for one call site"""
+    calls: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    escalations: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    cost_usd: float = 0.0
+    ttft_count: int = 0
+    total_ttft: float = 0.0
+    models: dict[str, int] = field(default_factory=dict)
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "escalations": self.escalations,
+            "avg_latency_ms": round(self.total_latency / self.calls * 1000, 1) if self.calls else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+            "avg_ttft_ms": round(self.total_ttft / self.ttft_count * 1000, 1) if self.ttft_count else None,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "models": dict(self.models),
+        }
+
+
+route_stats: dict[str, RouteStats] = {}
+_lock = threading.Lock()
+
+
+def _stats(call_site: str) -> RouteStats:
+    return route_stats.setdefault(call_site, RouteStats())
+
+
+def record_call(
+    call_site: str,
+    model: str,
+    latency: float,
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
+    ttft: float | None = None,
+) -> None:
+    with _lock:
+        stats = _stats(call_site)
+        stats.calls += 1
+        stats.total_latency += latency
+        stats.max_latency = max(stats.max_latency, latency)
+        stats.input_tokens += input_tokens
+        stats.output_tokens += output_tokens
+        stats.cache_read_tokens += cache_read_tokens
+        stats.cache_write_tokens += cache_write_tokens
+        stats.cost_usd += estimate_cost(
+            model, input_tokens, output_tokens, cache_read_tokens, cache_write_tokens
+        )
+        if ttft is not None:
+            stats.ttft_count += 1
+            stats.total_ttft += ttft
+        stats.models[model] = stats.models.get(model, 0) + 1
+
+
+def record_error(call_site: str) -> None:
+    with _lock:
+        _stats(call_site).errors += 1
+
+
+def record_cache_hit(call_site: str) -> None:
+    with _lock:
+        _stats(call_site).cache_hits += 1
+
+
+def record_escalation(call_site: str) -> None:
+    with _lock:
+        _stats(call_site).escalations += 1
+
+
+def get_route_stats() -> dict[str, dict]:
+    """Snapshot of per call site accounting"""
+    with _lock:
+        return {call_site: stats.snapshot() for call_site, stats in route_stats.items()}
@@ -0,0 +1,178 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+
+logger = logging.getLogger(__name__)
+
+# Waits longer than this are logged so queueing shows up next to request logs
+SLOW_WAIT_SECONDS = 1.0
+
+
+class LLMPriority(IntEnum):
+    """Scheduling class of an outbound LLM call; lower values are served first"""
+    INTERACTIVE = 0  # streaming /optimize responses a user is watching
+    UPLOAD = 1       # resume and job parsing during upload
+    EXPORT = 2       # skill categorization while exporting
+    BATCH = 3        # background work such as GitHub repository analysis
+
+
+def estimate_tokens(messages: list) -> int:
+    """Rough prompt size (~4 characters per token) for the token bucket"""
+    chars = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            chars += sum(len(str(block.get("text", ""))) for block in content if isinstance(block, dict))
+        else:
+            chars += len(str(content or ""))
+    return chars // 4 + 1
+
+
+class TokenBucket:
+    """Per-minute budget refilled continuously.
+
+    ``acquire`` reserves its amount immediately and sleeps off any deficit,
+    so concurrent callers are spaced out instead of all retrying at once.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = self.capacity
+        self.updated = time.monotonic()
+        self.throttled = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> float:
+        """Take ``amount`` from the bucket; returns the seconds slept"""
+        self._refill()
+        self.available -= min(amount, self.capacity)
+        if self.available >= 0:
+            return 0.0
+        self.throttled += 1
+        delay = -self.available / self.rate
+        await asyncio.sleep(delay)
+        return delay
+
+
+@dataclass
+class PriorityStats:
+    """Counters for one priority class"""
+    requests: int = 0
+    waiting: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.requests += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "queue_depth": self.waiting,
+            "avg_wait_ms": round(self.total_wait / self.requests * 1000, 1) if self.requests else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+
+class LLMScheduler:
+    """Bounds in-flight LLM calls and hands free slots out by priority.
+
+    A fixed number of concurrent slots is shared by all callers; when none
+    is free, waiters are queued by (priority, arrival). Optional token
+    buckets cap requests and prompt tokens per minute (0 disables them).
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._stats = {priority: PriorityStats() for priority in LLMPriority}
+
+    @asynccontextmanager
+    async def slot(self, priority: LLMPriority = LLMPriority.INTERACTIVE, tokens: int = 0):
+        """Hold one concurrency slot for the duration of the block"""
+        stats = self._stats[priority]
+        start = time.monotonic()
+        stats.waiting += 1
+        try:
+            await self._acquire(priority)
+        finally:
+            stats.waiting -= 1
+
+        try:
+            if self.request_bucket:
+                await self.request_bucket.acquire(1)
+            if self.token_bucket and tokens:
+                await self.token_bucket.acquire(tokens)
+        except BaseException:
+            self._release()
+            raise
+
+        waited = time.monotonic() - start
+        stats.record_wait(waited)
+        if waited >= SLOW_WAIT_SECONDS:
+            logger.info("llm.scheduler.waited", extra={
+                "priority": priority.name.lower(), "wait_ms": round(waited * 1000), "tokens": tokens,
+            })
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: LLMPriority) -> None:
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (int(priority), next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before cancellation: pass it on
+                self._release()
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def _release(self) -> None:
+        """Hand the slot to the most urgent waiter, or free it"""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": sum(stats.waiting for stats in self._stats.values()),
+            "throttled": {
+                "requests": self.request_bucket.throttled if self.request_bucket else 0,
+                "tokens": self.token_bucket.throttled if self.token_bucket else 0,
+            },
+            "priorities": {
+                priority.name.lower(): stats.snapshot() for priority, stats in self._stats.items()
+            },
+        }
@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.core.skills import SkillMatcher
+from app.core.skills import skill_key
+
+logger = logging.getLogger(__name__)
+
+_skill_store: "SkillEmbeddingStore | None" = None
+_store_unavailable = False
+
+
+class SkillEmbeddingStore:
+    """Unit-length float32 embeddings per normalized skill key, persisted on disk.
+
+    Vectors live in one (n, dim) matrix saved as ``<path>.npy`` next to a
+    ``<path>.json`` key list, so a skill is embedded once per model and the
+    store loads with a single read. ``embed`` turns a list of strings into
+    a float32 array; it is only called for keys not in the store.
+
+    Only resume skills are persisted. Job keywords are open-ended, so their
+    vectors are kept in a bounded in-memory LRU (``max_transient`` keys).
+    """
+
+    def __init__(
+        self, path: str | Path, model: str, embed: Callable[[list[str]], Any], max_transient: int = 2048
+    ):
+        import numpy as np
+
+        self._np = np
+        self.path = Path(path)
+        self.model = model
+        self.embed = embed
+        self.max_transient = max_transient
+        self.index: dict[str, int] = {}
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.transient: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        keys_path, vectors_path = self.path.with_suffix(".json"), self.path.with_suffix(".npy")
+        if not keys_path.exists() or not vectors_path.exists():
+            return
+        try:
+            meta = json.loads(keys_path.read_text())
+            vectors = self._np.load(vectors_path)
+        except (OSError, ValueError) as e:
+            logger.warning("skill_embeddings.load_failed", extra={"path": str(self.path), "error": str(e)})
+            return
+        if meta.get("model") != self.model or len(meta.get("keys", [])) != len(vectors):
+            return
+        self.index = {key: row for row, key in enumerate(meta["keys"])}
+        self.vectors = vectors.astype(self._np.float32, copy=False)
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        vectors_tmp = self.path.with_suffix(".tmp.npy")
+        keys_tmp = self.path.with_suffix(".tmp.json")
+        self._np.save(vectors_tmp, self.vectors)
+        keys_tmp.write_text(json.dumps({"model": self.model, "keys": list(self.index)}))
+        os.replace(vectors_tmp, self.path.with_suffix(".npy"))
+        os.replace(keys_tmp, self.path.with_suffix(".json"))
+
+    def _rows(self, persistent: list[str], transient: list[str]) -> tuple[Any, Any]:
+        """Rows for both key lists; every new key is embedded in one call and
+        the store is saved at most once"""
+        np = self._np
+        with self._lock:
+            missing = list(dict.fromkeys(
+                key for key in [*persistent, *transient] if key not in self.index and key not in self.transient
+            ))
+            fresh: dict[str, Any] = {}
+            if missing:
+                new = np.asarray(self.embed(missing), dtype=np.float32)
+                new /= np.maximum(np.linalg.norm(new, axis=1, keepdims=True), 1e-12)
+                fresh = dict(zip(missing, new))
+                to_persist = [key for key in dict.fromkeys(persistent) if key in fresh]
+                if to_persist:
+                    rows = np.stack([fresh[key] for key in to_persist])
+                    self.vectors = rows if not self.index else np.vstack([self.vectors, rows])
+                    for key in to_persist:
+                        self.index[key] = len(self.index)
+                    try:
+                        self._save()
+                    except OSError as e:
+                        logger.warning("skill_embeddings.save_failed", extra={"path": str(self.path), "error": str(e)})
+                for key in missing:
+                    if key not in self.index:
+                        self.transient[key] = fresh[key]
+                while len(self.transient) > self.max_transient:
+                    self.transient.popitem(last=False)
+
+            def row(key: str) -> Any:
+                if key in self.index:
+                    return self.vectors[self.index[key]]
+                if key in self.transient:
+                    self.transient.move_to_end(key)
+                    return self.transient[key]
+                return fresh[key]
+
+            return (
+                np.stack([row(key) for key in persistent]) if persistent else None,
+                np.stack([row(key) for key in transient]) if transient else None,
+            )
+
+    def vectors_for(self, keys: list[str]) -> Any:
+        """Rows for ``keys`` in order, embedding and persisting any new ones"""
+        return self._rows(keys, [])[0]
+
+    def nearest(self, queries: list[str], candidates: list[str]) -> dict[str, tuple[str, float]]:
+        """Most similar candidate and its cosine per query, in one embedding batch.
+
+        ``candidates`` (resume skills) are persisted; ``queries`` (job
+        keywords) are only kept in memory.
+        """
+        if not queries or not candidates:
+            return {}
+        candidate_vectors, query_vectors = self._rows(candidates, queries)
+        scores = query_vectors @ candidate_vectors.T
+        best = scores.argmax(axis=1)
+        return {
+            query: (candidates[j], float(scores[i, j]))
+            for i, (query, j) in enumerate(zip(queries, best))
+        }
+
+    def top_k(self, query: str, candidates: list[str], k: int = 3) -> list[tuple[str, float]]:
+        """``candidates`` most similar to ``query`` by cosine, best first"""
+        if not candidates:
+            return []
+        candidate_vectors, query_vectors = self._rows(candidates, [query])
+        scores = candidate_vectors @ query_vectors[0]
+        k = min(k, len(candidates))
+        best = self._np.argpartition(-scores, k - 1)[:k]
+        return sorted(((candidates[i], float(scores[i])) for i in best), key=lambda item: -item[1])
+
+
+class SemanticSkillMatcher:
+    """SkillMatcher with an embedding fallback for keywords it cannot match.
+
+    A job keyword whose nearest resume skill scores at least ``threshold``
+    counts as matched ("container orchestration" -> "kubernetes"). Call
+    ``prepare`` with all keywords first (off the event loop) so they are
+    embedded in one batch; ``match`` then only reads the results.
+    """
+
+    def __init__(self, skills: Iterable[str], store: SkillEmbeddingStore, threshold: float, **matcher_options: Any):
+        self.lexical = SkillMatcher(skills, **matcher_options)
+        self.keys = sorted(self.lexical.keys)
+        self.store = store
+        self.threshold = threshold
+        self._semantic: dict[str, str | None] = {}
+
+    def prepare(self, keywords: Iterable[str]) -> None:
+        """Resolve every keyword the lexical matcher misses with one embedding batch"""
+        if not self.keys:
+            return
+        pending = list(dict.fromkeys(
+            skill_key(keyword) for keyword in keywords
+            if not self.lexical.match(keyword) and skill_key(keyword) not in self._semantic
+        ))
+        nearest = self.store.nearest(pending, self.keys)
+        for key in pending:
+            skill, score = nearest.get(key, (None, 0.0))
+            self._semantic[key] = skill if score >= self.threshold else None
+
+    def match(self, keyword: str) -> str | None:
+        """Resume skill key matching ``keyword``, or None"""
+        lexical = self.lexical.match(keyword)
+        if lexical or not self.keys:
+            return lexical
+        key = skill_key(keyword)
+        if key not in self._semantic:
+            self.prepare([keyword])
+        return self._semantic[key]
+
+
+def _local_embedder(model_name: str) -> Callable[[list[str]], Any]:
+    """CPU embedding function backed by fastembed (ONNX runtime, no GPU or torch)"""
+    from fastembed import TextEmbedding
+
+    model = TextEmbedding(model_name=model_name)
+    return lambda texts: list(model.embed(texts))
+
+
+def get_skill_store() -> SkillEmbeddingStore | None:
+    """Shared embedding store, or None when semantic matching is off or unavailable.
+
+    Loading the model is slow (download on first use), so the app calls
+    this once at startup, off the event loop.
+
+    The ``semantic`` extra (fastembed, numpy) is optional; without it the
+    matcher falls back to lexical matching and logs once.
+    """
+    global _skill_store, _store_unavailable
+    if not settings.semantic_matching_enabled or _store_unavailable:
+        return None
+    if _skill_store is None:
+        try:
+            _skill_store = SkillEmbeddingStore(
+                settings.semantic_store_path,
+                settings.semantic_model,
+                _local_embedder(settings.semantic_model),
+            )
+        except Exception as e:
+            _store_unavailable = True
+            logger.warning("skill_embeddings.unavailable", extra={"model": settings.semantic_model, "error": str(e)})
+            return None
+    return _skill_store
@@ -0,0 +1,162 @@
+import re
+from collections.abc import Iterable
+
+# Skill name normalization (canonical forms)
+SKILL_ALIASES = {
+    # JavaScript ecosystem
+    'js': 'JavaScript', 'javascript': 'JavaScript',
+    'ts': 'TypeScript', 'typescript': 'TypeScript',
+    'react.js': 'React', 'reactjs': 'React', 'react': 'React',
+    'vue.js': 'Vue', 'vuejs': 'Vue', 'vue': 'Vue',
+    'angular.js': 'Angular', 'angularjs': 'Angular',
+    'node.js': 'Node.js', 'nodejs': 'Node.js', 'node': 'Node.js',
+    'next.js': 'Next.js', 'nextjs': 'Next.js',
+    'express.js': 'Express', 'expressjs': 'Express',
+    'nest.js': 'NestJS', 'nestjs': 'NestJS',
+    # Databases
+    'postgres': 'PostgreSQL', 'postgresql': 'PostgreSQL',
+    'mongo': 'MongoDB', 'mongodb': 'MongoDB',
+    'mssql': 'SQL Server', 'sql server': 'SQL Server',
+    # Cloud & DevOps
+    'k8s': 'Kubernetes', 'kubernetes': 'Kubernetes',
+    'aws': 'AWS', 'amazon web services': 'AWS',
+    'gcp': 'GCP', 'google cloud': 'GCP', 'google cloud platform': 'GCP',
+    'azure': 'Azure', 'microsoft azure': 'Azure',
+    'cicd': 'CI/CD', 'ci/cd': 'CI/CD',
+    # Frameworks
+    'rails': 'Ruby on Rails', 'ruby on rails': 'Ruby on Rails',
+    'spring boot': 'Spring Boot', 'springboot': 'Spring Boot',
+    'asp.net core': 'ASP.NET Core', 'aspnet': 'ASP.NET',
+    'fastapi': 'FastAPI',
+    # Tools
+    'vscode': 'VS Code', 'vs code': 'VS Code',
+    'tailwindcss': 'Tailwind CSS', 'tailwind': 'Tailwind CSS',
+    # CSS
+    'scss': 'SCSS/Sass', 'sass': 'SCSS/Sass',
+}
+
+
+def canonical_skill(skill: str) -> str:
+    """Canonical display form of a skill, e.g. 'k8s' -> 'Kubernetes'"""
+    return SKILL_ALIASES.get(skill.lower().strip(), skill.strip())
+
+
+def skill_key(skill: str) -> str:
+    """Case-insensitive matching key: the lowercased canonical form"""
+    return canonical_skill(skill).lower()
+
+
+def job_keywords(analysis: dict) -> dict[str, list[str]]:
+    """Matching keys for a job's required skills and technologies.
+
+    ``required_skills`` and ``technologies`` stay aligned with the lists in
+    ``analysis`` so callers can map a key back to the original wording;
+    ``all`` is the deduplicated union used for ATS scoring.
+    """
+    required = [skill_key(skill) for skill in analysis.get("required_skills", [])]
+    technologies = [skill_key(tech) for tech in analysis.get("technologies", [])]
+    return {
+        "required_skills": required,
+        "technologies": technologies,
+        "all": sorted(set(required + technologies)),
+    }
+
+
+# Tokens that only qualify another token ("React JS" -> "React")
+NOISE_TOKENS = {"js"}
+TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+# Characters of key length per allowed edit, so short names never fuzzy-match
+# (mysql/mssql, java/lava): 6-11 chars allow 1 edit, 12+ allow 2
+CHARS_PER_EDIT = 6
+
+
+def _tokens(key: str) -> str:
+    tokens = TOKEN_RE.findall(key)
+    meaningful = [token for token in tokens if token not in NOISE_TOKENS] or tokens
+    return " ".join(sorted(meaningful))
+
+
+# Alias table keyed by token set, so "Platform Google Cloud" still resolves
+_ALIAS_TOKENS = {_tokens(alias): _tokens(canonical.lower()) for alias, canonical in SKILL_ALIASES.items()}
+
+
+def token_key(key: str) -> str:
+    """Order-insensitive form of a skill key, with aliases resolved after noise removal"""
+    tokens = _tokens(key)
+    return _ALIAS_TOKENS.get(tokens, tokens)
+
+
+def bounded_distance(a: str, b: str, bound: int) -> int | None:
+    """Levenshtein distance of ``a`` and ``b`` if it is at most ``bound``, else None"""
+    if abs(len(a) - len(b)) > bound:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > bound:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= bound else None
+
+
+def _deletes(key: str, distance: int) -> set[str]:
+    """``key`` and every string reachable from it by up to ``distance`` deletions"""
+    variants = {key}
+    frontier = {key}
+    for _ in range(distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        variants |= frontier
+    return variants
+
+
+class SkillMatcher:
+    """Match job keywords against a fixed set of resume skills.
+
+    Lookups try, in order: the alias-resolved key, the token set (word order,
+    punctuation and "js" suffixes ignored) and - in "fuzzy" mode - an edit
+    distance bounded by key length. Candidates for the edit distance come
+    from a deletion index built once per skill set, so a lookup costs a
+    handful of dict probes instead of a scan over every resume skill.
+    "exact" mode only compares alias-resolved keys.
+    """
+
+    def __init__(self, skills: Iterable[str], mode: str = "fuzzy", max_distance: int = 2):
+        self.mode = mode
+        self.max_distance = max_distance
+        self.keys = {skill_key(skill) for skill in skills if skill and skill.strip()}
+        self.tokens: dict[str, str] = {}
+        self.deletes: dict[str, set[str]] = {}
+        if mode == "exact":
+            return
+        for key in sorted(self.keys):
+            self.tokens.setdefault(token_key(key), key)
+            for variant in _deletes(key, self._budget(key)):
+                self.deletes.setdefault(variant, set()).add(key)
+
+    def _budget(self, key: str) -> int:
+        return min(self.max_distance, len(key) // CHARS_PER_EDIT)
+
+    def match(self, keyword: str) -> str | None:
+        """Resume skill key matching ``keyword``, or None"""
+        key = skill_key(keyword)
+        if key in self.keys:
+            return key
+        if self.mode == "exact":
+            return None
+
+        token_match = self.tokens.get(token_key(key))
+        if token_match:
+            return token_match
+
+        budget = self._budget(key)
+        if not budget:
+            return None
+        candidates = set().union(*(self.deletes.get(variant, ()) for variant in _deletes(key, budget)))
+        best = None
+        for candidate in sorted(candidates):
+            distance = bounded_distance(key, candidate, min(budget, self._budget(candidate)))
+            if distance is not None and (best is None or distance < best[0]):
+                best = (distance, candidate)
+        return best[1] if best else None
@@ -0,0 +1,73 @@
+import io
+from typing import BinaryIO
+
+from docx import Document
+
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def warm_up() -> None:
+    """Load python-docx's default template before the first export"""
+    Document()
+
+
+def write_classic_docx(out: BinaryIO, resume_data: dict, skills_data: dict[str, list[str]], projects: list[dict]) -> None:
+    """Write the ATS-compliant DOCX to ``out``.
+
+    ``skills_data`` is the categorized skill map and ``projects`` the
+    projects in display order, both prepared by ExportService.
+    """
+    doc = Document()
+
+    # Personal Info
+    personal = resume_data["personal_info"]
+    doc.add_heading(personal["name"], 0)
+
+    contact_info = [personal[field] for field in ("email", "phone", "location") if personal.get(field)]
+    if contact_info:
+        doc.add_paragraph(" | ".join(contact_info))
+
+    # Experience
+    if resume_data.get("experience"):
+        doc.add_heading("Experience", 1)
+        for exp in resume_data["experience"]:
+            p = doc.add_paragraph()
+            p.add_run(f"{exp['title']} - {exp['company']}").bold = True
+            doc.add_paragraph(exp["duration"])
+            for desc in exp["description"]:
+                doc.add_paragraph(f"• {desc}")
+
+    # Skills - deduplicated and categorized by the caller
+    if resume_data.get("skills"):
+        doc.add_heading("Skills", 1)
+        for category, skills_list in skills_data.items():
+            if skills_list:
+                p = doc.add_paragraph()
+                p.add_run(f"{category}: ").bold = True
+                p.add_run(', '.join(skills_list))
+
+    # Projects (resume projects first, GitHub-sourced last)
+    if projects:
+        doc.add_heading("Projects", 1)
+        for project in projects:
+            p = doc.add_paragraph()
+            p.add_run(project["name"]).bold = True
+            doc.add_paragraph(project["description"])
+            if project.get("technologies"):
+                doc.add_paragraph(f"Technologies: {', '.join(project['technologies'])}")
+
+    # Education
+    if resume_data.get("education"):
+        doc.add_heading("Education", 1)
+        for edu in resume_data["education"]:
+            if edu.get("degree") and edu.get("institution"):
+                doc.add_paragraph(f"{edu['degree']} - {edu['institution']}")
+
+    doc.save(out)
+
+
+def render_classic_docx(resume_data: dict, skills_data: dict[str, list[str]], projects: list[dict]) -> bytes:
+    """The DOCX as bytes"""
+    buffer = io.BytesIO()
+    write_classic_docx(buffer, resume_data, skills_data, projects)
+    return buffer.getvalue()
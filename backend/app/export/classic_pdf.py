@@ -0,0 +1,134 @@
+import io
+from functools import lru_cache
+from typing import BinaryIO
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import Paragraph
+from reportlab.platypus import SimpleDocTemplate
+from reportlab.platypus import Spacer
+
+# Standard Type 1 fonts used by the sample style sheet (regular, bold, italic)
+FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique", "Times-Roman")
+
+SKILL_CATEGORY_ORDER = ("Technical Skills", "Soft Skills", "Other")
+
+
+@lru_cache(maxsize=1)
+def classic_styles() -> dict[str, ParagraphStyle]:
+    """Paragraph styles of the classic template, built once per process.
+
+    Styles are only read while a document is built, so one set is shared
+    by every export.
+    """
+    styles = getSampleStyleSheet()
+    return {
+        "normal": styles["Normal"],
+        "title": ParagraphStyle(
+            "CustomTitle",
+            parent=styles["Heading1"],
+            fontSize=18,
+            spaceAfter=12,
+            alignment=1,  # Center alignment
+        ),
+        "heading": ParagraphStyle(
+            "CustomHeading",
+            parent=styles["Heading2"],
+            fontSize=14,
+            spaceAfter=6,
+            spaceBefore=12,
+        ),
+        "skill_category": ParagraphStyle(
+            "SkillCategory",
+            parent=styles["Normal"],
+            fontSize=10,
+            spaceBefore=4,
+            spaceAfter=2,
+            leftIndent=0,
+        ),
+    }
+
+
+def warm_up() -> None:
+    """Load font metrics and build the style sheet before the first export"""
+    for font in FONTS:
+        pdfmetrics.getFont(font)
+    classic_styles()
+
+
+def write_classic_pdf(out: BinaryIO, resume_data: dict, skills_data: dict[str, list[str]], projects: list[dict]) -> None:
+    """Write the ATS-friendly single-column PDF to ``out``.
+
+    ``skills_data`` is the categorized skill map and ``projects`` the
+    projects in display order, both prepared by ExportService.
+    """
+    styles = classic_styles()
+    normal = styles["normal"]
+    heading = styles["heading"]
+
+    doc = SimpleDocTemplate(out, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    story = []
+    personal = resume_data["personal_info"]
+
+    # Name
+    story.append(Paragraph(personal["name"], styles["title"]))
+
+    # Contact info
+    contact_info = [personal[field] for field in ("email", "phone", "location") if personal.get(field)]
+    if contact_info:
+        story.append(Paragraph(" | ".join(contact_info), normal))
+        story.append(Spacer(1, 12))
+
+    # Experience
+    if resume_data.get("experience"):
+        story.append(Paragraph("Experience", heading))
+        for exp in resume_data["experience"]:
+            story.append(Paragraph(f"<b>{exp['title']} - {exp['company']}</b>", normal))
+            story.append(Paragraph(f"<i>{exp['duration']}</i>", normal))
+            for desc in exp["description"]:
+                story.append(Paragraph(f"• {desc}", normal))
+            story.append(Spacer(1, 6))
+
+    # Skills - deduplicated and categorized by the caller
+    if resume_data.get("skills"):
+        story.append(Paragraph("Skills", heading))
+        for category in SKILL_CATEGORY_ORDER:
+            if skills_data.get(category):
+                skills_line = f"<b>{category}:</b> {', '.join(skills_data[category])}"
+                story.append(Paragraph(skills_line, styles["skill_category"]))
+        story.append(Spacer(1, 6))
+
+    # Projects (resume projects first, GitHub-sourced last)
+    if projects:
+        story.append(Paragraph("Projects", heading))
+        for project in projects:
+            story.append(Paragraph(f"<b>{project['name']}</b>", normal))
+            story.append(Paragraph(project['description'], normal))
+            if project.get("technologies"):
+                story.append(Paragraph(f"<b>Technologies:</b> {', '.join(project['technologies'])}", normal))
+            story.append(Spacer(1, 6))
+
+    # Education
+    if resume_data.get("education"):
+        story.append(Paragraph("Education", heading))
+        for edu in resume_data["education"]:
+            story.append(Paragraph(f"<b>{edu['degree']}</b>", normal))
+            edu_info = edu['institution']
+            if edu.get("graduation_year"):
+                edu_info += f" | {edu['graduation_year']}"
+            if edu.get("gpa"):
+                edu_info += f" | GPA: {edu['gpa']}"
+            story.append(Paragraph(edu_info, normal))
+
+    doc.build(story)
+
+
+def render_classic_pdf(resume_data: dict, skills_data: dict[str, list[str]], projects: list[dict]) -> bytes:
+    """The classic PDF as bytes"""
+    buffer = io.BytesIO()
+    write_classic_pdf(buffer, resume_data, skills_data, projects)
+    return buffer.getvalue()
+
@@ -0,0 +1,309 @@
+from collections.abc import Callable
+from html import escape
+
+from app.export.rendering import display_url
+
+# Inline stylesheets of the builders without a CSS file
+ATS_CSS = """
+    body { font-family: Arial, sans-serif; font-size: 11pt; line-height: 1.4; margin: 0.5in; color: #000; }
+    .resume { max-width: 8.5in; }
+    header { text-align: center; margin-bottom: 20pt; }
+    h1 { font-size: 18pt; font-weight: bold; margin: 0 0 8pt 0; }
+    h2 { font-size: 14pt; font-weight: bold; margin: 16pt 0 8pt 0; border-bottom: 1pt solid #000; }
+    h3 { font-size: 12pt; font-weight: bold; margin: 12pt 0 4pt 0; }
+    .contact { font-size: 10pt; margin-bottom: 8pt; }
+    .duration { font-style: italic; margin: 0 0 8pt 0; }
+    ul { margin: 8pt 0; padding-left: 20pt; }
+    li { margin-bottom: 4pt; }
+    section { margin-bottom: 16pt; }
+    .job, .project { margin-bottom: 12pt; }
+"""
+
+PRINTABLE_CSS = """
+    @media print {
+        body { margin: 0.5in; }
+        .no-print { display: none; }
+    }
+    body { font-family: Arial, sans-serif; font-size: 11pt; line-height: 1.4; margin: 0.5in; color: #000; }
+    h1 { font-size: 18pt; margin-bottom: 10pt; border-bottom: 2pt solid #000; padding-bottom: 5pt; }
+    h2 { font-size: 14pt; margin: 15pt 0 8pt 0; color: #333; }
+    h3 { font-size: 12pt; margin: 10pt 0 5pt 0; font-weight: bold; }
+    p { margin: 5pt 0; }
+    ul { margin: 5pt 0; padding-left: 20pt; }
+    li { margin-bottom: 3pt; }
+    .contact { font-size: 10pt; margin-bottom: 15pt; color: #666; }
+    .duration { font-style: italic; color: #666; margin-bottom: 5pt; }
+    .print-instruction { background: #f0f0f0; padding: 10pt; margin-bottom: 20pt; border-left: 4pt solid #007acc; }
+"""
+
+SIMPLE_CSS = """
+    body { font-family: Arial, sans-serif; font-size: 11pt; margin: 0.5in; }
+    h1 { font-size: 18pt; margin-bottom: 10pt; }
+    h2 { font-size: 14pt; margin: 15pt 0 8pt 0; }
+    h3 { font-size: 12pt; margin: 10pt 0 5pt 0; }
+    p { margin: 5pt 0; }
+    ul { margin: 5pt 0; padding-left: 20pt; }
+"""
+
+# Display order of the categorized skills in the modern template
+SKILL_CATEGORIES = ("Technical Skills", "Soft Skills", "Other")
+
+
+def _text(value) -> str:
+    """``value`` as HTML text or attribute value (quotes escaped too)"""
+    return escape(str(value))
+
+
+def _joined(values: list) -> str:
+    return escape(", ".join(map(str, values)))
+
+
+def _contact_line(personal: dict, links: bool = False) -> str:
+    """Email, phone, location (and GitHub/LinkedIn when asked) joined by " | " """
+    items = [personal.get("email"), personal.get("phone"), personal.get("location")]
+    if links:
+        items += [
+            personal.get("github") and f"GitHub: {personal['github']}",
+            personal.get("linkedin") and f"LinkedIn: {personal['linkedin']}",
+        ]
+    return _text(" | ".join(str(item) for item in items if item))
+
+
+def _skill_lines(skills: dict, tools: bool = False) -> str:
+    """Technical (technical + frameworks, for backward compatibility) and soft skills"""
+    lines = []
+    technical = (skills.get("technical") or []) + (skills.get("frameworks") or [])
+    if technical:
+        lines.append(f"<p><strong>Technical Skills:</strong> {_joined(technical)}</p>")
+    if skills.get("soft_skills"):
+        lines.append(f"<p><strong>Soft Skills:</strong> {_joined(skills['soft_skills'])}</p>")
+    if tools and skills.get("tools"):
+        lines.append(f"<p><strong>Tools:</strong> {_joined(skills['tools'])}</p>")
+    return "".join(lines)
+
+
+def _bullets(descriptions: list) -> str:
+    return "".join([f"<li>{_text(desc)}</li>" for desc in descriptions])
+
+
+def _technologies(project: dict) -> str:
+    if not project.get("technologies"):
+        return ""
+    return f"<p><strong>Technologies:</strong> {_joined(project['technologies'])}</p>\n"
+
+
+def ats_html(resume: dict, projects: list[dict]) -> str:
+    """ATS-friendly HTML for PDF generation, with inline CSS"""
+    personal = resume["personal_info"]
+    name = _text(personal.get("name", ""))
+    html = (
+        f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="UTF-8">\n<title>{name} - Resume</title>\n'
+        f'<style>{ATS_CSS}</style>\n</head>\n<body>\n<div class="resume">\n'
+        f'<header>\n<h1>{name}</h1>\n<div class="contact">{_contact_line(personal)}</div>\n</header>\n'
+    )
+    if resume.get("experience"):
+        html += "<section><h2>Experience</h2>\n"
+        for exp in resume["experience"]:
+            html += (
+                f'<div class="job">\n<h3>{_text(exp.get("title", ""))} - {_text(exp.get("company", ""))}</h3>\n'
+                f'<p class="duration">{_text(exp.get("duration", ""))}</p>\n'
+                f'<ul>{_bullets(exp.get("description", []))}</ul>\n</div>\n'
+            )
+        html += "</section>\n"
+    if resume.get("skills"):
+        html += f"<section><h2>Skills</h2>{_skill_lines(resume['skills'])}</section>\n"
+    if projects:
+        html += "<section><h2>Projects</h2>\n"
+        for project in projects:
+            html += (
+                f'<div class="project">\n<h3>{_text(project.get("name", ""))}</h3>\n'
+                f'<p>{_text(project.get("description", ""))}</p>\n{_technologies(project)}</div>\n'
+            )
+        html += "</section>\n"
+    if resume.get("education"):
+        html += "<section><h2>Education</h2>\n"
+        for edu in resume["education"]:
+            if edu.get("degree") and edu.get("institution"):
+                year = f" ({_text(edu['graduation_year'])})" if edu.get("graduation_year") else ""
+                html += f"<p>{_text(edu['degree'])} - {_text(edu['institution'])}{year}</p>\n"
+        html += "</section>\n"
+    html += "</div>\n</body>\n</html>\n"
+    return html
+
+
+def printable_html(resume: dict, projects: list[dict]) -> str:
+    """HTML for browser "Save as PDF" printing, with a print-only hint banner"""
+    personal = resume["personal_info"]
+    name = _text(personal.get("name", ""))
+    html = (
+        f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="UTF-8">\n<title>{name} - Resume</title>\n'
+        f'<style>{PRINTABLE_CSS}</style>\n</head>\n<body>\n'
+        '<div class="print-instruction no-print">\n'
+        '<strong>To save as PDF:</strong> Use your browser\'s Print function (Ctrl+P)\n'
+        'and select "Save as PDF"\n</div>\n'
+        f'<h1>{name}</h1>\n<div class="contact">{_contact_line(personal, links=True)}</div>\n'
+    )
+    if resume.get("experience"):
+        html += "<h2>Experience</h2>\n"
+        for exp in resume["experience"]:
+            html += (
+                f'<h3>{_text(exp.get("title", ""))} - {_text(exp.get("company", ""))}</h3>\n'
+                f'<div class="duration">{_text(exp.get("duration", ""))}</div>\n'
+                f'<ul>{_bullets(exp.get("description", []))}</ul>\n'
+            )
+    if resume.get("skills"):
+        html += f"<h2>Skills</h2>{_skill_lines(resume['skills'], tools=True)}\n"
+    if projects:
+        html += "<h2>Projects</h2>\n"
+        for project in projects:
+            html += (
+                f'<h3>{_text(project.get("name", ""))}</h3>\n'
+                f'<p>{_text(project.get("description", ""))}</p>\n{_technologies(project)}'
+            )
+    if resume.get("education"):
+        html += "<h2>Education</h2>\n"
+        for edu in resume["education"]:
+            details = _text(edu.get("institution", ""))
+            if edu.get("graduation_year"):
+                details += f" | {_text(edu['graduation_year'])}"
+            if edu.get("gpa"):
+                details += f" | GPA: {_text(edu['gpa'])}"
+            html += f"<h3>{_text(edu.get('degree', ''))}</h3>\n<p>{details}</p>\n"
+    html += "</body>\n</html>\n"
+    return html
+
+
+def simple_html(resume: dict, projects: list[dict]) -> str:
+    """Minimal HTML, the fallback for WeasyPrint issues"""
+    personal = resume["personal_info"]
+    name = _text(personal.get("name", ""))
+    html = (
+        f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="UTF-8">\n<title>{name} - Resume</title>\n'
+        f'<style>{SIMPLE_CSS}</style>\n</head>\n<body>\n'
+        f'<h1>{name}</h1>\n<p>{_contact_line(personal)}</p>\n'
+    )
+    if resume.get("experience"):
+        html += "<h2>Experience</h2>\n"
+        for exp in resume["experience"]:
+            html += (
+                f'<h3>{_text(exp.get("title", ""))} - {_text(exp.get("company", ""))}</h3>\n'
+                f'<p><em>{_text(exp.get("duration", ""))}</em></p>\n'
+                f'<ul>{_bullets(exp.get("description", []))}</ul>\n'
+            )
+    if resume.get("skills"):
+        html += f"<h2>Skills</h2>{_skill_lines(resume['skills'])}\n"
+    if projects:
+        html += "<h2>Projects</h2>\n"
+        for project in projects:
+            html += (
+                f'<h3>{_text(project.get("name", ""))}</h3>\n'
+                f'<p>{_text(project.get("description", ""))}</p>\n{_technologies(project)}'
+            )
+    if resume.get("education"):
+        html += "<h2>Education</h2>\n"
+        for edu in resume["education"]:
+            if edu.get("degree") and edu.get("institution"):
+                year = f" ({_text(edu['graduation_year'])})" if edu.get("graduation_year") else ""
+                html += f"<p>{_text(edu['degree'])} - {_text(edu['institution'])}{year}</p>\n"
+    html += "</body>\n</html>\n"
+    return html
+
+
+def _modern_contact(personal: dict) -> str:
+    items = []
+    if personal.get("email"):
+        email = _text(personal["email"])
+        items.append(f'<a href="mailto:{email}">{email}</a>')
+    if personal.get("phone"):
+        items.append(_text(personal["phone"]))
+    if personal.get("location"):
+        items.append(_text(personal["location"]))
+    for key in ("linkedin", "github"):
+        if personal.get(key):
+            items.append(f'<a href="{_text(personal[key])}">{_text(display_url(personal[key]))}</a>')
+    return " | ".join(f'<span class="contact-item">{item}</span>' for item in items)
+
+
+def modern_html(resume: dict, skills: dict[str, list[str]], projects: list[dict], css: str) -> str:
+    """The modern template: categorized skills and ``css`` inlined, for WeasyPrint"""
+    personal = resume.get("personal_info", {})
+    html = (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+        f'<title>{_text(personal.get("name") or "Resume")} - Resume</title>\n<style>{css}</style>\n</head>\n<body>\n'
+        '<div class="resume-container">\n<header class="resume-header">\n'
+        f'<h1 class="resume-name">{_text(personal.get("name", ""))}</h1>\n'
+        f'<div class="resume-contact">{_modern_contact(personal)}</div>\n</header>\n'
+    )
+    if resume.get("summary"):
+        html += (
+            '<section class="resume-section">\n<h2 class="section-title">Summary</h2>\n'
+            f'<p class="resume-summary">{_text(resume["summary"])}</p>\n</section>\n'
+        )
+    if resume.get("experience"):
+        html += '<section class="resume-section">\n<h2 class="section-title">Experience</h2>\n'
+        for exp in resume["experience"]:
+            html += (
+                '<div class="experience-item">\n<div class="experience-header">\n<div>\n'
+                f'<span class="experience-title">{_text(exp.get("title", ""))}</span>\n'
+                f'<span class="experience-company"> - {_text(exp.get("company", ""))}</span>\n</div>\n'
+                f'<span class="experience-duration">{_text(exp.get("duration", ""))}</span>\n</div>\n'
+                f'<ul class="experience-description">{_bullets(exp.get("description", []))}</ul>\n</div>\n'
+            )
+        html += "</section>\n"
+    if skills:
+        html += '<section class="resume-section">\n<h2 class="section-title">Skills</h2>\n<div class="skills-grid">\n'
+        for category in SKILL_CATEGORIES:
+            if skills.get(category):
+                html += (
+                    f'<div class="skill-category">\n<span class="skill-category-name">{category}</span>\n'
+                    f'<span class="skill-inline">{_joined(skills[category])}</span>\n</div>\n'
+                )
+        html += "</div>\n</section>\n"
+    if projects:
+        html += '<section class="resume-section">\n<h2 class="section-title">Projects</h2>\n'
+        for project in projects:
+            link = project.get("link") or project.get("url") or project.get("github_url")
+            link_html = f'\n<a href="{_text(link)}" class="project-link">{_text(display_url(link))}</a>' if link else ""
+            technologies = (
+                f'<p class="project-tech"><strong>Technologies:</strong> {_joined(project["technologies"])}</p>\n'
+                if project.get("technologies") else ""
+            )
+            html += (
+                '<div class="project-item">\n<div class="project-header">\n'
+                f'<span class="project-name">{_text(project.get("name", ""))}</span>{link_html}\n</div>\n'
+                f'<p class="project-description">{_text(project.get("description", ""))}</p>\n{technologies}</div>\n'
+            )
+        html += "</section>\n"
+    if resume.get("education"):
+        html += '<section class="resume-section">\n<h2 class="section-title">Education</h2>\n'
+        for edu in resume["education"]:
+            gpa = f'<p class="education-details">GPA: {_text(edu["gpa"])}</p>\n' if edu.get("gpa") else ""
+            html += (
+                '<div class="education-item">\n<div class="education-header">\n<div>\n'
+                f'<span class="education-degree">{_text(edu.get("degree", ""))}</span>\n'
+                f'<span class="education-institution"> - {_text(edu.get("institution", ""))}</span>\n</div>\n'
+                f'<span class="education-year">{_text(edu.get("graduation_year") or edu.get("year") or "")}</span>\n'
+                f'</div>\n{gpa}</div>\n'
+            )
+        html += "</section>\n"
+    if resume.get("certifications"):
+        html += '<section class="resume-section">\n<h2 class="section-title">Certifications</h2>\n'
+        for cert in resume["certifications"]:
+            cert = cert if isinstance(cert, dict) else {"name": cert}
+            html += (
+                '<div class="certification-item">\n'
+                f'<span class="certification-name">{_text(cert.get("name", ""))}</span>\n'
+                f'<span class="certification-issuer">{_text(cert.get("issuer", ""))} {_text(cert.get("date", ""))}</span>\n'
+                "</div>\n"
+            )
+        html += "</section>\n"
+    html += "</div>\n</body>\n</html>\n"
+    return html
+
+
+# html-engine templates drawn by a builder here rather than a Jinja file
+# (manifest "builder" key); called with resume, skills, projects and css
+BUILDERS: dict[str, Callable[..., str]] = {
+    "modern": modern_html,
+}
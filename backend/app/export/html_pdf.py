@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from app.core.config import settings
+from app.export.workers import RenderPoolSaturatedError
+
+logger = logging.getLogger(__name__)
+
+# Per worker process: WeasyPrint's font configuration, built once by _warm_worker
+_font_config: Any = None
+
+WARMUP_HTML = "<html><body><h1>Warm</h1><p>Font cache <strong>warm-up</strong></p></body></html>"
+
+
+def _warm_worker() -> None:
+    """Process initializer: import WeasyPrint and fill the font cache once per worker.
+
+    Font discovery (fontconfig) and the first layout dominate a cold render,
+    so each worker pays that cost at start instead of on a user's export.
+    """
+    global _font_config
+    from weasyprint import HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    _font_config = FontConfiguration()
+    HTML(string=WARMUP_HTML).write_pdf(font_config=_font_config)
+
+
+def render_pdf(html: str) -> bytes:
+    """Render an HTML document to PDF bytes (runs inside a worker process)"""
+    from weasyprint import HTML
+
+    return HTML(string=html).write_pdf(font_config=_font_config)
+
+
+def _ready() -> bool:
+    return True
+
+
+class HTMLPDFRenderer:
+    """WeasyPrint HTML -> PDF in a pool of warm worker processes.
+
+    Rendering is CPU-bound and can take seconds, so it never runs on the
+    event loop. Each render has a deadline; callers fall back to another
+    renderer when it is missed or WeasyPrint cannot start (e.g. missing
+    Pango system libraries). A missed deadline recycles the workers, since
+    the abandoned render would otherwise keep one busy. Like RenderPool,
+    at most ``workers + queue_depth`` renders are admitted at once; beyond
+    that ``render`` raises RenderPoolSaturatedError.
+    """
+
+    # After the pool breaks, skip WeasyPrint for a while instead of
+    # respawning workers that will fail again on every export
+    BROKEN_COOLDOWN_SECONDS = 60.0
+
+    def __init__(
+        self,
+        workers: int,
+        timeout: float,
+        queue_depth: int = settings.export_pdf_queue_depth,
+        retry_after: int = settings.export_render_retry_after_seconds,
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.queue_depth = queue_depth
+        self.retry_after = retry_after
+        self.pending = 0
+        self.rejected = 0
+        self.recycled = 0
+        self._pool: ProcessPoolExecutor | None = None
+        # Bumped when the pool is retired on purpose, so renders it breaks do not trigger the cooldown
+        self._generation = 0
+        self._unavailable_until = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_depth
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        return self._pool
+
+    def start(self) -> None:
+        """Spawn and warm every worker now rather than on the first export"""
+        pool = self._executor()
+        for _ in range(self.workers):
+            pool.submit(_ready)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _recycle(self) -> None:
+        """Kill the workers (and any render still running) and respawn on next use.
+
+        Other renders in flight on the old pool fail and fall back like any
+        other render error.
+        """
+        pool, self._pool = self._pool, None
+        self._generation += 1
+        self.recycled += 1
+        if pool is None:
+            return
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def ensure_capacity(self) -> None:
+        """Raise RenderPoolSaturatedError now if no render would be admitted"""
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            raise RenderPoolSaturatedError("Export workers are busy", self.retry_after)
+
+    async def render(self, html: str) -> bytes:
+        """PDF bytes for ``html``; raises TimeoutError past the deadline"""
+        if time.monotonic() < self._unavailable_until:
+            raise RuntimeError("HTML PDF renderer unavailable")
+        self.ensure_capacity()
+        self.pending += 1
+        generation = self._generation
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._executor(), render_pdf, html), self.timeout
+            )
+        except TimeoutError:
+            # wait_for only abandons the await; the render keeps its worker until the process dies
+            if generation == self._generation:
+                logger.warning("export.html_pdf.recycled", extra={"timeout_seconds": self.timeout})
+                self._recycle()
+            raise
+        except BrokenProcessPool:
+            if generation != self._generation:
+                raise
+            # A worker crashed or could not import WeasyPrint; rebuild after the cooldown
+            logger.warning("export.html_pdf.pool_broken", extra={"cooldown_seconds": self.BROKEN_COOLDOWN_SECONDS})
+            self.shutdown()
+            self._unavailable_until = time.monotonic() + self.BROKEN_COOLDOWN_SECONDS
+            raise
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "recycled": self.recycled,
+        }
+
+
+html_pdf_renderer = HTMLPDFRenderer(
+    settings.export_pdf_workers,
+    settings.export_pdf_timeout_seconds,
+    settings.export_pdf_queue_depth,
+    settings.export_render_retry_after_seconds,
+)
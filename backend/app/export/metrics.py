@@ -0,0 +1,182 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import field
+
+from app.export.workers import render_pool
+
+# Histogram upper bounds: stage durations in seconds, output sizes in bytes
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+METRIC_PREFIX = "arete_export"
+
+
+@dataclass
+class Histogram:
+    """Prometheus-style histogram: per-bucket counts plus count and sum"""
+    buckets: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+
+    def __post_init__(self):
+        self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def lines(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total:g}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class ExportTrace:
+    """Stage timings of one export request, for the Server-Timing header"""
+
+    def __init__(self):
+        self.spans: list[tuple[str, float]] = []
+
+    def server_timing(self) -> str:
+        """``stage;dur=ms`` entries, repeated stages summed, in first-seen order"""
+        totals: dict[str, float] = {}
+        for stage, seconds in self.spans:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in totals.items())
+
+
+_current_trace: ContextVar[ExportTrace | None] = ContextVar("export_trace", default=None)
+
+
+class ExportMetrics:
+    """Process-wide export counters: stage latency, output size, outcomes, fallbacks"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: dict[str, Histogram] = {}
+        self.output_bytes: dict[str, Histogram] = {}
+        self.exports: dict[tuple[str, str, str], int] = {}
+        self.fallbacks: dict[str, int] = {}
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages.setdefault(stage, Histogram(STAGE_BUCKETS)).observe(seconds)
+
+    def observe_output(self, format: str, size: int) -> None:
+        with self._lock:
+            self.output_bytes.setdefault(format, Histogram(SIZE_BUCKETS)).observe(size)
+
+    def record_export(self, format: str, template: str, outcome: str) -> None:
+        with self._lock:
+            key = (format, template, outcome)
+            self.exports[key] = self.exports.get(key, 0) + 1
+
+    def record_fallback(self, kind: str) -> None:
+        """``skill_categorization``: LLM failed, skills filed under Other;
+        ``html_template``: WeasyPrint failed, classic PDF served instead"""
+        with self._lock:
+            self.fallbacks[kind] = self.fallbacks.get(kind, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {
+                    stage: {
+                        "count": hist.count,
+                        "avg_ms": round(hist.total / hist.count * 1000, 1) if hist.count else 0.0,
+                    }
+                    for stage, hist in self.stages.items()
+                },
+                "output_bytes": {
+                    format: {"count": hist.count, "avg": round(hist.total / hist.count) if hist.count else 0}
+                    for format, hist in self.output_bytes.items()
+                },
+                "exports": {"/".join(key): count for key, count in self.exports.items()},
+                "fallbacks": dict(self.fallbacks),
+            }
+
+    def render(self) -> str:
+        """Prometheus text exposition (version 0.0.4)"""
+        name = METRIC_PREFIX
+        lines = [
+            f"# HELP {name}_stage_duration_seconds Time spent in each export stage",
+            f"# TYPE {name}_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for stage, hist in sorted(self.stages.items()):
+                lines += hist.lines(f"{name}_stage_duration_seconds", f'stage="{stage}"')
+            lines += [
+                f"# HELP {name}_output_bytes Size of exported documents",
+                f"# TYPE {name}_output_bytes histogram",
+            ]
+            for format, hist in sorted(self.output_bytes.items()):
+                lines += hist.lines(f"{name}_output_bytes", f'format="{format}"')
+            lines += [
+                f"# HELP {name}_requests_total Exports by format, template and outcome",
+                f"# TYPE {name}_requests_total counter",
+            ]
+            for (format, template, outcome), count in sorted(self.exports.items()):
+                lines.append(f'{name}_requests_total{{format="{format}",template="{template}",outcome="{outcome}"}} {count}')
+            lines += [
+                f"# HELP {name}_fallbacks_total Degraded exports (LLM categorization, HTML template)",
+                f"# TYPE {name}_fallbacks_total counter",
+            ]
+            for kind, count in sorted(self.fallbacks.items()):
+                lines.append(f'{name}_fallbacks_total{{kind="{kind}"}} {count}')
+
+        pool = render_pool.stats()
+        lines += [
+            f"# HELP {name}_render_pool_pending Render jobs running or queued",
+            f"# TYPE {name}_render_pool_pending gauge",
+            f"{name}_render_pool_pending {pool['pending']}",
+            f"# HELP {name}_render_pool_capacity Render jobs admitted before shedding",
+            f"# TYPE {name}_render_pool_capacity gauge",
+            f"{name}_render_pool_capacity {pool['capacity']}",
+            f"# HELP {name}_render_pool_rejected_total Render jobs shed with a 503",
+            f"# TYPE {name}_render_pool_rejected_total counter",
+            f"{name}_render_pool_rejected_total {pool['rejected']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+export_metrics = ExportMetrics()
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a stage into the metrics and, inside export_trace, the request's trace"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        export_metrics.observe_stage(stage, elapsed)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.spans.append((stage, elapsed))
+
+
+@contextmanager
+def export_trace() -> Iterator[ExportTrace]:
+    """Collect the spans of one request (including tasks it starts)"""
+    trace = ExportTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
@@ -0,0 +1,81 @@
+import os
+import tempfile
+from collections.abc import Callable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+from typing import BinaryIO
+
+# Read size when streaming a rendered file to the client
+CHUNK_SIZE = 64 * 1024
+
+
+def write_to_spool(write: Callable[..., None], spool_dir: str | None, *args: Any) -> tuple[str, int]:
+    """Run ``write(out, *args)`` into a new temp file; return its path and size.
+
+    Runs in a render worker, so only the path crosses the process boundary
+    instead of the whole document.
+    """
+    fd, path = tempfile.mkstemp(prefix="arete-export-", dir=spool_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            write(out, *args)
+            return path, out.tell()
+    except BaseException:
+        os.unlink(path)
+        raise
+
+
+@dataclass
+class ExportFile:
+    """A rendered export, either spooled to a temp file or held in memory.
+
+    ``chunks`` streams it without copying the whole document: spooled files
+    are read CHUNK_SIZE at a time and deleted once sent, in-memory content
+    is sliced through a memoryview.
+    """
+    content_type: str
+    filename: str
+    size: int
+    path: str | None = None
+    content: bytes | None = None
+
+    @classmethod
+    def from_bytes(cls, content: bytes, content_type: str, filename: str) -> "ExportFile":
+        return cls(content_type, filename, len(content), content=content)
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes | memoryview]:
+        if self.content is not None:
+            view = memoryview(self.content)
+            for start in range(0, self.size, chunk_size):
+                yield view[start:start + chunk_size]
+            return
+        try:
+            with self.open() as source:
+                while chunk := source.read(chunk_size):
+                    yield chunk
+        finally:
+            self.discard()
+
+    def open(self) -> BinaryIO:
+        assert self.path is not None
+        return open(self.path, "rb")
+
+    def read(self) -> bytes:
+        """The whole document (and the temp file removed)"""
+        if self.content is not None:
+            return self.content
+        try:
+            with self.open() as source:
+                return source.read()
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        """Remove the temp file, if any; safe to call more than once"""
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
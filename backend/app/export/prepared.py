@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Any
+from xml.sax.saxutils import escape
+
+
+def escape_markup(value: Any) -> Any:
+    """Copy of ``value`` with every string escaped for ReportLab paragraph markup.
+
+    Paragraph text is parsed as XML-like markup, so a resume line such as
+    "Improved <b>throughput" would otherwise fail to render or lose text.
+    """
+    if isinstance(value, str):
+        return escape(value)
+    if isinstance(value, dict):
+        return {key: escape_markup(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [escape_markup(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class PreparedResume:
+    """Render-ready resume shared by every export format and template.
+
+    Built once per resume content (``digest``): skills deduplicated and
+    categorized, projects in display order, and a markup-escaped copy of
+    everything for the ReportLab renderer. HTML templates escape on render
+    and DOCX takes plain text, so both use the raw fields.
+    """
+    digest: str
+    data: dict
+    skills: dict[str, list[str]]
+    projects: list[dict]
+    markup: tuple[dict, dict[str, list[str]], list[dict]]
+
+    @classmethod
+    def build(cls, digest: str, data: dict, skills: dict[str, list[str]], projects: list[dict]) -> "PreparedResume":
+        markup = (escape_markup(data), escape_markup(skills), escape_markup(projects))
+        return cls(digest, data, skills, projects, markup)
@@ -0,0 +1,153 @@
+import asyncio
+import io
+import logging
+import os
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.hashing import content_hash
+from app.export.classic_pdf import render_classic_pdf
+from app.export.html_pdf import html_pdf_renderer
+from app.export.prepared import PreparedResume
+from app.export.registry import template_registry
+from app.export.service import export_service
+from app.export.workers import render_pool
+
+logger = logging.getLogger(__name__)
+
+# Rendered into every template's thumbnail; skills are pre-categorized so
+# previews never call the LLM
+SAMPLE_RESUME = {
+    "personal_info": {
+        "name": "Alex Morgan",
+        "email": "alex.morgan@example.com",
+        "phone": "+1 555 0100",
+        "location": "Portland, OR",
+        "github": "https://github.com/alexmorgan",
+    },
+    "summary": "Backend engineer building reliable APIs and data pipelines.",
+    "experience": [
+        {
+            "title": "Senior Software Engineer",
+            "company": "Northwind Labs",
+            "duration": "2021 - Present",
+            "description": [
+                "Led the migration of billing services to FastAPI, cutting p95 latency by 40%",
+                "Designed an event pipeline on Kafka processing 2M events a day",
+            ],
+        },
+        {
+            "title": "Software Engineer",
+            "company": "Contoso",
+            "duration": "2018 - 2021",
+            "description": ["Built internal tooling in Python and React used by 300 engineers"],
+        },
+    ],
+    "skills": {"technical": ["Python", "FastAPI", "PostgreSQL", "Kafka", "AWS"], "soft_skills": ["Mentoring"]},
+    "projects": [
+        {
+            "name": "tracekit",
+            "description": "Open-source distributed tracing helpers",
+            "technologies": ["Python", "OpenTelemetry"],
+        },
+    ],
+    "education": [{"degree": "BSc Computer Science", "institution": "Oregon State University", "graduation_year": "2018"}],
+}
+SAMPLE_SKILLS = {
+    "Technical Skills": ["AWS", "FastAPI", "Kafka", "PostgreSQL", "Python"],
+    "Soft Skills": ["Mentoring"],
+}
+
+
+class PreviewUnavailableError(Exception):
+    """The template's preview could not be rendered (e.g. WeasyPrint missing)"""
+
+
+def rasterize_first_page(pdf: bytes, width: int) -> bytes:
+    """PNG of the PDF's first page, ``width`` pixels wide (runs in a render worker)"""
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument(pdf)
+    try:
+        page = document[0]
+        image = page.render(scale=width / page.get_width()).to_pil()
+    finally:
+        document.close()
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+class TemplatePreviews:
+    """PNG thumbnails of each export template, rendered from SAMPLE_RESUME.
+
+    A thumbnail is rendered once per template version and kept on disk as
+    ``<id>-<version>.png``, so it survives restarts and is regenerated only
+    when the template's files change. Concurrent first requests for the
+    same template share one render.
+    """
+
+    def __init__(self, directory: str | Path, width: int):
+        self.directory = Path(directory)
+        self.width = width
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def path(self, template_id: str) -> Path:
+        return self.directory / f"{template_id}-{template_registry.version(template_id)}.png"
+
+    def url(self, template_id: str) -> str:
+        """Versioned URL, so clients can cache it indefinitely"""
+        return f"/export/templates/{template_id}/preview?v={template_registry.version(template_id)}"
+
+    async def get(self, template_id: str) -> Path:
+        """Thumbnail file for ``template_id``, rendering it on first use"""
+        path = self.path(template_id)
+        if path.exists():
+            return path
+        lock = self._locks.setdefault(template_id, asyncio.Lock())
+        async with lock:
+            if not path.exists():
+                png = await self._render(template_id)
+                self._store(template_id, path, png)
+        return path
+
+    async def _render(self, template_id: str) -> bytes:
+        spec = template_registry.get(template_id)
+        prepared = PreparedResume.build(
+            content_hash(SAMPLE_RESUME),
+            SAMPLE_RESUME,
+            SAMPLE_SKILLS,
+            SAMPLE_RESUME["projects"],
+        )
+        try:
+            if spec.engine == "html":
+                # No classic fallback here: a preview must show the template itself
+                html = await export_service.render_template_html(spec.id, SAMPLE_RESUME, prepared)
+                pdf = await html_pdf_renderer.render(html)
+            else:
+                pdf = await render_pool.run(render_classic_pdf, *prepared.markup)
+            return await render_pool.run(rasterize_first_page, pdf, self.width)
+        except Exception as e:
+            logger.warning("export.preview.failed", extra={"template": template_id, "error": str(e) or type(e).__name__})
+            raise PreviewUnavailableError(f"Preview for {template_id} is unavailable") from e
+
+    def _store(self, template_id: str, path: Path, png: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(png)
+        os.replace(tmp, path)
+        # Thumbnails of earlier versions of this template
+        for stale in self.directory.glob(f"{template_id}-*.png"):
+            if stale != path and stale.stem.rsplit("-", 1)[0] == template_id:
+                stale.unlink(missing_ok=True)
+
+    async def warm(self) -> None:
+        """Render every missing thumbnail (startup); failures are logged, not raised"""
+        for template_id in template_registry.ids():
+            try:
+                await self.get(template_id)
+            except PreviewUnavailableError:
+                pass
+
+
+template_previews = TemplatePreviews(settings.export_preview_dir, settings.export_preview_width)
@@ -0,0 +1,160 @@
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+from jinja2 import Template
+from markupsafe import Markup
+
+from app.core.hashing import content_hash
+from app.export import classic_pdf
+from app.export import html_builders
+from app.export.rendering import TEMPLATES_DIR
+from app.export.rendering import get_template
+from app.export.rendering import template_css
+
+logger = logging.getLogger(__name__)
+
+# How a template becomes a PDF, and its relative cost per render
+ENGINES = {
+    "reportlab": "low",  # ReportLab in the render pool, tens of milliseconds
+    "html": "high",      # HTML laid out by WeasyPrint, hundreds of milliseconds
+}
+
+
+@dataclass(frozen=True)
+class TemplateSpec:
+    """An export template declared by ``templates/<id>.json``"""
+    id: str
+    name: str
+    description: str
+    engine: str
+    formats: tuple[str, ...]
+    html: str | None = None
+    builder: str | None = None
+    stylesheet: str | None = None
+    order: int = 0
+
+    @classmethod
+    def from_manifest(cls, template_id: str, manifest: dict) -> "TemplateSpec":
+        engine = manifest.get("engine")
+        if engine not in ENGINES:
+            raise ValueError(f"unknown engine {engine!r}")
+        if engine == "html" and not (manifest.get("html") or manifest.get("builder")):
+            raise ValueError("html templates need an 'html' file or a 'builder'")
+        if manifest.get("builder") and manifest["builder"] not in html_builders.BUILDERS:
+            raise ValueError(f"unknown builder {manifest['builder']!r}")
+        return cls(
+            id=template_id,
+            name=manifest["name"],
+            description=manifest.get("description", ""),
+            engine=engine,
+            formats=tuple(manifest.get("formats", ["pdf"])),
+            html=manifest.get("html"),
+            builder=manifest.get("builder"),
+            stylesheet=manifest.get("stylesheet"),
+            order=manifest.get("order", 0),
+        )
+
+
+class TemplateRegistry:
+    """Export templates discovered from manifests in the templates directory.
+
+    Discovery only reads the small JSON manifests. Jinja sources are
+    compiled and stylesheets minified on a template's first render and
+    cached from then on (see rendering.py). Adding a template means
+    dropping a manifest, and its HTML/CSS for the html engine, into the
+    directory. Built-in html templates name an f-string builder from
+    html_builders.py instead, which renders several times faster.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._specs: dict[str, TemplateSpec] | None = None
+        # Observed render time per template: (renders, total seconds)
+        self._timings: dict[str, tuple[int, float]] = {}
+        self._versions: dict[str, str] = {}
+
+    def specs(self) -> dict[str, TemplateSpec]:
+        if self._specs is None:
+            self._specs = self._discover()
+        return self._specs
+
+    def _discover(self) -> dict[str, TemplateSpec]:
+        specs = []
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                specs.append(TemplateSpec.from_manifest(path.stem, json.loads(path.read_text())))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("export.templates.invalid_manifest", extra={"path": path.name, "error": str(e)})
+        return {spec.id: spec for spec in sorted(specs, key=lambda spec: (spec.order, spec.id))}
+
+    def ids(self) -> list[str]:
+        return list(self.specs())
+
+    def get(self, template_id: str) -> TemplateSpec:
+        """Spec for ``template_id``; ValueError for unknown templates"""
+        try:
+            return self.specs()[template_id]
+        except KeyError:
+            raise ValueError(f"Unknown template: {template_id}") from None
+
+    def compiled(self, template_id: str) -> Template:
+        """Compiled Jinja template of an html-engine template (compiled on first use)"""
+        spec = self.get(template_id)
+        if spec.html is None:
+            raise ValueError(f"Template {template_id} is not rendered from a Jinja file")
+        return get_template(spec.html)
+
+    def render_html(self, template_id: str, resume: dict, skills: dict[str, list[str]], projects: list[dict]) -> str:
+        """HTML of an html-engine template, from its builder or its Jinja file"""
+        spec = self.get(template_id)
+        css = self.stylesheet(template_id)
+        if spec.builder is not None:
+            return html_builders.BUILDERS[spec.builder](resume, skills, projects, css)
+        return self.compiled(template_id).render(
+            resume=resume, personal=resume.get("personal_info", {}), css=css, skills=skills, projects=projects
+        )
+
+    def version(self, template_id: str) -> str:
+        """Hash of everything that shapes the template's output.
+
+        The manifest, plus the HTML (with the shared ``_`` partials) or the
+        builder code and the CSS for html templates, or the ReportLab layout
+        code for the classic one. Anything cached per template (previews) is
+        keyed by it.
+        """
+        if template_id not in self._versions:
+            spec = self.get(template_id)
+            sources = [self.directory / f"{spec.id}.json"]
+            if spec.engine == "html":
+                if spec.builder is not None:
+                    sources.append(Path(html_builders.__file__))
+                else:
+                    sources += [self.directory / spec.html, *sorted(self.directory.glob("_*.html"))]
+                if spec.stylesheet:
+                    sources.append(self.directory / f"{spec.stylesheet}.css")
+            else:
+                sources.append(Path(classic_pdf.__file__))
+            self._versions[template_id] = content_hash([path.read_text() for path in sources if path.exists()])
+        return self._versions[template_id]
+
+    def stylesheet(self, template_id: str) -> Markup:
+        spec = self.get(template_id)
+        return template_css(spec.stylesheet) if spec.stylesheet else Markup("")
+
+    def record_render(self, template_id: str, seconds: float) -> None:
+        renders, total = self._timings.get(template_id, (0, 0.0))
+        self._timings[template_id] = (renders + 1, total + seconds)
+
+    def render_cost(self, template_id: str) -> dict:
+        """Relative cost of the engine plus the mean render time observed so far"""
+        renders, total = self._timings.get(template_id, (0, 0.0))
+        return {
+            "tier": ENGINES[self.get(template_id).engine],
+            "renders": renders,
+            "mean_ms": round(total * 1000 / renders, 1) if renders else None,
+        }
+
+
+template_registry = TemplateRegistry(TEMPLATES_DIR)
@@ -0,0 +1,53 @@
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from jinja2 import Environment
+from jinja2 import FileSystemLoader
+from jinja2 import Template
+from markupsafe import Markup
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+_STRING_RE = re.compile(r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')""")
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_SPACE_RE = re.compile(r"\s+")
+_PUNCTUATION_RE = re.compile(r"\s*([{};:,>])\s*")
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and redundant whitespace, leaving quoted strings untouched"""
+    parts = _STRING_RE.split(_COMMENT_RE.sub("", css))
+    for i in range(0, len(parts), 2):
+        parts[i] = _PUNCTUATION_RE.sub(r"\1", _SPACE_RE.sub(" ", parts[i]))
+    return "".join(parts).replace(";}", "}").strip()
+
+
+def display_url(url: str) -> str:
+    """URL without its scheme, for link text"""
+    return url.replace("https://", "").replace("http://", "")
+
+
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+    cache_size=-1,
+)
+_env.filters["display_url"] = display_url
+
+
+@lru_cache(maxsize=None)
+def template_css(name: str) -> Markup:
+    """``templates/<name>.css``, read and minified once per process"""
+    css_file = TEMPLATES_DIR / f"{name}.css"
+    return Markup(minify_css(css_file.read_text())) if css_file.exists() else Markup("")
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> Template:
+    """``templates/<name>``, compiled on first use and reused for the process"""
+    return _env.get_template(name)
+
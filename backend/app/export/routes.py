@@ -1,48 +1,94 @@
 from fastapi import APIRouter, HTTPException, Path
-from fastapi.responses import Response
+from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
-from app.export.schemas import ExportRequest, AVAILABLE_TEMPLATES, TemplateInfo
+from app.core.config import settings
+from app.export.metrics import export_trace
+from app.export.previews import PreviewUnavailableError
+from app.export.previews import template_previews
+from app.export.schemas import BulkExportRequest, ExportRequest, TemplateInfo, available_templates
 from app.export.service import export_service
+from app.export.workers import RenderPoolSaturatedError
 
 router = APIRouter(prefix="/export", tags=["export"])
 
+# Preview URLs carry the template version, so a cached thumbnail never goes stale
+PREVIEW_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
 @router.get("/templates")
 async def get_available_templates() -> list[TemplateInfo]:
-    """Get list of available resume templates"""
-    return AVAILABLE_TEMPLATES
+    """Get available resume templates with their formats and render cost"""
+    return available_templates()
+
+
+@router.get("/templates/{template_id}/preview")
+async def get_template_preview(template_id: str) -> FileResponse:
+    """PNG thumbnail of a template rendered from a sample resume"""
+
+    try:
+        path = await template_previews.get(template_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PreviewUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return FileResponse(path, media_type="image/png", headers={"Cache-Control": PREVIEW_CACHE_CONTROL})
+
+
+@router.post("/bulk")
+async def export_bulk(request: BulkExportRequest) -> StreamingResponse:
+    """Export many resumes x formats x templates as a ZIP, streamed while it is built"""
+
+    try:
+        archive = await export_service.start_bulk_export(
+            request.resume_ids, request.formats, request.templates
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RenderPoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+    return StreamingResponse(
+        archive,
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=resumes.zip"}
+    )
 
 
 @router.post("/{format}")
 async def export_resume(
     format: str = Path(..., regex="^(pdf|docx)$"),
     request: ExportRequest = ...
-) -> Response:
+) -> StreamingResponse:
     """Export optimized resume in specified format with chosen template"""
 
     try:
-        file_content, content_type, filename = await export_service.export_resume(
-            request.resume_id, format, request.template
-        )
-        
-        # For PDF format (which returns HTML), adjust headers for proper browser handling
-        if format == "pdf" and content_type == "text/html":
-            return Response(
-                content=file_content,
-                media_type="text/html",
-                headers={
-                    "Content-Disposition": f"inline; filename={filename}",
-                    "Content-Type": "text/html; charset=utf-8"
-                }
+        with export_trace() as trace:
+            export = await export_service.export_file(
+                request.resume_id, format, request.template
             )
-        
-        return Response(
-            content=file_content,
-            media_type=content_type,
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+
+        # Streamed from the spooled file in chunks; Content-Length lets clients show progress
+        headers = {
+            "Content-Disposition": f"attachment; filename={export.filename}",
+            "Content-Length": str(export.size),
+        }
+        if settings.export_server_timing:
+            headers["Server-Timing"] = trace.server_timing()
+        return StreamingResponse(
+            export.chunks(),
+            media_type=export.content_type,
+            headers=headers,
+            background=BackgroundTask(export.discard),
         )
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except RenderPoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
\ No newline at end of file
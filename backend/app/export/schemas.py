@@ -1,11 +1,46 @@
 from typing import Literal
 
 from pydantic import BaseModel
+from pydantic import Field
+from pydantic import field_validator
+
+from app.export.previews import template_previews
+from app.export.registry import template_registry
+
+
+def _known_template(template: str) -> str:
+    """Template ids are whatever the registry discovered; unknown ids are a 422"""
+    template_registry.get(template)
+    return template
 
 
 class ExportRequest(BaseModel):
     resume_id: str
-    template: Literal["classic", "modern"] = "classic"
+    template: str = "classic"
+
+    @field_validator("template")
+    @classmethod
+    def validate_template(cls, template: str) -> str:
+        return _known_template(template)
+
+
+class BulkExportRequest(BaseModel):
+    """Every resume in every requested format and template, as one ZIP"""
+    resume_ids: list[str] = Field(min_length=1, max_length=100)
+    formats: list[Literal["pdf", "docx"]] = Field(default=["pdf"], min_length=1)
+    templates: list[str] = Field(default=["classic"], min_length=1)
+
+    @field_validator("templates")
+    @classmethod
+    def validate_templates(cls, templates: list[str]) -> list[str]:
+        return [_known_template(template) for template in templates]
+
+
+class RenderCost(BaseModel):
+    """Relative engine cost and the mean render time observed by this process"""
+    tier: Literal["low", "high"]
+    renders: int
+    mean_ms: float | None = None
 
 
 class TemplateInfo(BaseModel):
@@ -14,19 +49,22 @@ class TemplateInfo(BaseModel):
     name: str
     description: str
     preview_image: str | None = None
+    engine: str
+    formats: list[str]
+    render_cost: RenderCost
 
 
-AVAILABLE_TEMPLATES: list[TemplateInfo] = [
-    TemplateInfo(
-        id="classic",
-        name="ATS Classic",
-        description="Single column, maximum ATS compatibility",
-        preview_image=None
-    ),
-    TemplateInfo(
-        id="modern",
-        name="Modern Professional",
-        description="Clean design with accent colors and improved typography",
-        preview_image=None
-    ),
-]
\ No newline at end of file
+def available_templates() -> list[TemplateInfo]:
+    """Every registered template with its capabilities, in display order"""
+    return [
+        TemplateInfo(
+            id=spec.id,
+            name=spec.name,
+            description=spec.description,
+            preview_image=template_previews.url(spec.id),
+            engine=spec.engine,
+            formats=list(spec.formats),
+            render_cost=RenderCost(**template_registry.render_cost(spec.id)),
+        )
+        for spec in template_registry.specs().values()
+    ]
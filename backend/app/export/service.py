@@ -1,16 +1,62 @@
-import io
+import asyncio
+import copy
 import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections import deque
+from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextlib import suppress
 from pathlib import Path
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-
-from docx import Document
-from docx.shared import Inches
+from typing import Any
 
+from app.core.config import settings
 from app.core.database import get_supabase_service_client
+from app.core.hashing import content_hash
+from app.core.llm import LLMPriority
+from app.core.llm import build_messages
 from app.core.llm import get_llm_response
+from app.core.llm import request_json
+from app.core.skills import SKILL_ALIASES
+from app.core.skills import canonical_skill
+from app.export import html_builders
+from app.export.classic_docx import DOCX_CONTENT_TYPE
+from app.export.classic_docx import write_classic_docx
+from app.export.classic_pdf import write_classic_pdf
+from app.export.html_pdf import html_pdf_renderer
+from app.export.metrics import export_metrics
+from app.export.metrics import span
+from app.export.output import ExportFile
+from app.export.output import write_to_spool
+from app.export.prepared import PreparedResume
+from app.export.registry import template_registry
+from app.export.rendering import template_css
+from app.export.workers import RenderPoolSaturatedError
+from app.export.workers import render_pool
+from app.export.zip_stream import stream_zip
+
+logger = logging.getLogger(__name__)
+
+
+class CategorizedSkills(dict):
+    """Skill category map; ``fallback`` is set when the LLM failed and skills
+    were filed under Other, so the result must not be cached"""
+
+    def __init__(self, categories=(), fallback: bool = False):
+        super().__init__(categories)
+        self.fallback = fallback
+
+
+def _discard_spooled(job: asyncio.Future) -> None:
+    """Done-callback: delete the temp file of a spooled render nobody is waiting for"""
+    if not job.cancelled() and job.exception() is None:
+        with suppress(FileNotFoundError):
+            os.unlink(job.result()[0])
 
 
 class ExportService:
@@ -160,39 +206,8 @@ class ExportService:
         },
     }
 
-    # Skill name normalization (canonical forms)
-    SKILL_ALIASES = {
-        # JavaScript ecosystem
-        'js': 'JavaScript', 'javascript': 'JavaScript',
-        'ts': 'TypeScript', 'typescript': 'TypeScript',
-        'react.js': 'React', 'reactjs': 'React', 'react': 'React',
-        'vue.js': 'Vue', 'vuejs': 'Vue', 'vue': 'Vue',
-        'angular.js': 'Angular', 'angularjs': 'Angular',
-        'node.js': 'Node.js', 'nodejs': 'Node.js', 'node': 'Node.js',
-        'next.js': 'Next.js', 'nextjs': 'Next.js',
-        'express.js': 'Express', 'expressjs': 'Express',
-        'nest.js': 'NestJS', 'nestjs': 'NestJS',
-        # Databases
-        'postgres': 'PostgreSQL', 'postgresql': 'PostgreSQL',
-        'mongo': 'MongoDB', 'mongodb': 'MongoDB',
-        'mssql': 'SQL Server', 'sql server': 'SQL Server',
-        # Cloud & DevOps
-        'k8s': 'Kubernetes', 'kubernetes': 'Kubernetes',
-        'aws': 'AWS', 'amazon web services': 'AWS',
-        'gcp': 'GCP', 'google cloud': 'GCP', 'google cloud platform': 'GCP',
-        'azure': 'Azure', 'microsoft azure': 'Azure',
-        'cicd': 'CI/CD', 'ci/cd': 'CI/CD',
-        # Frameworks
-        'rails': 'Ruby on Rails', 'ruby on rails': 'Ruby on Rails',
-        'spring boot': 'Spring Boot', 'springboot': 'Spring Boot',
-        'asp.net core': 'ASP.NET Core', 'aspnet': 'ASP.NET',
-        'fastapi': 'FastAPI',
-        # Tools
-        'vscode': 'VS Code', 'vs code': 'VS Code',
-        'tailwindcss': 'Tailwind CSS', 'tailwind': 'Tailwind CSS',
-        # CSS
-        'scss': 'SCSS/Sass', 'sass': 'SCSS/Sass',
-    }
+    # Skill name normalization (canonical forms), shared with job keyword matching
+    SKILL_ALIASES = SKILL_ALIASES
 
     # Skills that should NEVER be in certain categories (validation rules)
     CATEGORY_EXCLUSIONS = {
@@ -253,11 +268,8 @@ STRICT RULES - Follow these exactly:
 - Soft skills: Agile, Scrum, Leadership
 - Non-tech domains only
 
-Skills to categorize:
-{skills}
-
 Return ONLY valid JSON:
-{{
+{
   "Languages": [],
   "Frontend": [],
   "Backend": [],
@@ -265,10 +277,12 @@ Return ONLY valid JSON:
   "Cloud & DevOps": [],
   "Tools": [],
   "Other": []
-}}"""
+}"""
 
     def __init__(self):
         self.templates_dir = Path(__file__).parent / "templates"
+        # Prepared resumes by content hash, least recently used first
+        self._prepared: OrderedDict[str, PreparedResume] = OrderedDict()
 
     def _sort_projects(self, projects: list[dict]) -> list[dict]:
         """Sort projects: resume-sourced first, GitHub-sourced last.
@@ -357,8 +371,7 @@ Return ONLY valid JSON:
 
     def _normalize_skill(self, skill: str) -> str:
         """Normalize skill name to canonical form"""
-        skill_lower = skill.lower().strip()
-        return self.SKILL_ALIASES.get(skill_lower, skill.strip())
+        return canonical_skill(skill)
     
     def _quick_categorize(self, skill: str) -> str | None:
         """Try to categorize skill using known mappings. Returns None if unknown."""
@@ -381,27 +394,22 @@ Return ONLY valid JSON:
         if not skills:
             return {}
         
-        prompt = self.CATEGORIZATION_PROMPT.format(skills=json.dumps(skills))
+        # Rules are a static (cacheable) system block; only the skills vary
+        messages = build_messages(
+            self.CATEGORIZATION_PROMPT, f"Skills to categorize:\n{json.dumps(skills)}"
+        )
         
         try:
-            response = await get_llm_response([
-                {"role": "user", "content": prompt}
-            ])
-            
-            # Extract JSON from response (handle markdown code blocks)
-            clean_response = response.strip()
-            if "```json" in clean_response:
-                clean_response = clean_response.split("```json")[1]
-                clean_response = clean_response.split("```")[0]
-            elif "```" in clean_response:
-                clean_response = clean_response.split("```")[1]
-                clean_response = clean_response.split("```")[0]
-            
-            json_start = clean_response.find('{')
-            json_end = clean_response.rfind('}') + 1
-            if json_start != -1 and json_end > json_start:
-                raw_result = json.loads(clean_response[json_start:json_end])
-                
+            raw_result = await request_json(
+                messages,
+                dict[str, list[str]],
+                call_site="export.categorize_skills",
+                complete=get_llm_response,
+                cache=True,
+                priority=LLMPriority.EXPORT,
+            )
+
+            if raw_result:
                 # Normalize category names from LLM response
                 normalized = {}
                 category_mapping = {
@@ -436,10 +444,11 @@ Return ONLY valid JSON:
                 return normalized
                 
         except Exception as e:
-            print(f"LLM categorization failed: {e}")
+            logger.warning("export.categorize_skills.failed", extra={"error": str(e)})
         
         # Fallback: put all in Other
-        return {"Other": skills}
+        export_metrics.record_fallback("skill_categorization")
+        return CategorizedSkills({"Other": skills}, fallback=True)
     
     async def _deduplicate_and_categorize_skills(
         self, skills_dict: dict
@@ -449,20 +458,19 @@ Return ONLY valid JSON:
         Handles both old format (frameworks) and new format (soft_skills) for backward compatibility.
         """
         
-        # Collect and deduplicate all technical skills (technical + frameworks for backward compatibility)
-        technical_skills = set()
+        # Collect and deduplicate all technical skills (technical + frameworks for backward compatibility),
+        # keyed case-insensitively; the first spelling seen wins
+        technical_skills: dict[str, str] = {}
         for category in ['technical', 'frameworks', 'tools', 'languages']:
             for skill in skills_dict.get(category, []):
                 normalized = self._normalize_skill(skill)
-                if normalized.lower() not in {s.lower() for s in technical_skills}:
-                    technical_skills.add(normalized)
+                technical_skills.setdefault(normalized.lower(), normalized)
         
         # Collect soft skills (new field)
-        soft_skills = set()
+        soft_skills: dict[str, str] = {}
         for skill in skills_dict.get('soft_skills', []):
             normalized = self._normalize_skill(skill)
-            if normalized.lower() not in {s.lower() for s in soft_skills}:
-                soft_skills.add(normalized)
+            soft_skills.setdefault(normalized.lower(), normalized)
         
         # Categorize technical skills: quick-match first, collect unknowns for LLM
         categorized = {
@@ -470,8 +478,9 @@ Return ONLY valid JSON:
             'Databases': [], 'Cloud & DevOps': [], 'Tools': [], 'Other': []
         }
         unknown_skills = []
+        fallback = False
         
-        for skill in technical_skills:
+        for skill in technical_skills.values():
             category = self._quick_categorize(skill)
             if category:
                 categorized[category].append(skill)
@@ -481,6 +490,7 @@ Return ONLY valid JSON:
         # LLM categorization for unknown technical skills
         if unknown_skills:
             llm_results = await self._llm_categorize_skills(unknown_skills)
+            fallback = isinstance(llm_results, CategorizedSkills) and llm_results.fallback
             for category, skills in llm_results.items():
                 if category in categorized:
                     categorized[category].extend(skills)
@@ -500,840 +510,314 @@ Return ONLY valid JSON:
         if technical_combined:
             result['Technical Skills'] = sorted(set(technical_combined), key=str.lower)
         if soft_skills:
-            result['Soft Skills'] = sorted(set(soft_skills), key=str.lower)
+            result['Soft Skills'] = sorted(soft_skills.values(), key=str.lower)
         if categorized.get('Other'):
             result['Other'] = sorted(set(categorized['Other']), key=str.lower)
 
-        return result
+        return CategorizedSkills(result, fallback=fallback)
     
     async def export_resume(
         self, resume_id: str, format: str, template: str = "classic"
     ) -> tuple[bytes, str, str]:
         """Export resume in specified format with chosen template"""
+        with self._export_span(format, template):
+            resume_data = self._fetch_resume_data(resume_id)
+
+            if format == "pdf":
+                return await self._generate_pdf(resume_data, resume_id, template)
+            elif format == "docx":
+                return await self._generate_docx(resume_data, resume_id)
+            else:
+                raise ValueError(f"Unsupported format: {format}")
+
+    async def export_file(self, resume_id: str, format: str, template: str = "classic") -> ExportFile:
+        """Like export_resume, but the document stays spooled for streaming"""
+        with self._export_span(format, template):
+            resume_data = self._fetch_resume_data(resume_id)
+
+            if format == "pdf":
+                return await self._render_pdf(resume_data, resume_id, template)
+            elif format == "docx":
+                return await self._render_docx(resume_data, resume_id)
+            else:
+                raise ValueError(f"Unsupported format: {format}")
 
-        # Get resume data from database
+    @contextmanager
+    def _export_span(self, format: str, template: str) -> Iterator[None]:
+        """Time a whole export and count it by outcome (ok, rejected, error).
+
+        The stages inside (fetch, prepare, categorize, html, render_*) are
+        timed by their own spans into export_metrics and the request's
+        export_trace, if any.
+        """
+        outcome = "error"
+        try:
+            with span("total"):
+                yield
+            outcome = "ok"
+        except RenderPoolSaturatedError:
+            outcome = "rejected"
+            raise
+        finally:
+            export_metrics.record_export(format, template if format == "pdf" else "classic", outcome)
+
+    def _fetch_resume_data(self, resume_id: str) -> dict:
         supabase = get_supabase_service_client()
-        result = supabase.table("resumes").select("*").eq("id", resume_id).execute()
+        with span("fetch"):
+            result = supabase.table("resumes").select("*").eq("id", resume_id).execute()
 
         if not result.data:
             raise ValueError(f"Resume {resume_id} not found")
 
         resume_record = result.data[0]
         # Use optimized data if available, otherwise fall back to parsed data
-        resume_data = resume_record.get("optimized_data") or resume_record["parsed_data"]
-
-        if format == "pdf":
-            return await self._generate_pdf(resume_data, resume_id, template)
-        elif format == "docx":
-            return await self._generate_docx(resume_data, resume_id)
-        else:
-            raise ValueError(f"Unsupported format: {format}")
+        return resume_record.get("optimized_data") or resume_record["parsed_data"]
     
+    async def start_bulk_export(
+        self, resume_ids: list[str], formats: list[str], templates: list[str]
+    ) -> AsyncIterator[bytes]:
+        """ZIP stream with every resume in every format and template.
+
+        All resumes are fetched with one query and any missing id fails the
+        whole request before streaming starts (ValueError), as does a
+        saturated render pool (RenderPoolSaturatedError).
+        """
+        resume_ids = list(dict.fromkeys(resume_ids))
+        supabase = get_supabase_service_client()
+        with span("fetch"):
+            result = supabase.table("resumes").select("id, parsed_data, optimized_data").in_("id", resume_ids).execute()
+        records = {record["id"]: record for record in result.data or []}
+        missing = [resume_id for resume_id in resume_ids if resume_id not in records]
+        if missing:
+            raise ValueError(f"Resumes not found: {', '.join(missing)}")
+        render_pool.ensure_capacity()
+
+        resumes = {
+            resume_id: records[resume_id].get("optimized_data") or records[resume_id]["parsed_data"]
+            for resume_id in resume_ids
+        }
+        return stream_zip(self._bulk_entries(resumes, formats, templates))
+
+    async def _bulk_entries(
+        self, resumes: dict[str, dict], formats: list[str], templates: list[str]
+    ) -> AsyncGenerator[tuple[str, ExportFile], None]:
+        """(archive path, rendered file) per document, in request order.
+
+        Each resume is prepared once, concurrently. Documents render in
+        parallel, but at most one per render worker is waiting to be
+        written at a time, so memory stays flat however large the batch is.
+        """
+        prepared = {
+            resume_id: asyncio.ensure_future(self.prepare(resume_data))
+            for resume_id, resume_data in resumes.items()
+        }
+        jobs = [
+            (resume_id, format, template)
+            for resume_id in resumes
+            for format in dict.fromkeys(formats)
+            for template in (dict.fromkeys(templates) if format == "pdf" else ["classic"])
+        ]
+
+        async def render_entry(resume_id: str, format: str, template: str) -> tuple[str, ExportFile]:
+            resume_data = resumes[resume_id]
+            prepared_resume = await prepared[resume_id]
+            while True:
+                try:
+                    if format == "pdf":
+                        export = await self._render_pdf(resume_data, resume_id, template, prepared_resume)
+                        export_metrics.record_export(format, template, "ok")
+                        return f"{resume_id}/{template}/{export.filename}", export
+                    export = await self._render_docx(resume_data, resume_id, prepared_resume)
+                    export_metrics.record_export(format, "classic", "ok")
+                    return f"{resume_id}/{export.filename}", export
+                except RenderPoolSaturatedError as e:
+                    # Other exports took the free slots mid-stream; wait rather than truncate the archive
+                    await asyncio.sleep(e.retry_after)
+
+        window = max(1, render_pool.workers)
+        pending: deque[asyncio.Future] = deque()
+        try:
+            for job in jobs:
+                pending.append(asyncio.ensure_future(render_entry(*job)))
+                if len(pending) >= window:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            # Client went away mid-archive: stop the remaining work and drop finished temp files
+            for task in prepared.values():
+                task.cancel()
+            for task in pending:
+                if not task.cancel() and not task.exception():
+                    task.result()[1].discard()
+
     async def _generate_pdf(
-        self, resume_data: dict, resume_id: str, template: str = "classic"
+        self,
+        resume_data: dict,
+        resume_id: str,
+        template: str = "classic",
+        prepared: PreparedResume | None = None,
     ) -> tuple[bytes, str, str]:
-        """Generate PDF using selected template.
-
-        - classic: ReportLab-generated PDF (ATS-optimized)
-        - modern: HTML-based template (browser print to PDF)
+        """Generate PDF using selected template (see _render_pdf)"""
+        export = await self._render_pdf(resume_data, resume_id, template, prepared)
+        return export.read(), export.content_type, export.filename
+
+    async def _render_pdf(
+        self,
+        resume_data: dict,
+        resume_id: str,
+        template: str = "classic",
+        prepared: PreparedResume | None = None,
+    ) -> ExportFile:
+        """Render a PDF using selected template (see TemplateRegistry).
+
+        - reportlab engine (classic): ReportLab-generated PDF (ATS-optimized),
+          written by the render worker straight to a spooled temp file
+        - html engine (modern): Jinja template rendered by WeasyPrint in the
+          worker pool; falls back to classic if rendering fails or misses
+          its deadline, raises RenderPoolSaturatedError when that pool is full
+
+        ``prepared`` is passed when the caller already has it (bulk export).
         """
 
+        spec = template_registry.get(template)
         personal = resume_data.get("personal_info", {})
         name = personal.get("name", "resume").replace(" ", "_")
-
-        # Modern template returns HTML for browser-based PDF generation
-        if template == "modern":
-            html_content = await self._build_modern_html(resume_data)
-            filename = f"{name}_resume_modern.html"
-            return html_content.encode('utf-8'), "text/html", filename
-
-        # Classic template uses ReportLab for direct PDF generation
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=12,
-            alignment=1  # Center alignment
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=6,
-            spaceBefore=12
-        )
-        
-        skill_category_style = ParagraphStyle(
-            'SkillCategory',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceBefore=4,
-            spaceAfter=2,
-            leftIndent=0
-        )
-        
-        story = []
-        personal = resume_data["personal_info"]
-        
-        # Name
-        story.append(Paragraph(personal["name"], title_style))
-        
-        # Contact info
-        contact_info = []
-        if personal.get("email"):
-            contact_info.append(personal["email"])
-        if personal.get("phone"):
-            contact_info.append(personal["phone"])
-        if personal.get("location"):
-            contact_info.append(personal["location"])
-        
-        if contact_info:
-            story.append(Paragraph(" | ".join(contact_info), styles['Normal']))
-            story.append(Spacer(1, 12))
-        
-        # Experience
-        if resume_data.get("experience"):
-            story.append(Paragraph("Experience", heading_style))
-            for exp in resume_data["experience"]:
-                title_company = f"<b>{exp['title']} - {exp['company']}</b>"
-                story.append(Paragraph(title_company, styles['Normal']))
-                story.append(Paragraph(f"<i>{exp['duration']}</i>", styles['Normal']))
-                for desc in exp["description"]:
-                    story.append(Paragraph(f"• {desc}", styles['Normal']))
-                story.append(Spacer(1, 6))
-        
-        # Skills - deduplicated and categorized via LLM
-        if resume_data.get("skills"):
-            story.append(Paragraph("Skills", heading_style))
-            skills_data = await self._deduplicate_and_categorize_skills(
-                resume_data["skills"]
+        prepared = prepared or await self.prepare(resume_data)
+
+        if spec.engine == "html":
+            html_content = await self.render_template_html(spec.id, resume_data, prepared)
+            started = time.perf_counter()
+            try:
+                with span("render_html"):
+                    pdf_bytes = await html_pdf_renderer.render(html_content)
+                template_registry.record_render(spec.id, time.perf_counter() - started)
+                export_metrics.observe_output("pdf", len(pdf_bytes))
+                return ExportFile.from_bytes(pdf_bytes, "application/pdf", f"{name}_resume_{spec.id}.pdf")
+            except RenderPoolSaturatedError:
+                # Shed load like the classic path instead of piling onto the ReportLab pool
+                raise
+            except Exception as e:
+                export_metrics.record_fallback("html_template")
+                logger.warning("export.modern_pdf.fallback", extra={
+                    "resume_id": resume_id, "template": spec.id, "error": str(e) or type(e).__name__
+                })
+
+        # Classic template uses ReportLab for direct PDF generation (in the worker pool)
+        started = time.perf_counter()
+        with span("render_classic"):
+            path, size = await self._render_to_spool(write_classic_pdf, *prepared.markup)
+        template_registry.record_render("classic", time.perf_counter() - started)
+        export_metrics.observe_output("pdf", size)
+        return ExportFile("application/pdf", self._pdf_filename(resume_data), size, path=path)
+
+    async def prepare(self, resume_data: dict) -> PreparedResume:
+        """Render-ready resume, computed once per resume content.
+
+        Keyed by a content hash, so exporting the same resume again in
+        another format or template reuses its categorized skills. The
+        prepared copy is a snapshot: later edits to ``resume_data`` hash
+        differently instead of leaking into the cache. Skills that fell back
+        to Other because the LLM failed are used once but not cached, so
+        the next export retries the categorization.
+        """
+        with span("prepare"):
+            digest = content_hash(resume_data)
+            prepared = self._prepared.get(digest)
+            if prepared is not None:
+                self._prepared.move_to_end(digest)
+                return prepared
+
+            data = copy.deepcopy(resume_data)
+            with span("categorize"):
+                skills = await self._categorized_skills(data)
+            prepared = PreparedResume.build(
+                digest,
+                data,
+                dict(skills),
+                self._sort_projects(data.get("projects") or []),
             )
-            
-            # Define display order for categories
-            category_order = ['Technical Skills', 'Soft Skills', 'Other']
-            
-            for category in category_order:
-                if category in skills_data and skills_data[category]:
-                    skills_list = skills_data[category]
-                    skills_line = f"<b>{category}:</b> {', '.join(skills_list)}"
-                    story.append(Paragraph(skills_line, skill_category_style))
-            
-            story.append(Spacer(1, 6))
-        
-        # Projects (sorted: resume projects first, GitHub-sourced last)
-        if resume_data.get("projects"):
-            story.append(Paragraph("Projects", heading_style))
-            sorted_projects = self._sort_projects(resume_data["projects"])
-            for project in sorted_projects:
-                story.append(Paragraph(f"<b>{project['name']}</b>", styles['Normal']))
-                story.append(Paragraph(project['description'], styles['Normal']))
-                if project.get("technologies"):
-                    tech_list = f"<b>Technologies:</b> {', '.join(project['technologies'])}"
-                    story.append(Paragraph(tech_list, styles['Normal']))
-                story.append(Spacer(1, 6))
-
-        # Education
-        if resume_data.get("education"):
-            story.append(Paragraph("Education", heading_style))
-            for edu in resume_data["education"]:
-                story.append(Paragraph(f"<b>{edu['degree']}</b>", styles['Normal']))
-                edu_info = edu['institution']
-                if edu.get("graduation_year"):
-                    edu_info += f" | {edu['graduation_year']}"
-                if edu.get("gpa"):
-                    edu_info += f" | GPA: {edu['gpa']}"
-                story.append(Paragraph(edu_info, styles['Normal']))
-        
-        doc.build(story)
-        pdf_bytes = buffer.getvalue()
-        buffer.close()
+        if isinstance(skills, CategorizedSkills) and skills.fallback:
+            return prepared
+        self._prepared[digest] = prepared
+        while len(self._prepared) > settings.export_prepared_cache_size:
+            self._prepared.popitem(last=False)
+        return prepared
+
+    async def _categorized_skills(self, resume_data: dict) -> dict[str, list[str]]:
+        if not resume_data.get("skills"):
+            return {}
+        return await self._deduplicate_and_categorize_skills(resume_data["skills"])
 
-        filename = f"{personal['name'].replace(' ', '_')}_resume.pdf"
-        return pdf_bytes, "application/pdf", filename
+    def _pdf_filename(self, resume_data: dict) -> str:
+        return f"{resume_data['personal_info']['name'].replace(' ', '_')}_resume.pdf"
     
-    async def _generate_docx(self, resume_data: dict, resume_id: str) -> tuple[bytes, str, str]:
-        """Generate ATS-compliant DOCX using python-docx"""
-        
-        doc = Document()
-        
-        # Personal Info
-        personal = resume_data["personal_info"]
-        doc.add_heading(personal["name"], 0)
-        
-        contact_info = []
-        if personal.get("email"):
-            contact_info.append(personal["email"])
-        if personal.get("phone"):
-            contact_info.append(personal["phone"])
-        if personal.get("location"):
-            contact_info.append(personal["location"])
-        
-        if contact_info:
-            doc.add_paragraph(" | ".join(contact_info))
-        
-        # Experience
-        if resume_data.get("experience"):
-            doc.add_heading("Experience", 1)
-            for exp in resume_data["experience"]:
-                p = doc.add_paragraph()
-                p.add_run(f"{exp['title']} - {exp['company']}").bold = True
-                doc.add_paragraph(exp["duration"])
-                for desc in exp["description"]:
-                    doc.add_paragraph(f"• {desc}")
-        
-        # Skills - deduplicated and categorized via LLM
-        if resume_data.get("skills"):
-            doc.add_heading("Skills", 1)
-            skills_data = await self._deduplicate_and_categorize_skills(
-                resume_data["skills"]
+    async def _generate_docx(
+        self, resume_data: dict, resume_id: str, prepared: PreparedResume | None = None
+    ) -> tuple[bytes, str, str]:
+        """Generate ATS-compliant DOCX using python-docx (see _render_docx)"""
+        export = await self._render_docx(resume_data, resume_id, prepared)
+        return export.read(), export.content_type, export.filename
+
+    async def _render_docx(
+        self, resume_data: dict, resume_id: str, prepared: PreparedResume | None = None
+    ) -> ExportFile:
+        """Render the DOCX in the worker pool, spooled to a temp file"""
+        prepared = prepared or await self.prepare(resume_data)
+        with span("render_docx"):
+            path, size = await self._render_to_spool(
+                write_classic_docx, prepared.data, prepared.skills, prepared.projects
             )
-            
-            for category, skills_list in skills_data.items():
-                if skills_list:
-                    p = doc.add_paragraph()
-                    p.add_run(f"{category}: ").bold = True
-                    p.add_run(', '.join(skills_list))
-        
-        # Projects (sorted: resume projects first, GitHub-sourced last)
-        if resume_data.get("projects"):
-            doc.add_heading("Projects", 1)
-            sorted_projects = self._sort_projects(resume_data["projects"])
-            for project in sorted_projects:
-                p = doc.add_paragraph()
-                p.add_run(project["name"]).bold = True
-                doc.add_paragraph(project["description"])
-                if project.get("technologies"):
-                    doc.add_paragraph(f"Technologies: {', '.join(project['technologies'])}")
-
-        # Education
-        if resume_data.get("education"):
-            doc.add_heading("Education", 1)
-            for edu in resume_data["education"]:
-                if edu.get("degree") and edu.get("institution"):
-                    doc.add_paragraph(f"{edu['degree']} - {edu['institution']}")
-        
-        # Save to bytes
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-        
-        filename = f"{personal['name'].replace(' ', '_')}_resume.docx"
-        content_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        return buffer.getvalue(), content_type, filename
+        export_metrics.observe_output("docx", size)
+        filename = f"{resume_data['personal_info']['name'].replace(' ', '_')}_resume.docx"
+        return ExportFile(DOCX_CONTENT_TYPE, filename, size, path=path)
     
+    async def _render_to_spool(self, write: Callable[..., None], *args: Any) -> tuple[str, int]:
+        """``write(out, *args)`` in the render pool, spooled to a temp file (see write_to_spool).
+
+        The render is shielded from cancellation: a worker cannot be stopped
+        midway, so if the caller goes away (client disconnected mid-archive)
+        the file it still writes is deleted as soon as it is done.
+        """
+        job = asyncio.ensure_future(render_pool.run(write_to_spool, write, settings.export_spool_dir, *args))
+        try:
+            return await asyncio.shield(job)
+        except asyncio.CancelledError:
+            job.add_done_callback(_discard_spooled)
+            raise
+
     def _build_html(self, resume_data: dict) -> str:
         """Build HTML content for PDF generation with inline CSS"""
-        
-        personal = resume_data["personal_info"]
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{personal['name']} - Resume</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    font-size: 11pt;
-                    line-height: 1.4;
-                    margin: 0.5in;
-                    color: #000;
-                }}
-                .resume {{
-                    max-width: 8.5in;
-                }}
-                header {{
-                    text-align: center;
-                    margin-bottom: 20pt;
-                }}
-                h1 {{
-                    font-size: 18pt;
-                    font-weight: bold;
-                    margin: 0 0 8pt 0;
-                }}
-                h2 {{
-                    font-size: 14pt;
-                    font-weight: bold;
-                    margin: 16pt 0 8pt 0;
-                    border-bottom: 1pt solid #000;
-                }}
-                h3 {{
-                    font-size: 12pt;
-                    font-weight: bold;
-                    margin: 12pt 0 4pt 0;
-                }}
-                .contact {{
-                    font-size: 10pt;
-                    margin-bottom: 8pt;
-                }}
-                .duration {{
-                    font-style: italic;
-                    margin: 0 0 8pt 0;
-                }}
-                ul {{
-                    margin: 8pt 0;
-                    padding-left: 20pt;
-                }}
-                li {{
-                    margin-bottom: 4pt;
-                }}
-                section {{
-                    margin-bottom: 16pt;
-                }}
-                .job, .project {{
-                    margin-bottom: 12pt;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="resume">
-                <header>
-                    <h1>{personal['name']}</h1>
-                    <div class="contact">
-        """
-        
-        contact_info = []
-        if personal.get("email"):
-            contact_info.append(personal["email"])
-        if personal.get("phone"):
-            contact_info.append(personal["phone"])
-        if personal.get("location"):
-            contact_info.append(personal["location"])
-        
-        html += " | ".join(contact_info)
-        html += """
-                    </div>
-                </header>
-        """
-        
-        # Experience
-        if resume_data.get("experience"):
-            html += "<section><h2>Experience</h2>"
-            for exp in resume_data["experience"]:
-                html += f"""
-                <div class="job">
-                    <h3>{exp['title']} - {exp['company']}</h3>
-                    <p class="duration">{exp['duration']}</p>
-                    <ul>
-                """
-                for desc in exp["description"]:
-                    html += f"<li>{desc}</li>"
-                html += "</ul></div>"
-            html += "</section>"
-        
-        # Skills
-        if resume_data.get("skills"):
-            html += "<section><h2>Skills</h2>"
-            skills = resume_data["skills"]
-            
-            # Handle new format (soft_skills) or old format (frameworks) for backward compatibility
-            if skills.get("technical") or skills.get("frameworks"):
-                # Combine technical and frameworks for backward compatibility
-                technical_skills = skills.get("technical", []) + skills.get("frameworks", [])
-                if technical_skills:
-                    html += f"<p><strong>Technical Skills:</strong> {', '.join(technical_skills)}</p>"
-            
-            if skills.get("soft_skills"):
-                html += f"<p><strong>Soft Skills:</strong> {', '.join(skills['soft_skills'])}</p>"
-            
-            html += "</section>"
-        
-        # Projects (sorted: resume projects first, GitHub-sourced last)
-        if resume_data.get("projects"):
-            html += "<section><h2>Projects</h2>"
-            sorted_projects = self._sort_projects(resume_data["projects"])
-            for project in sorted_projects:
-                html += f"""
-                <div class="project">
-                    <h3>{project['name']}</h3>
-                    <p>{project['description']}</p>
-                """
-                if project.get("technologies"):
-                    tech_list = ', '.join(project['technologies'])
-                    tech_str = f"<strong>Technologies:</strong> {tech_list}"
-                    html += f"<p>{tech_str}</p>"
-                html += "</div>"
-            html += "</section>"
-
-        # Education
-        if resume_data.get("education"):
-            html += "<section><h2>Education</h2>"
-            for edu in resume_data["education"]:
-                if edu.get("degree") and edu.get("institution"):
-                    html += f"<p>{edu['degree']} - {edu['institution']}"
-                    if edu.get("graduation_year"):
-                        html += f" ({edu['graduation_year']})"
-                    html += "</p>"
-            html += "</section>"
-        
-        html += """
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html
-    
+        return html_builders.ats_html(resume_data, self._sort_projects(resume_data.get("projects") or []))
+
     def _build_printable_html(self, resume_data: dict) -> str:
         """Build HTML optimized for browser PDF printing"""
-        
-        personal = resume_data["personal_info"]
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{personal['name']} - Resume</title>
-            <style>
-                @media print {{
-                    body {{ margin: 0.5in; }}
-                    .no-print {{ display: none; }}
-                }}
-                body {{ 
-                    font-family: Arial, sans-serif; 
-                    font-size: 11pt; 
-                    line-height: 1.4;
-                    margin: 0.5in;
-                    color: #000;
-                }}
-                h1 {{ 
-                    font-size: 18pt; 
-                    margin-bottom: 10pt; 
-                    border-bottom: 2pt solid #000;
-                    padding-bottom: 5pt;
-                }}
-                h2 {{ 
-                    font-size: 14pt; 
-                    margin: 15pt 0 8pt 0; 
-                    color: #333;
-                }}
-                h3 {{ 
-                    font-size: 12pt; 
-                    margin: 10pt 0 5pt 0; 
-                    font-weight: bold;
-                }}
-                p {{ margin: 5pt 0; }}
-                ul {{ margin: 5pt 0; padding-left: 20pt; }}
-                li {{ margin-bottom: 3pt; }}
-                .contact {{ 
-                    font-size: 10pt; 
-                    margin-bottom: 15pt; 
-                    color: #666;
-                }}
-                .duration {{ 
-                    font-style: italic; 
-                    color: #666; 
-                    margin-bottom: 5pt;
-                }}
-                .print-instruction {{
-                    background: #f0f0f0;
-                    padding: 10pt;
-                    margin-bottom: 20pt;
-                    border-left: 4pt solid #007acc;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="print-instruction no-print">
-                <strong>To save as PDF:</strong> Use your browser's Print function (Ctrl+P) 
-                and select "Save as PDF"
-            </div>
-            
-            <h1>{personal['name']}</h1>
-            <div class="contact">
-        """
-        
-        contact_info = []
-        if personal.get("email"):
-            contact_info.append(personal["email"])
-        if personal.get("phone"):
-            contact_info.append(personal["phone"])
-        if personal.get("location"):
-            contact_info.append(personal["location"])
-        if personal.get("github"):
-            contact_info.append(f"GitHub: {personal['github']}")
-        if personal.get("linkedin"):
-            contact_info.append(f"LinkedIn: {personal['linkedin']}")
-        
-        html += " | ".join(contact_info) + "</div>"
-        
-        # Experience
-        if resume_data.get("experience"):
-            html += "<h2>Experience</h2>"
-            for exp in resume_data["experience"]:
-                html += f"<h3>{exp['title']} - {exp['company']}</h3>"
-                html += f"<div class='duration'>{exp['duration']}</div>"
-                html += "<ul>"
-                for desc in exp["description"]:
-                    html += f"<li>{desc}</li>"
-                html += "</ul>"
-        
-        # Skills
-        if resume_data.get("skills"):
-            html += "<h2>Skills</h2>"
-            skills = resume_data["skills"]
-            
-            # Handle new format (soft_skills) or old format (frameworks) for backward compatibility
-            if skills.get("technical") or skills.get("frameworks"):
-                # Combine technical and frameworks for backward compatibility
-                technical_skills = skills.get("technical", []) + skills.get("frameworks", [])
-                if technical_skills:
-                    html += f"<p><strong>Technical Skills:</strong> {', '.join(technical_skills)}</p>"
-            
-            if skills.get("soft_skills"):
-                html += f"<p><strong>Soft Skills:</strong> {', '.join(skills['soft_skills'])}</p>"
-            
-            if skills.get("tools"):
-                html += f"<p><strong>Tools:</strong> {', '.join(skills['tools'])}</p>"
-
-        # Projects (sorted: resume projects first, GitHub-sourced last)
-        if resume_data.get("projects"):
-            html += "<h2>Projects</h2>"
-            sorted_projects = self._sort_projects(resume_data["projects"])
-            for project in sorted_projects:
-                html += f"<h3>{project['name']}</h3>"
-                html += f"<p>{project['description']}</p>"
-                if project.get("technologies"):
-                    tech_list = ', '.join(project['technologies'])
-                    html += f"<p><strong>Technologies:</strong> {tech_list}</p>"
-
-        # Education
-        if resume_data.get("education"):
-            html += "<h2>Education</h2>"
-            for edu in resume_data["education"]:
-                html += f"<h3>{edu['degree']}</h3>"
-                html += f"<p>{edu['institution']}"
-                if edu.get("graduation_year"):
-                    html += f" | {edu['graduation_year']}"
-                if edu.get("gpa"):
-                    html += f" | GPA: {edu['gpa']}"
-                html += "</p>"
-        
-        html += """
-        </body>
-        </html>
-        """
-        
-        return html
+        return html_builders.printable_html(resume_data, self._sort_projects(resume_data.get("projects") or []))
 
     def _build_simple_html(self, resume_data: dict) -> str:
         """Build minimal HTML content as fallback for WeasyPrint issues"""
-        
-        personal = resume_data["personal_info"]
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{personal['name']} - Resume</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; font-size: 11pt; margin: 0.5in; }}
-                h1 {{ font-size: 18pt; margin-bottom: 10pt; }}
-                h2 {{ font-size: 14pt; margin: 15pt 0 8pt 0; }}
-                h3 {{ font-size: 12pt; margin: 10pt 0 5pt 0; }}
-                p {{ margin: 5pt 0; }}
-                ul {{ margin: 5pt 0; padding-left: 20pt; }}
-            </style>
-        </head>
-        <body>
-            <h1>{personal['name']}</h1>
-            <p>
-        """
-        
-        contact_info = []
-        if personal.get("email"):
-            contact_info.append(personal["email"])
-        if personal.get("phone"):
-            contact_info.append(personal["phone"])
-        if personal.get("location"):
-            contact_info.append(personal["location"])
-        
-        html += " | ".join(contact_info) + "</p>"
-        
-        # Experience
-        if resume_data.get("experience"):
-            html += "<h2>Experience</h2>"
-            for exp in resume_data["experience"]:
-                html += f"<h3>{exp['title']} - {exp['company']}</h3>"
-                html += f"<p><em>{exp['duration']}</em></p>"
-                html += "<ul>"
-                for desc in exp["description"]:
-                    html += f"<li>{desc}</li>"
-                html += "</ul>"
-        
-        # Skills
-        if resume_data.get("skills"):
-            html += "<h2>Skills</h2>"
-            skills = resume_data["skills"]
-            
-            # Handle new format (soft_skills) or old format (frameworks) for backward compatibility
-            if skills.get("technical") or skills.get("frameworks"):
-                # Combine technical and frameworks for backward compatibility
-                technical_skills = skills.get("technical", []) + skills.get("frameworks", [])
-                if technical_skills:
-                    html += f"<p><strong>Technical Skills:</strong> {', '.join(technical_skills)}</p>"
-            
-            if skills.get("soft_skills"):
-                html += f"<p><strong>Soft Skills:</strong> {', '.join(skills['soft_skills'])}</p>"
-
-        # Projects (sorted: resume projects first, GitHub-sourced last)
-        if resume_data.get("projects"):
-            html += "<h2>Projects</h2>"
-            sorted_projects = self._sort_projects(resume_data["projects"])
-            for project in sorted_projects:
-                html += f"<h3>{project['name']}</h3>"
-                html += f"<p>{project['description']}</p>"
-                if project.get("technologies"):
-                    tech_list = ', '.join(project['technologies'])
-                    html += f"<p><strong>Technologies:</strong> {tech_list}</p>"
-
-        # Education
-        if resume_data.get("education"):
-            html += "<h2>Education</h2>"
-            for edu in resume_data["education"]:
-                if edu.get("degree") and edu.get("institution"):
-                    html += f"<p>{edu['degree']} - {edu['institution']}"
-                    if edu.get("graduation_year"):
-                        html += f" ({edu['graduation_year']})"
-                    html += "</p>"
-
-        html += "</body></html>"
-        return html
+        return html_builders.simple_html(resume_data, self._sort_projects(resume_data.get("projects") or []))
 
     def _load_template_css(self, template_name: str) -> str:
-        """Load CSS from template file"""
-        css_file = self.templates_dir / f"{template_name}.css"
-        if css_file.exists():
-            return css_file.read_text()
-        return ""
+        """Load CSS from template file (read and minified once per process)"""
+        return template_css(template_name)
 
-    async def _build_modern_html(self, resume_data: dict) -> str:
+    async def _build_modern_html(
+        self, resume_data: dict, prepared: PreparedResume | None = None
+    ) -> str:
         """Build HTML content using modern template with CSS styling"""
+        return await self.render_template_html("modern", resume_data, prepared)
 
-        personal = resume_data.get("personal_info", {})
-        css_content = self._load_template_css("modern")
-
-        # Build contact items
-        contact_items = []
-        if personal.get("email"):
-            email = personal["email"]
-            contact_items.append(
-                f'<span class="contact-item">'
-                f'<a href="mailto:{email}">{email}</a></span>'
-            )
-        if personal.get("phone"):
-            contact_items.append(
-                f'<span class="contact-item">{personal["phone"]}</span>'
-            )
-        if personal.get("location"):
-            contact_items.append(
-                f'<span class="contact-item">{personal["location"]}</span>'
-            )
-        if personal.get("linkedin"):
-            linkedin = personal["linkedin"]
-            display_linkedin = linkedin.replace("https://", "").replace("http://", "")
-            contact_items.append(
-                f'<span class="contact-item">'
-                f'<a href="{linkedin}">{display_linkedin}</a></span>'
-            )
-        if personal.get("github"):
-            github = personal["github"]
-            display_github = github.replace("https://", "").replace("http://", "")
-            contact_items.append(
-                f'<span class="contact-item">'
-                f'<a href="{github}">{display_github}</a></span>'
-            )
-
-        contact_html = " | ".join(contact_items)
-
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{personal.get('name', 'Resume')} - Resume</title>
-    <style>
-{css_content}
-    </style>
-</head>
-<body>
-    <div class="resume-container">
-        <header class="resume-header">
-            <h1 class="resume-name">{personal.get('name', '')}</h1>
-            <div class="resume-contact">
-                {contact_html}
-            </div>
-        </header>
-"""
-
-        # Summary section (if present)
-        if resume_data.get("summary"):
-            html += f"""
-        <section class="resume-section">
-            <h2 class="section-title">Summary</h2>
-            <p class="resume-summary">{resume_data['summary']}</p>
-        </section>
-"""
-
-        # Experience section
-        if resume_data.get("experience"):
-            html += """
-        <section class="resume-section">
-            <h2 class="section-title">Experience</h2>
-"""
-            for exp in resume_data["experience"]:
-                title = exp.get('title', '')
-                company = exp.get('company', '')
-                duration = exp.get('duration', '')
-
-                html += f"""
-            <div class="experience-item">
-                <div class="experience-header">
-                    <div>
-                        <span class="experience-title">{title}</span>
-                        <span class="experience-company"> - {company}</span>
-                    </div>
-                    <span class="experience-duration">{duration}</span>
-                </div>
-                <ul class="experience-description">
-"""
-                for desc in exp.get("description", []):
-                    # Escape HTML entities
-                    safe_desc = (desc.replace("&", "&amp;")
-                                    .replace("<", "&lt;")
-                                    .replace(">", "&gt;"))
-                    html += f"                    <li>{safe_desc}</li>\n"
-
-                html += """                </ul>
-            </div>
-"""
-            html += "        </section>\n"
-
-        # Skills section - use categorized skills
-        if resume_data.get("skills"):
-            skills_data = await self._deduplicate_and_categorize_skills(
-                resume_data["skills"]
-            )
+    async def render_template_html(
+        self, template: str, resume_data: dict, prepared: PreparedResume | None = None
+    ) -> str:
+        """HTML of a registered html-engine template, with its stylesheet inlined.
 
-            if skills_data:
-                html += """
-        <section class="resume-section">
-            <h2 class="section-title">Skills</h2>
-            <div class="skills-grid">
-"""
-                # Define display order
-                category_order = ['Technical Skills', 'Soft Skills', 'Other']
-
-                for category in category_order:
-                    if category in skills_data and skills_data[category]:
-                        skills_list = ", ".join(skills_data[category])
-                        html += f"""
-                <div class="skill-category">
-                    <span class="skill-category-name">{category}</span>
-                    <span class="skill-inline">{skills_list}</span>
-                </div>
-"""
-                html += """            </div>
-        </section>
-"""
-
-        # Projects section (sorted: resume projects first, GitHub-sourced last)
-        if resume_data.get("projects"):
-            html += """
-        <section class="resume-section">
-            <h2 class="section-title">Projects</h2>
-"""
-            sorted_projects = self._sort_projects(resume_data["projects"])
-            for project in sorted_projects:
-                name = project.get('name', '')
-                description = project.get('description', '')
-                technologies = project.get('technologies', [])
-                link = project.get('link', '') or project.get('url', '') or project.get('github_url', '')
-
-                html += f"""
-            <div class="project-item">
-                <div class="project-header">
-                    <span class="project-name">{name}</span>
-"""
-                if link:
-                    display_link = link.replace("https://", "").replace("http://", "")
-                    html += f'                    <a href="{link}" class="project-link">{display_link}</a>\n'
-
-                html += f"""                </div>
-                <p class="project-description">{description}</p>
-"""
-                if technologies:
-                    tech_str = ", ".join(technologies)
-                    html += f"""                <p class="project-tech"><strong>Technologies:</strong> {tech_str}</p>
-"""
-                html += """            </div>
-"""
-            html += "        </section>\n"
-
-        # Education section
-        if resume_data.get("education"):
-            html += """
-        <section class="resume-section">
-            <h2 class="section-title">Education</h2>
-"""
-            for edu in resume_data["education"]:
-                degree = edu.get('degree', '')
-                institution = edu.get('institution', '')
-                year = edu.get('graduation_year', '') or edu.get('year', '')
-                gpa = edu.get('gpa', '')
-
-                html += f"""
-            <div class="education-item">
-                <div class="education-header">
-                    <div>
-                        <span class="education-degree">{degree}</span>
-                        <span class="education-institution"> - {institution}</span>
-                    </div>
-                    <span class="education-year">{year}</span>
-                </div>
-"""
-                if gpa:
-                    html += f"""                <p class="education-details">GPA: {gpa}</p>
-"""
-                html += """            </div>
-"""
-            html += "        </section>\n"
-
-        # Certifications section (if present)
-        if resume_data.get("certifications"):
-            html += """
-        <section class="resume-section">
-            <h2 class="section-title">Certifications</h2>
-"""
-            for cert in resume_data["certifications"]:
-                name = cert.get('name', '') if isinstance(cert, dict) else cert
-                issuer = cert.get('issuer', '') if isinstance(cert, dict) else ''
-                date = cert.get('date', '') if isinstance(cert, dict) else ''
-
-                html += f"""
-            <div class="certification-item">
-                <span class="certification-name">{name}</span>
-                <span class="certification-issuer">{issuer} {date}</span>
-            </div>
-"""
-            html += "        </section>\n"
-
-        # Close HTML
-        html += """
-    </div>
-</body>
-</html>"""
-
-        return html
+        Input for the HTML PDF renderer; also used for template previews.
+        """
+        prepared = prepared or await self.prepare(resume_data)
 
+        with span("html"):
+            return template_registry.render_html(template, prepared.data, prepared.skills, prepared.projects)
 
 export_service = ExportService()
\ No newline at end of file
@@ -0,0 +1,96 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from app.core.config import settings
+from app.export import classic_docx
+from app.export import classic_pdf
+
+
+class RenderPoolSaturatedError(Exception):
+    """Every export worker is busy and the queue is full; try again later"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _warm_worker() -> None:
+    """Process initializer: fonts, the classic style sheet and the DOCX template, once per worker"""
+    classic_pdf.warm_up()
+    classic_docx.warm_up()
+
+
+def _ready() -> bool:
+    return True
+
+
+class RenderPool:
+    """Worker processes for CPU-bound export rendering (ReportLab, python-docx).
+
+    ReportLab's ``doc.build`` and python-docx's ``doc.save`` hold the GIL
+    for tens of milliseconds, so they never run on the event loop. At most
+    ``workers + queue_depth`` jobs are admitted at once; beyond that
+    ``run`` raises RenderPoolSaturatedError right away rather than letting
+    every export wait longer.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_depth: int = settings.export_render_queue_depth,
+        retry_after: int = settings.export_render_retry_after_seconds,
+    ):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.retry_after = retry_after
+        self.pending = 0
+        self.rejected = 0
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_depth
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        return self._pool
+
+    def start(self) -> None:
+        """Spawn and warm every worker now rather than on the first export"""
+        pool = self._executor()
+        for _ in range(self.workers):
+            pool.submit(_ready)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def ensure_capacity(self) -> None:
+        """Raise RenderPoolSaturatedError now if no job would be admitted"""
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            raise RenderPoolSaturatedError("Export workers are busy", self.retry_after)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a picklable top-level function in a worker and await its result"""
+        self.ensure_capacity()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor(), fn, *args)
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> dict[str, int]:
+        return {"workers": self.workers, "capacity": self.capacity, "pending": self.pending, "rejected": self.rejected}
+
+
+render_pool = RenderPool(
+    settings.export_render_workers,
+    settings.export_render_queue_depth,
+    settings.export_render_retry_after_seconds,
+)
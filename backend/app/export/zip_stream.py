@@ -0,0 +1,68 @@
+import zipfile
+from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterator
+from collections.abc import Iterable
+from collections.abc import Iterator
+from contextlib import aclosing
+
+from app.export.output import ExportFile
+
+
+class ZipStream:
+    """Write-only file object that hands zipfile's output back in chunks.
+
+    zipfile treats it as unseekable and writes a data descriptor after each
+    entry, so an archive can be streamed while it is being built: only the
+    bytes written since the last ``drain`` are held.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self.archive = zipfile.ZipFile(self, "w", compression=zipfile.ZIP_STORED)
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+    def add(self, name: str, content: bytes) -> bytes:
+        """Append an entry and return the archive bytes it produced"""
+        self.archive.writestr(name, content)
+        return self.drain()
+
+    def add_chunks(self, name: str, chunks: Iterable[bytes | memoryview]) -> Iterator[bytes]:
+        """Append an entry from chunks, yielding archive bytes as each is written"""
+        with self.archive.open(name, "w") as entry:
+            for chunk in chunks:
+                entry.write(chunk)
+                yield self.drain()
+        yield self.drain()
+
+    def close(self) -> bytes:
+        """Write the central directory and return the final bytes"""
+        self.archive.close()
+        return self.drain()
+
+
+async def stream_zip(entries: AsyncGenerator[tuple[str, ExportFile], None]) -> AsyncIterator[bytes]:
+    """ZIP archive of ``entries`` (name, rendered file), yielded chunk by chunk.
+
+    Entries are stored uncompressed: PDF and DOCX are already compressed,
+    and deflating them again would only burn CPU on the event loop.
+    ``entries`` is closed with the archive, so a client that disconnects
+    midway stops the remaining renders right away.
+    """
+    stream = ZipStream()
+    async with aclosing(entries):
+        async for name, export in entries:
+            for data in stream.add_chunks(name, export.chunks()):
+                if data:
+                    yield data
+    yield stream.close()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from fastapi import HTTPException
 
+from app.core.llm import LLMUnavailableError
 from app.github.schemas import GitHubAnalysisResponse
 from app.github.schemas import GitHubAnalyzeRequest
 from app.github.service import github_service
@@ -18,5 +19,7 @@ async def analyze_github_profile(request: GitHubAnalyzeRequest):
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"GitHub analysis failed: {e!s}")
\ No newline at end of file
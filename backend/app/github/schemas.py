@@ -34,6 +34,11 @@ class TechStack(BaseModel):
     tools: list[str]
 
 
+class TechCategorization(BaseModel):
+    frameworks: list[str] = []
+    tools: list[str] = []
+
+
 class ProjectHighlight(BaseModel):
     name: str
     description: str
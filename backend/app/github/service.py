@@ -1,13 +1,16 @@
-import json
 from datetime import datetime
 
 import requests
 
+from app.core.llm import LLMJSONError
+from app.core.llm import LLMPriority
 from app.core.llm import get_llm_response
+from app.core.llm import request_json
 from app.github.schemas import GitHubAnalysisResponse
 from app.github.schemas import ImpactMetrics
 from app.github.schemas import ProjectHighlight
 from app.github.schemas import Repository
+from app.github.schemas import TechCategorization
 from app.github.schemas import TechStack
 
 
@@ -127,11 +130,14 @@ class GitHubService:
         """
         
         messages = [{"role": "user", "content": prompt}]
-        response = await get_llm_response(messages)
-        
         try:
-            return json.loads(response.strip())
-        except json.JSONDecodeError:
+            result = await request_json(
+                messages, TechCategorization,
+                call_site="github.categorize_technologies", complete=get_llm_response,
+                cache=True, priority=LLMPriority.BATCH,
+            )
+            return result.model_dump()
+        except LLMJSONError:
             return {"frameworks": [], "tools": []}
 
     def _get_top_repositories(self, repos_data: list[dict]) -> list[Repository]:
@@ -227,11 +233,12 @@ class GitHubService:
         """
         
         messages = [{"role": "user", "content": prompt}]
-        response = await get_llm_response(messages)
-        
         try:
-            return json.loads(response.strip())
-        except json.JSONDecodeError:
+            return await request_json(
+                messages, list[str], call_site="github.bullet_points",
+                complete=get_llm_response, priority=LLMPriority.BATCH,
+            )
+        except LLMJSONError:
             # Fallback bullet points
             return [
                 f"Developed {metrics.total_repos} open source projects using {', '.join(tech_stack.primary_languages[:3])}",
@@ -4,6 +4,8 @@ from fastapi import APIRouter
 from fastapi import HTTPException
 
 from app.core.database import get_supabase_service_client
+from app.core.llm import LLMUnavailableError
+from app.core.skills import job_keywords
 from app.jobs.schemas import JobAnalysis
 from app.jobs.schemas import JobAnalysisRequest
 from app.jobs.service import job_analysis_service
@@ -43,12 +45,16 @@ async def analyze_job(request: JobAnalysisRequest) -> JobAnalysis:
             "company": analysis_data.get("company"),
             "job_text": job_text[:1000],  # Store truncated version
             "job_url": str(request.job_url) if request.job_url else None,
-            "analysis": analysis_data
+            "analysis": analysis_data,
+            # Alias-resolved matching keys, so ATS scoring is set intersection
+            "keywords": job_keywords(analysis_data),
         }).execute()
 
         return JobAnalysis(**analysis_data)
 
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {e!s}")
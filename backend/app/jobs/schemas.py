@@ -18,6 +18,17 @@ class JobAnalysisRequest(BaseModel):
         return self
 
 
+class JobAnalysisResult(BaseModel):
+    """Structured fields the LLM extracts from a job description"""
+    title: str
+    company: str
+    required_skills: list[str]
+    preferred_skills: list[str]
+    technologies: list[str]
+    experience_level: str
+    key_requirements: list[str]
+
+
 class JobAnalysis(BaseModel):
     """Job analysis response model matching API contracts"""
     id: str
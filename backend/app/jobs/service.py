@@ -1,4 +1,3 @@
-import json
 import re
 
 import requests
@@ -7,12 +6,37 @@ from tenacity import retry
 from tenacity import stop_after_attempt
 from tenacity import wait_exponential
 
+from app.core.llm import LLMPriority
+from app.core.llm import build_messages
 from app.core.llm import get_llm_response
+from app.core.llm import request_json
+from app.jobs.schemas import JobAnalysisResult
 
 
 class JobAnalysisService:
     """Service for analyzing job descriptions"""
 
+    # Static system block; the job text goes in the user message
+    ANALYSIS_PROMPT = """Analyze job descriptions and extract structured information. Return ONLY valid JSON.
+
+Extract the following information in this exact JSON structure:
+{
+    "title": "Job title",
+    "company": "Company name or 'Unknown' if not found",
+    "required_skills": ["skill1", "skill2"],
+    "preferred_skills": ["skill1", "skill2"],
+    "technologies": ["tech1", "tech2"],
+    "experience_level": "Entry/Mid/Senior/Lead/Executive",
+    "key_requirements": ["requirement1", "requirement2"]
+}
+
+Guidelines:
+- Extract technical skills, frameworks, programming languages
+- Separate required vs preferred/nice-to-have skills
+- Identify specific technologies mentioned
+- Determine experience level from years mentioned or role seniority
+- Include key qualifications and responsibilities"""
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10)
@@ -57,46 +81,12 @@ class JobAnalysisService:
         """Analyze job description using Claude API"""
 
         cleaned_text = self._clean_job_text(job_text)
-
-        prompt = f"""
-        Analyze this job description and extract structured information. Return ONLY valid JSON.
-        
-        Job Description:
-        {cleaned_text}
-        
-        Extract the following information in this exact JSON structure:
-        {{
-            "title": "Job title",
-            "company": "Company name or 'Unknown' if not found",
-            "required_skills": ["skill1", "skill2"],
-            "preferred_skills": ["skill1", "skill2"],
-            "technologies": ["tech1", "tech2"],
-            "experience_level": "Entry/Mid/Senior/Lead/Executive",
-            "key_requirements": ["requirement1", "requirement2"]
-        }}
-        
-        Guidelines:
-        - Extract technical skills, frameworks, programming languages
-        - Separate required vs preferred/nice-to-have skills
-        - Identify specific technologies mentioned
-        - Determine experience level from years mentioned or role seniority
-        - Include key qualifications and responsibilities
-        """
-
-        messages = [{"role": "user", "content": prompt}]
-        response = await get_llm_response(messages)
-
-        try:
-            # Clean response and parse JSON
-            json_str = response.strip()
-            if json_str.startswith('```json'):
-                json_str = json_str[7:-3]
-            elif json_str.startswith('```'):
-                json_str = json_str[3:-3]
-
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse LLM response as JSON: {e!s}")
+        messages = build_messages(self.ANALYSIS_PROMPT, f"Job Description:\n{cleaned_text}")
+        result = await request_json(
+            messages, JobAnalysisResult, call_site="jobs.analyze",
+            complete=get_llm_response, cache=True, priority=LLMPriority.UPLOAD,
+        )
+        return result.model_dump()
 
 
 # Global service instance
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from dataclasses import field
+
+from app.core.hashing import content_hash
+from app.optimization.schemas import ATSScore
+from app.optimization.schemas import InterviewQuestion
+from app.optimization.schemas import OptimizationSuggestion
+
+
+def section_hashes(resume_data: dict, job_analysis: dict, roles: list[dict]) -> dict:
+    """Hashes of the inputs each optimization section depends on.
+
+    ``roles`` are the experience entries selected for enhancement; each is
+    hashed on its own so an edit to one role only re-sends that role.
+    """
+    return {
+        # Precomputed keywords and the question bank derive from the analysis; leave them out of the hash
+        "job": content_hash({k: v for k, v in job_analysis.items() if k not in ("keywords", "interview_questions")}),
+        "skills": content_hash(resume_data.get("skills", {})),
+        "experience": [content_hash(role) for role in roles],
+    }
+
+
+@dataclass
+class OptimizationRun:
+    """Suggestions of one /optimize run, grouped by the section they came from"""
+    section_hashes: dict
+    keywords: list[OptimizationSuggestion] | None = None
+    experience: dict[str, list[OptimizationSuggestion]] = field(default_factory=dict)
+    interview_questions: list[InterviewQuestion] | None = None
+    ats_score: ATSScore | None = None
+
+    def to_record(self) -> dict:
+        """Columns for the optimizations table; sections that produced nothing are saved as None"""
+        return {
+            "section_hashes": self.section_hashes,
+            "suggestions": {
+                "keywords": [s.model_dump() for s in self.keywords] if self.keywords is not None else None,
+                "experience": {
+                    role: [s.model_dump() for s in suggestions]
+                    for role, suggestions in self.experience.items()
+                },
+            },
+            "interview_questions": [q.model_dump() for q in self.interview_questions or []],
+            "ats_score": self.ats_score.model_dump() if self.ats_score else None,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict) -> "OptimizationRun | None":
+        """Stored run, or None for rows written before section hashing"""
+        if not record.get("section_hashes"):
+            return None
+        suggestions = record.get("suggestions") or {}
+        return cls(
+            section_hashes=record["section_hashes"],
+            keywords=(
+                [OptimizationSuggestion(**s) for s in suggestions["keywords"]]
+                if suggestions.get("keywords") is not None else None
+            ),
+            experience={
+                role: [OptimizationSuggestion(**s) for s in items]
+                for role, items in suggestions.get("experience", {}).items()
+            },
+            interview_questions=[InterviewQuestion(**q) for q in record.get("interview_questions") or []] or None,
+            ats_score=ATSScore(**record["ats_score"]) if record.get("ats_score") else None,
+        )
+
+    def reusable_for(self, hashes: dict) -> "OptimizationRun":
+        """Sections of this run still valid for ``hashes``; None/empty means re-send.
+
+        Everything depends on the job, so a different job reuses nothing.
+        """
+        reuse = OptimizationRun(section_hashes=hashes)
+        if self.section_hashes.get("job") != hashes["job"]:
+            return reuse
+        if self.section_hashes.get("skills") == hashes["skills"]:
+            reuse.keywords = self.keywords
+            reuse.ats_score = self.ats_score
+        reuse.experience = {
+            role: suggestions for role, suggestions in self.experience.items()
+            if role in hashes["experience"]
+        }
+        reuse.interview_questions = self.interview_questions
+        return reuse
+
+    @property
+    def is_complete(self) -> bool:
+        """Every section is covered, so no LLM call is needed"""
+        return (
+            self.keywords is not None
+            and self.interview_questions is not None
+            and all(role in self.experience for role in self.section_hashes["experience"])
+        )
@@ -1,7 +1,9 @@
+import json
 from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
+from app.core.llm import LLMError, LLMUnavailableError, ensure_llm_available, retry_after_seconds
 from app.optimization.schemas import (
     CoverLetterRequest,
     CoverLetterResponse,
@@ -21,11 +23,23 @@ async def optimize_resume(request: OptimizationRequest):
         resume_data, job_analysis = await optimization_service.get_resume_job_data(
             str(request.resume_id), str(request.job_id)
         )
+        # Fail before opening the stream while the LLM provider is known to be down
+        ensure_llm_available()
         
         async def generate_sse():
-            async for progress in optimization_service.optimize_resume(resume_data, job_analysis):
-                data = progress.model_dump_json()
-                yield f"data: {data}\n\n"
+            try:
+                async for progress in optimization_service.optimize_resume(
+                    resume_data, job_analysis, mode=request.mode,
+                    resume_id=str(request.resume_id), job_id=str(request.job_id),
+                ):
+                    data = progress.model_dump_json()
+                    yield f"data: {data}\n\n"
+            except LLMError as e:
+                error = {
+                    "error": str(e),
+                    "retry_after": retry_after_seconds(e) if isinstance(e, LLMUnavailableError) else None,
+                }
+                yield f"event: error\ndata: {json.dumps(error)}\n\n"
             yield "data: [DONE]\n\n"
         
         return StreamingResponse(
@@ -39,7 +53,7 @@ async def optimize_resume(request: OptimizationRequest):
             }
         )
         
-    except HTTPException:
+    except (HTTPException, LLMUnavailableError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
@@ -68,14 +82,59 @@ async def generate_cover_letter(request: CoverLetterRequest):
             str(request.resume_id), str(request.job_id)
         )
         
-        cover_letter = await optimization_service.generate_cover_letter(resume_data, job_analysis)
+        cover_letter = await optimization_service.generate_cover_letter(
+            resume_data, job_analysis, resume_id=str(request.resume_id), job_id=str(request.job_id)
+        )
         
         return CoverLetterResponse(
             cover_letter=cover_letter,
             generated_at=datetime.now(timezone.utc)
         )
         
-    except HTTPException:
+    except (HTTPException, LLMUnavailableError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Cover letter generation failed: {str(e)}")
+
+@router.post("/cover-letter/stream")
+async def stream_cover_letter(request: CoverLetterRequest):
+    """Stream a tailored cover letter with SSE as it is generated"""
+    
+    try:
+        resume_data, job_analysis = await optimization_service.get_resume_job_data(
+            str(request.resume_id), str(request.job_id)
+        )
+        ensure_llm_available()
+        
+        async def generate_sse():
+            try:
+                async for chunk in optimization_service.stream_cover_letter(
+                    resume_data, job_analysis,
+                    resume_id=str(request.resume_id), job_id=str(request.job_id),
+                ):
+                    yield f"data: {json.dumps({'chunk': chunk})}\n\n"
+                done = {"completed": True, "generated_at": datetime.now(timezone.utc).isoformat()}
+                yield f"data: {json.dumps(done)}\n\n"
+            except LLMError as e:
+                error = {
+                    "error": str(e),
+                    "retry_after": retry_after_seconds(e) if isinstance(e, LLMUnavailableError) else None,
+                }
+                yield f"event: error\ndata: {json.dumps(error)}\n\n"
+            yield "data: [DONE]\n\n"
+        
+        return StreamingResponse(
+            generate_sse(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "Access-Control-Allow-Origin": "*",
+                "Access-Control-Allow-Headers": "*",
+            }
+        )
+        
+    except (HTTPException, LLMUnavailableError):
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Cover letter generation failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Cover letter generation failed: {str(e)}")
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel
 
@@ -8,6 +8,7 @@ class OptimizationRequest(BaseModel):
     """Request model for resume optimization"""
     resume_id: UUID
     job_id: UUID
+    mode: Optional[Literal["multi_call", "single_call"]] = None  # defaults to settings
 
 
 class SaveOptimizationRequest(BaseModel):
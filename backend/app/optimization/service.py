@@ -1,11 +1,27 @@
 import asyncio
-import json
+import logging
+import re
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from typing import AsyncGenerator
 
 from fastapi import HTTPException
 
+from app.core.config import settings
 from app.core.database import get_supabase_service_client
+from app.core.llm import LLMJSONError
+from app.core.llm import request_json
+from app.core.llm import stream_json_objects
 from app.core.llm import stream_llm_response
+from app.core.llm import validate_llm_json
+from app.core.skill_embeddings import SemanticSkillMatcher
+from app.core.skill_embeddings import get_skill_store
+from app.core.skills import SkillMatcher
+from app.core.skills import job_keywords
+from app.core.skills import skill_key
+from app.optimization.incremental import OptimizationRun
+from app.optimization.incremental import content_hash
+from app.optimization.incremental import section_hashes
 from app.optimization.schemas import (
     ATSScore,
     InterviewQuestion,
@@ -16,6 +32,12 @@ from app.optimization.schemas import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+# Section headers of the single-call optimization reply
+SECTION_MARKER_RE = re.compile(r"^###\s*(KEYWORDS|EXPERIENCE|INTERVIEW)\s*$", re.MULTILINE)
+
+
 class OptimizationService:
     """Service for AI-powered resume optimization"""
 
@@ -23,7 +45,7 @@ class OptimizationService:
         """Fetch and validate resume and job data"""
         supabase = get_supabase_service_client()
         
-        # Fetch resume data
+        # Fetch resume data, including suggestions the user already applied
         resume_response = (
             supabase.table("resumes")
             .select("*")
@@ -34,7 +56,7 @@ class OptimizationService:
             raise HTTPException(status_code=404, detail="Resume not found")
         
         resume_record = resume_response.data[0]
-        resume_data = resume_record.get("parsed_data", {})
+        resume_data = resume_record.get("optimized_data") or resume_record.get("parsed_data", {})
         
         # Fetch job analysis data
         job_response = supabase.table("jobs").select("*").eq("id", job_id).execute()
@@ -43,6 +65,11 @@ class OptimizationService:
         
         job_record = job_response.data[0]
         job_analysis = job_record.get("analysis", {})
+        if job_record.get("keywords"):
+            job_analysis["keywords"] = job_record["keywords"]
+        # The job's question bank rides along so optimize_resume needs no second query
+        if job_record.get("interview_questions"):
+            job_analysis["interview_questions"] = job_record["interview_questions"]
         
         return resume_data, job_analysis
 
@@ -54,13 +81,155 @@ class OptimizationService:
             "optimized_data": optimized_data
         }).eq("id", resume_id).execute()
 
+    async def get_previous_run(self, resume_id: str, job_id: str) -> OptimizationRun | None:
+        """Last stored run for this resume and job, if any"""
+        supabase = get_supabase_service_client()
+        response = (
+            supabase.table("optimizations")
+            .select("section_hashes, suggestions, interview_questions, ats_score")
+            .eq("resume_id", resume_id)
+            .eq("job_id", job_id)
+            .execute()
+        )
+        return OptimizationRun.from_record(response.data[0]) if response.data else None
+
+    async def save_run(self, resume_id: str, job_id: str, run: OptimizationRun) -> None:
+        """Store a run so the next /optimize can reuse unchanged sections"""
+        supabase = get_supabase_service_client()
+        supabase.table("optimizations").upsert(
+            {"resume_id": resume_id, "job_id": job_id, **run.to_record()},
+            on_conflict="resume_id,job_id",
+        ).execute()
+
+    def _question_bank(self, job_analysis: dict) -> list[InterviewQuestion] | None:
+        """Interview questions stored with the jobs row, None if not generated yet.
+
+        get_resume_job_data passes them through in ``job_analysis``.
+        """
+        questions = job_analysis.get("interview_questions")
+        return [InterviewQuestion(**q) for q in questions] if questions else None
+
+    async def _save_question_bank(self, job_id: str, questions: list[InterviewQuestion]) -> None:
+        """Store a job's generated questions so later optimizations skip the LLM call"""
+        try:
+            supabase = get_supabase_service_client()
+            supabase.table("jobs").update({
+                "interview_questions": [q.model_dump() for q in questions]
+            }).eq("id", job_id).execute()
+        except Exception as e:
+            logger.warning("optimization.question_bank.save_failed", extra={"error": str(e)})
+
     async def optimize_resume(
-        self, resume_data: dict, job_analysis: dict
+        self,
+        resume_data: dict,
+        job_analysis: dict,
+        mode: str | None = None,
+        resume_id: str | None = None,
+        job_id: str | None = None,
     ) -> AsyncGenerator[OptimizationProgress, None]:
-        """Stream optimization suggestions for resume based on job requirements"""
+        """Stream optimization suggestions for resume based on job requirements
+
+        ``mode`` overrides settings.optimization_mode: "multi_call" runs the
+        keyword, experience and interview prompts one after another;
+        "single_call" asks for all three in one streamed reply.
+
+        With ``resume_id`` and ``job_id`` the run is incremental: sections
+        whose content hash matches the stored run reuse its suggestions
+        instead of being re-sent to the LLM, and the new run is stored.
+        Interview questions come from the job's question bank, generated on
+        first use and stored with the jobs row.
+        """
+        roles = [item for item, _ in self._select_experience(resume_data)]
+        hashes = section_hashes(resume_data, job_analysis, roles)
+        previous = None
+        if resume_id and job_id:
+            try:
+                previous = await self.get_previous_run(resume_id, job_id)
+            except Exception as e:
+                # Without a stored run everything is simply re-sent
+                logger.warning("optimization.run.load_failed", extra={"error": str(e)})
+        reuse = previous.reusable_for(hashes) if previous else OptimizationRun(section_hashes=hashes)
+        run = OptimizationRun(section_hashes=hashes)
+        matcher = await self._prepared_skill_matcher(resume_data, job_analysis)
+
+        # Interview questions depend only on the job: use its question bank
+        question_bank = self._question_bank(job_analysis) if job_id else None
+        if reuse.interview_questions is None:
+            reuse.interview_questions = question_bank
+
+        if reuse.is_complete:
+            source = self._replay_run(resume_data, job_analysis, reuse, run, matcher)
+        elif (mode or settings.optimization_mode) == "single_call":
+            source = self._optimize_single_call(resume_data, job_analysis, run, reuse.interview_questions, matcher)
+        else:
+            source = self._optimize_multi_call(resume_data, job_analysis, reuse, run, matcher)
+
+        if previous:
+            logger.info("optimization.incremental", extra={
+                "reused_keywords": reuse.keywords is not None,
+                "reused_roles": len(reuse.experience),
+                "resent_roles": len(hashes["experience"]) - len(reuse.experience),
+                "reused_interview": reuse.interview_questions is not None,
+            })
 
-        # Calculate initial ATS score
-        ats_score = self._calculate_ats_score(resume_data, job_analysis)
+        async for progress in source:
+            yield progress
+
+        if job_id and question_bank is None and run.interview_questions:
+            await self._save_question_bank(job_id, run.interview_questions)
+        if resume_id and job_id:
+            try:
+                await self.save_run(resume_id, job_id, run)
+            except Exception as e:
+                # Losing the run only costs the next rerun its reuse
+                logger.warning("optimization.run.save_failed", extra={"error": str(e)})
+
+    async def _replay_run(
+        self,
+        resume_data: dict,
+        job_analysis: dict,
+        reuse: OptimizationRun,
+        run: OptimizationRun,
+        matcher: SkillMatcher | SemanticSkillMatcher | None = None,
+    ) -> AsyncGenerator[OptimizationProgress, None]:
+        """Nothing changed since the stored run: return it without LLM calls"""
+        run.keywords = reuse.keywords
+        run.experience = reuse.experience
+        run.interview_questions = reuse.interview_questions
+        run.ats_score = self._calculate_ats_score(
+            resume_data, job_analysis,
+            keyword_match=reuse.ats_score.keyword_match if reuse.ats_score else None, matcher=matcher,
+        )
+        all_suggestions = run.keywords + [s for role in run.section_hashes["experience"] for s in run.experience[role]]
+        yield OptimizationProgress(
+            step="complete",
+            progress=100,
+            message=(
+                f"Resume unchanged since the last optimization. {len(all_suggestions)} suggestions "
+                f"and {len(run.interview_questions)} interview questions."
+            ),
+            suggestions=all_suggestions,
+            completed=True,
+            ats_score=run.ats_score,
+            interview_questions=run.interview_questions
+        )
+
+    async def _optimize_multi_call(
+        self,
+        resume_data: dict,
+        job_analysis: dict,
+        reuse: OptimizationRun,
+        run: OptimizationRun,
+        matcher: SkillMatcher | SemanticSkillMatcher | None = None,
+    ) -> AsyncGenerator[OptimizationProgress, None]:
+        """Keyword, experience and interview prompts in turn, skipping reusable sections"""
+
+        # Calculate initial ATS score; the keyword part is reused while skills are unchanged
+        ats_score = self._calculate_ats_score(
+            resume_data, job_analysis,
+            keyword_match=reuse.ats_score.keyword_match if reuse.ats_score else None, matcher=matcher,
+        )
+        run.ats_score = ats_score
 
         # Step 1: Analyze alignment and show initial ATS score
         yield OptimizationProgress(
@@ -82,9 +251,14 @@ class OptimizationService:
             completed=False,
             ats_score=ats_score
         )
-        await asyncio.sleep(2)
 
-        keyword_suggestions = await self._generate_keyword_suggestions(resume_data, job_analysis)
+        if reuse.keywords is not None:
+            keyword_suggestions = reuse.keywords
+        else:
+            await asyncio.sleep(2)
+            keyword_suggestions = await self._generate_keyword_suggestions(resume_data, job_analysis, matcher)
+        if keyword_suggestions != self._keyword_fallback():
+            run.keywords = keyword_suggestions
 
         yield OptimizationProgress(
             step="keywords",
@@ -105,9 +279,24 @@ class OptimizationService:
             completed=False,
             ats_score=ats_score
         )
-        await asyncio.sleep(2)
+        if len(reuse.experience) < len(run.section_hashes["experience"]):
+            await asyncio.sleep(2)
 
-        experience_suggestions = await self._enhance_experience(resume_data, job_analysis)
+        experience_suggestions: list[OptimizationSuggestion] = []
+        async for role, suggestion in self._stream_experience_suggestions(
+            resume_data, job_analysis, reuse=reuse.experience
+        ):
+            experience_suggestions.append(suggestion)
+            if role is not None:
+                run.experience.setdefault(role, []).append(suggestion)
+            yield OptimizationProgress(
+                step="experience",
+                progress=min(84, 70 + len(experience_suggestions)),
+                message=f"Enhanced {len(experience_suggestions)} experience bullets...",
+                suggestions=keyword_suggestions + experience_suggestions,
+                completed=False,
+                ats_score=ats_score
+            )
         all_suggestions = keyword_suggestions + experience_suggestions
 
         yield OptimizationProgress(
@@ -129,9 +318,14 @@ class OptimizationService:
             completed=False,
             ats_score=ats_score
         )
-        await asyncio.sleep(1)
 
-        interview_questions = await self._generate_interview_questions(resume_data, job_analysis)
+        if reuse.interview_questions is not None:
+            interview_questions = reuse.interview_questions
+        else:
+            await asyncio.sleep(1)
+            interview_questions = await self._generate_interview_questions(resume_data, job_analysis)
+        if interview_questions != self._default_interview_questions(job_analysis):
+            run.interview_questions = interview_questions
 
         # Step 5: Final optimization complete
         suggestion_count = len(all_suggestions)
@@ -150,14 +344,252 @@ class OptimizationService:
             interview_questions=interview_questions
         )
 
-    async def generate_cover_letter(self, resume_data: dict, job_analysis: dict) -> str:
+    async def _optimize_single_call(
+        self,
+        resume_data: dict,
+        job_analysis: dict,
+        run: OptimizationRun | None = None,
+        interview_questions: list[InterviewQuestion] | None = None,
+        matcher: SkillMatcher | SemanticSkillMatcher | None = None,
+    ) -> AsyncGenerator[OptimizationProgress, None]:
+        """One LLM round trip for all suggestions, yielded section by section.
+
+        Known ``interview_questions`` (stored run or job question bank) are
+        left out of the prompt. The merged experience section cannot be
+        attributed to roles, so only keywords and interview questions are
+        recorded in ``run``.
+        """
+        run = run or OptimizationRun(section_hashes={})
+        ats_score = self._calculate_ats_score(resume_data, job_analysis, matcher=matcher)
+        run.ats_score = ats_score
+        yield OptimizationProgress(
+            step="analyzing",
+            progress=10,
+            message="Generating keyword, experience and interview suggestions...",
+            suggestions=[],
+            completed=False,
+            ats_score=ats_score
+        )
+
+        missing_skills = self._find_missing_skills(job_analysis, self._get_existing_skills(resume_data), matcher)
+        has_experience = bool(resume_data.get('experience'))
+        prompt = self._single_call_prompt(
+            resume_data, job_analysis, missing_skills, include_interview=interview_questions is None
+        )
+        messages = [{"role": "user", "content": prompt}]
+
+        keyword_suggestions: list[OptimizationSuggestion] | None = None
+        experience_suggestions: list[OptimizationSuggestion] | None = None
+
+        reply = stream_llm_response(messages, call_site="optimization.single_call")
+        async for section, body in self._stream_sections(reply):
+            if section == "keywords" and keyword_suggestions is None:
+                keyword_suggestions = self._parse_section(
+                    body, list[OptimizationSuggestion], "keywords", self._keyword_fallback
+                ) if missing_skills else []
+                yield OptimizationProgress(
+                    step="keywords",
+                    progress=50,
+                    message="Generated keyword suggestions",
+                    suggestions=keyword_suggestions,
+                    completed=False,
+                    ats_score=ats_score
+                )
+            elif section == "experience" and experience_suggestions is None:
+                experience_suggestions = self._parse_section(
+                    body, list[OptimizationSuggestion], "experience", self._experience_fallback
+                ) if has_experience else []
+                yield OptimizationProgress(
+                    step="experience",
+                    progress=85,
+                    message="Enhanced experience descriptions",
+                    suggestions=(keyword_suggestions or []) + experience_suggestions,
+                    completed=False,
+                    ats_score=ats_score
+                )
+            elif section == "interview" and interview_questions is None:
+                interview_questions = self._parse_section(
+                    body, list[InterviewQuestion], "interview",
+                    lambda: self._default_interview_questions(job_analysis),
+                )[:5]
+
+        # Sections the model left out fall back like failed parses
+        if keyword_suggestions is None:
+            keyword_suggestions = self._keyword_fallback() if missing_skills else []
+        if experience_suggestions is None:
+            experience_suggestions = self._experience_fallback() if has_experience else []
+        if interview_questions is None:
+            interview_questions = self._default_interview_questions(job_analysis)
+        if keyword_suggestions != self._keyword_fallback():
+            run.keywords = keyword_suggestions
+        if interview_questions != self._default_interview_questions(job_analysis):
+            run.interview_questions = interview_questions
+
+        all_suggestions = keyword_suggestions + experience_suggestions
+        yield OptimizationProgress(
+            step="complete",
+            progress=100,
+            message=(
+                f"Optimization complete! Generated {len(all_suggestions)} suggestions "
+                f"and {len(interview_questions)} interview questions."
+            ),
+            suggestions=all_suggestions,
+            completed=True,
+            ats_score=ats_score,
+            interview_questions=interview_questions
+        )
+
+    def _single_call_prompt(
+        self, resume_data: dict, job_analysis: dict, missing_skills: dict, include_interview: bool = True
+    ) -> str:
+        """Merged keywords + experience (+ interview) prompt sharing one job context"""
+        selected_experience = self._select_experience(resume_data)
+        missing = missing_skills.get('required_skills', []) + missing_skills.get('technologies', [])
+        interview_section = """
+        ### INTERVIEW
+        Exactly 5 questions specific to the technologies and requirements, with categories
+        technical, behavioral, system_design, role_specific, technical:
+        [{"category": "technical", "question": "Specific technical question", "tips": "Brief tip (1-2 sentences)"}]
+        """ if include_interview else ""
+
+        return f"""
+        Optimize a resume for the job below and prepare the candidate for interviews.
+
+        JOB:
+        Title: {job_analysis.get('title', 'Target Role')}
+        Company: {job_analysis.get('company', 'the company')}
+        Experience Level: {job_analysis.get('experience_level', 'mid-level')}
+        Key Requirements: {', '.join(job_analysis.get('key_requirements', []))}
+        Required Technologies: {', '.join(job_analysis.get('technologies', []))}
+
+        RESUME:
+        Skills missing from the resume: {', '.join(missing) or 'none'}
+        Experience:
+        {self._format_experience(selected_experience) or 'none'}
+
+        Reply with exactly {'three' if include_interview else 'two'} sections in this order. Start each with its marker line,
+        followed by ONLY a JSON array.
+
+        ### KEYWORDS
+        Suggestions for ONLY the missing skills ([] if none):
+        [{{"section": "skills", "type": "add_keyword", "original": "Current skill list",
+          "suggested": "React, Node.js, Docker", "reason": "Job requires X but resume doesn't mention it",
+          "impact": "high"}}]
+
+        ### EXPERIENCE
+        ONE suggestion per experience bullet above, for roles without bullets one new bullet ([] if there is no experience):
+        [{{"section": "experience", "type": "enhance_description", "original": "Current description bullet point",
+          "suggested": "Enhanced description with quantified impact", "reason": "Better alignment with job requirements",
+          "impact": "high"}}]
+        {interview_section}"""
+
+    async def _stream_sections(self, reply: AsyncIterator[str]) -> AsyncIterator[tuple[str, str]]:
+        """Split a marker-delimited streamed reply into (section, body) pairs.
+
+        A section is yielded as soon as the next marker arrives, so its
+        suggestions reach the client while later sections still stream.
+        """
+        buffer = ""
+        async for chunk in reply:
+            buffer += chunk
+            markers = list(SECTION_MARKER_RE.finditer(buffer))
+            while len(markers) >= 2:
+                yield markers[0].group(1).lower(), buffer[markers[0].end():markers[1].start()]
+                buffer = buffer[markers[1].start():]
+                markers = list(SECTION_MARKER_RE.finditer(buffer))
+        marker = SECTION_MARKER_RE.search(buffer)
+        if marker:
+            yield marker.group(1).lower(), buffer[marker.end():]
+
+    def _parse_section(self, body: str, schema, section: str, fallback):
+        try:
+            return validate_llm_json(body, schema, call_site=f"optimization.single_call.{section}")
+        except LLMJSONError:
+            return fallback()
+
+    async def generate_cover_letter(
+        self,
+        resume_data: dict,
+        job_analysis: dict,
+        resume_id: str | None = None,
+        job_id: str | None = None,
+    ) -> str:
         """Generate tailored cover letter based on resume and job analysis"""
-        
+        chunks = [
+            chunk async for chunk in self.stream_cover_letter(resume_data, job_analysis, resume_id, job_id)
+        ]
+        return "".join(chunks).strip()
+
+    async def stream_cover_letter(
+        self,
+        resume_data: dict,
+        job_analysis: dict,
+        resume_id: str | None = None,
+        job_id: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream cover letter text as the LLM produces it.
+
+        With ``resume_id`` and ``job_id`` the letter is stored in
+        optimizations.cover_letter and replayed, without an LLM call, while
+        the resume and job content hashes match the stored generation.
+        """
+        input_hash = content_hash({"resume": resume_data, "job": job_analysis})
+        if resume_id and job_id:
+            try:
+                cached = await self.get_cached_cover_letter(resume_id, job_id, input_hash)
+            except Exception as e:
+                logger.warning("optimization.cover_letter.load_failed", extra={"error": str(e)})
+                cached = None
+            if cached is not None:
+                logger.info("optimization.cover_letter.cache_hit", extra={"resume_id": resume_id, "job_id": job_id})
+                yield cached
+                return
+
+        messages = [{"role": "user", "content": self._cover_letter_prompt(resume_data, job_analysis)}]
+        chunks = []
+        async for chunk in stream_llm_response(messages, call_site="optimization.cover_letter"):
+            chunks.append(chunk)
+            yield chunk
+
+        cover_letter = "".join(chunks).strip()
+        if resume_id and job_id and cover_letter:
+            try:
+                await self.save_cover_letter(resume_id, job_id, input_hash, cover_letter)
+            except Exception as e:
+                logger.warning("optimization.cover_letter.save_failed", extra={"error": str(e)})
+
+    async def get_cached_cover_letter(self, resume_id: str, job_id: str, input_hash: str) -> str | None:
+        """Stored cover letter if it was generated from the same resume and job content"""
+        supabase = get_supabase_service_client()
+        response = (
+            supabase.table("optimizations")
+            .select("cover_letter, cover_letter_hash")
+            .eq("resume_id", resume_id)
+            .eq("job_id", job_id)
+            .execute()
+        )
+        if response.data and response.data[0].get("cover_letter_hash") == input_hash:
+            return response.data[0].get("cover_letter")
+        return None
+
+    async def save_cover_letter(self, resume_id: str, job_id: str, input_hash: str, cover_letter: str) -> None:
+        supabase = get_supabase_service_client()
+        supabase.table("optimizations").upsert(
+            {
+                "resume_id": resume_id,
+                "job_id": job_id,
+                "cover_letter": cover_letter,
+                "cover_letter_hash": input_hash,
+            },
+            on_conflict="resume_id,job_id",
+        ).execute()
+
+    def _cover_letter_prompt(self, resume_data: dict, job_analysis: dict) -> str:
         personal_info = resume_data.get('personal_info', {})
         experience = resume_data.get('experience', [])
         skills = resume_data.get('skills', {})
         
-        prompt = f"""
+        return f"""
         Write a professional cover letter for a tech professional applying to this job.
         
         CANDIDATE INFO:
@@ -182,16 +614,15 @@ class OptimizationService:
         Return ONLY the cover letter text, no additional formatting or explanations.
         """
 
-        messages = [{"role": "user", "content": prompt}]
-        response_text = ""
-        
-        async for chunk in stream_llm_response(messages):
-            response_text += chunk
-
-        return response_text.strip()
+    async def _complete(self, messages: list, **kwargs) -> str:
+        """Collect a streamed LLM reply into a single string"""
+        return "".join([chunk async for chunk in stream_llm_response(messages, **kwargs)])
 
     async def _generate_keyword_suggestions(
-        self, resume_data: dict, job_analysis: dict
+        self,
+        resume_data: dict,
+        job_analysis: dict,
+        matcher: SkillMatcher | SemanticSkillMatcher | None = None,
     ) -> list[OptimizationSuggestion]:
         """Generate keyword optimization suggestions"""
         
@@ -199,7 +630,7 @@ class OptimizationService:
         existing_skills = self._get_existing_skills(resume_data)
         
         # Filter job requirements to exclude existing skills
-        missing_skills = self._find_missing_skills(job_analysis, existing_skills)
+        missing_skills = self._find_missing_skills(job_analysis, existing_skills, matcher)
         
         if not missing_skills:
             return []
@@ -227,29 +658,24 @@ class OptimizationService:
         """
 
         messages = [{"role": "user", "content": prompt}]
-        response_text = ""
-        
-        async for chunk in stream_llm_response(messages):
-            response_text += chunk
 
         try:
-            json_str = response_text.strip()
-            if json_str.startswith('```json'):
-                json_str = json_str[7:-3]
-            elif json_str.startswith('```'):
-                json_str = json_str[3:-3]
-            
-            suggestions_data = json.loads(json_str)
-            return [OptimizationSuggestion(**suggestion) for suggestion in suggestions_data]
-        except (json.JSONDecodeError, Exception):
-            return [OptimizationSuggestion(
-                section="skills",
-                type="add_keyword",
-                original="Current skills",
-                suggested="Add missing job-required skills",
-                reason="Failed to parse AI suggestions",
-                impact="medium"
-            )]
+            return await request_json(
+                messages, list[OptimizationSuggestion],
+                call_site="optimization.keywords", complete=self._complete
+            )
+        except LLMJSONError:
+            return self._keyword_fallback()
+
+    def _keyword_fallback(self) -> list[OptimizationSuggestion]:
+        return [OptimizationSuggestion(
+            section="skills",
+            type="add_keyword",
+            original="Current skills",
+            suggested="Add missing job-required skills",
+            reason="Failed to parse AI suggestions",
+            impact="medium"
+        )]
 
     def _get_existing_skills(self, resume_data: dict) -> set[str]:
         """Extract and normalize all existing skills from resume"""
@@ -260,58 +686,175 @@ class OptimizationService:
         for category in ['technical', 'soft_skills', 'tools', 'languages']:
             category_skills = skills.get(category, [])
             for skill in category_skills:
-                existing_skills.add(skill.lower().strip())
+                existing_skills.add(skill_key(skill))
         
         return existing_skills
 
-    def _find_missing_skills(self, job_analysis: dict, existing_skills: set[str]) -> dict[str, list[str]]:
+    def _job_keywords(self, job_analysis: dict) -> dict[str, list[str]]:
+        """Keys precomputed at /jobs/analyze; computed here for rows not yet backfilled"""
+        keywords = job_analysis.get('keywords')
+        if (
+            keywords
+            and len(keywords.get('required_skills', [])) == len(job_analysis.get('required_skills', []))
+            and len(keywords.get('technologies', [])) == len(job_analysis.get('technologies', []))
+        ):
+            return keywords
+        return job_keywords(job_analysis)
+
+    def _skill_matcher(self, existing_skills: set[str]) -> SkillMatcher | SemanticSkillMatcher:
+        """Lexical matcher, with the embedding fallback when semantic matching is on"""
+        options = {"mode": settings.ats_keyword_matching, "max_distance": settings.ats_fuzzy_max_distance}
+        store = get_skill_store()
+        if store is None:
+            return SkillMatcher(existing_skills, **options)
+        return SemanticSkillMatcher(existing_skills, store, settings.semantic_match_threshold, **options)
+
+    async def _prepared_skill_matcher(
+        self, resume_data: dict, job_analysis: dict
+    ) -> SkillMatcher | SemanticSkillMatcher:
+        """The run's skill matcher, with every job keyword resolved up front.
+
+        Semantic matching embeds the job's keywords and the resume's skills
+        in one batch off the event loop; the ATS score and missing skills
+        then share this matcher and only read its results.
+        """
+        matcher = self._skill_matcher(self._get_existing_skills(resume_data))
+        if isinstance(matcher, SemanticSkillMatcher):
+            await asyncio.to_thread(matcher.prepare, self._job_keywords(job_analysis)['all'])
+        return matcher
+
+    def _find_missing_skills(
+        self,
+        job_analysis: dict,
+        existing_skills: set[str],
+        matcher: SkillMatcher | SemanticSkillMatcher | None = None,
+    ) -> dict[str, list[str]]:
         """Find job requirements that don't exist in resume skills"""
         missing_skills = {}
+        keywords = self._job_keywords(job_analysis)
+        if matcher is None:
+            matcher = self._skill_matcher(existing_skills)
         
-        # Check required skills
-        required_skills = job_analysis.get('required_skills', [])
-        missing_required = [
-            skill for skill in required_skills 
-            if skill.lower().strip() not in existing_skills
-        ]
-        if missing_required:
-            missing_skills['required_skills'] = missing_required
-        
-        # Check technologies
-        technologies = job_analysis.get('technologies', [])
-        missing_tech = [
-            tech for tech in technologies 
-            if tech.lower().strip() not in existing_skills
-        ]
-        if missing_tech:
-            missing_skills['technologies'] = missing_tech
+        # Check required skills and technologies, keeping the job's wording
+        for field in ('required_skills', 'technologies'):
+            missing = [
+                name for name, key in zip(job_analysis.get(field, []), keywords[field])
+                if matcher.match(key) is None
+            ]
+            if missing:
+                missing_skills[field] = missing
         
         return missing_skills
 
     async def _enhance_experience(
         self, resume_data: dict, job_analysis: dict
     ) -> list[OptimizationSuggestion]:
-        """Generate experience enhancement suggestions"""
-        
-        experience_items = resume_data.get('experience', [])
-        if not experience_items:
-            return []
+        """Generate experience enhancement suggestions for every role"""
+        return [
+            suggestion
+            async for _, suggestion in self._stream_experience_suggestions(resume_data, job_analysis)
+        ]
 
-        first_experience = experience_items[0]
-        
+    def _select_experience(self, resume_data: dict) -> list[tuple[dict, list[str]]]:
+        """Roles to enhance with their bullets, capped at optimization_max_experience_bullets.
+
+        Roles are taken in resume order (most recent first); a role without
+        bullets costs one suggestion from the budget.
+        """
+        budget = settings.optimization_max_experience_bullets
+        selected = []
+        for item in resume_data.get('experience', []):
+            if budget <= 0:
+                break
+            description = item.get('description') or []
+            if isinstance(description, str):
+                description = [description]
+            bullets = [bullet for bullet in description if bullet][:budget]
+            selected.append((item, bullets))
+            budget -= max(len(bullets), 1)
+        return selected
+
+    def _format_experience(self, selected: list[tuple[dict, list[str]]]) -> str:
+        blocks = []
+        for item, bullets in selected:
+            lines = [f"Title: {item.get('title', '')}", f"Company: {item.get('company', '')}"]
+            lines += [f"- {bullet}" for bullet in bullets] or ["(no description bullets)"]
+            blocks.append("\n        ".join(lines))
+        return "\n\n        ".join(blocks)
+
+    async def _stream_experience_suggestions(
+        self, resume_data: dict, job_analysis: dict, reuse: dict[str, list[OptimizationSuggestion]] | None = None
+    ) -> AsyncIterator[tuple[str | None, OptimizationSuggestion]]:
+        """Enhance all roles in parallel, yielding (role hash, suggestion) as each bullet arrives.
+
+        Roles whose hash is in ``reuse`` yield their stored suggestions
+        without an LLM call. At most optimization_experience_concurrency
+        roles are in flight. If no role produces a valid suggestion the
+        generic fallback is yielded with a role hash of None.
+        """
+        reuse = reuse or {}
+        selected = []
+        produced = 0
+        for item, bullets in self._select_experience(resume_data):
+            role = content_hash(item)
+            if role in reuse:
+                for suggestion in reuse[role]:
+                    produced += 1
+                    yield role, suggestion
+            else:
+                selected.append((role, item, bullets))
+        if not selected and not produced:
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(settings.optimization_experience_concurrency)
+
+        async def enhance(role: str, item: dict, bullets: list[str]) -> None:
+            try:
+                async with semaphore:
+                    async for suggestion in self._enhance_role(item, bullets, job_analysis):
+                        await queue.put((role, suggestion))
+            except Exception as e:
+                await queue.put(e)
+            finally:
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(enhance(role, item, bullets)) for role, item, bullets in selected]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                result = await queue.get()
+                if result is None:
+                    remaining -= 1
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    produced += 1
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if not produced:
+            for suggestion in self._experience_fallback():
+                yield None, suggestion
+
+    async def _enhance_role(
+        self, item: dict, bullets: list[str], job_analysis: dict
+    ) -> AsyncIterator[OptimizationSuggestion]:
+        """Stream one suggestion per bullet of a single role"""
         prompt = f"""
-        Enhance this work experience description to better match the job requirements.
+        Enhance this work experience to better match the job requirements.
         
         Job Title: {job_analysis.get('title', 'Target Role')}
         Job Requirements: {', '.join(job_analysis.get('key_requirements', []))}
         Required Technologies: {', '.join(job_analysis.get('technologies', []))}
         
         Current Experience:
-        Title: {first_experience.get('title', '')}
-        Company: {first_experience.get('company', '')}
-        Description: {first_experience.get('description', [])}
+        {self._format_experience([(item, bullets)])}
         
-        Return ONLY a JSON array with ONE suggestion:
+        Return ONLY a JSON array with ONE suggestion per bullet, in bullet order
+        (one new bullet if there are none):
         [
             {{
                 "section": "experience",
@@ -325,56 +868,49 @@ class OptimizationService:
         """
 
         messages = [{"role": "user", "content": prompt}]
-        response_text = ""
-        
-        async for chunk in stream_llm_response(messages):
-            response_text += chunk
+        limit = max(len(bullets), 1)
+        # Close the stream explicitly on early exit so its scheduler slot is freed
+        async with aclosing(stream_llm_response(messages, call_site="optimization.experience")) as reply:
+            async for text in stream_json_objects(reply):
+                try:
+                    yield validate_llm_json(text, OptimizationSuggestion, call_site="optimization.experience")
+                except LLMJSONError:
+                    continue
+                limit -= 1
+                if not limit:
+                    break
 
-        try:
-            json_str = response_text.strip()
-            if json_str.startswith('```json'):
-                json_str = json_str[7:-3]
-            elif json_str.startswith('```'):
-                json_str = json_str[3:-3]
-
-            suggestions_data = json.loads(json_str)
-            return [OptimizationSuggestion(**suggestion) for suggestion in suggestions_data]
-        except (json.JSONDecodeError, Exception):
-            return [OptimizationSuggestion(
-                section="experience",
-                type="enhance_description",
-                original="Current experience description",
-                suggested="Enhanced description with quantified impact",
-                reason="Improve alignment with job requirements",
-                impact="high"
-            )]
+    def _experience_fallback(self) -> list[OptimizationSuggestion]:
+        return [OptimizationSuggestion(
+            section="experience",
+            type="enhance_description",
+            original="Current experience description",
+            suggested="Enhanced description with quantified impact",
+            reason="Improve alignment with job requirements",
+            impact="high"
+        )]
 
     def _calculate_ats_score(
-        self, resume_data: dict, job_analysis: dict
+        self,
+        resume_data: dict,
+        job_analysis: dict,
+        keyword_match: KeywordMatchScore | None = None,
+        matcher: SkillMatcher | SemanticSkillMatcher | None = None,
     ) -> ATSScore:
-        """Calculate ATS compatibility score based on resume-job alignment"""
+        """Calculate ATS compatibility score based on resume-job alignment
+
+        ``keyword_match`` from a previous run is reused as-is when the skills
+        and job are unchanged; only the section checks are recomputed.
+        ``matcher`` is the run's prepared matcher (built here if omitted).
+        """
 
         # Get existing skills and job requirements
         existing_skills = self._get_existing_skills(resume_data)
 
         # Calculate keyword match score (50% weight)
-        required_skills = [s.lower().strip() for s in job_analysis.get('required_skills', [])]
-        technologies = [t.lower().strip() for t in job_analysis.get('technologies', [])]
-        all_required = list(set(required_skills + technologies))
-
-        matched_keywords = [kw for kw in all_required if kw in existing_skills]
-        missing_keywords = [kw for kw in all_required if kw not in existing_skills]
-
-        total_keywords = len(all_required) if all_required else 1
-        keyword_percentage = int((len(matched_keywords) / total_keywords) * 100)
-
-        keyword_score = KeywordMatchScore(
-            matched=len(matched_keywords),
-            total=total_keywords,
-            percentage=keyword_percentage,
-            matched_keywords=matched_keywords[:10],  # Limit to top 10
-            missing_keywords=missing_keywords[:10]   # Limit to top 10
-        )
+        keyword_score = keyword_match or self._keyword_match(existing_skills, job_analysis, matcher)
+        keyword_percentage = keyword_score.percentage
+        missing_count = keyword_score.total - keyword_score.matched if keyword_score.missing_keywords else 0
 
         # Calculate section completeness score (30% weight)
         sections = []
@@ -409,7 +945,7 @@ class OptimizationService:
         recommendations = []
         if keyword_percentage < 60:
             recommendations.append(
-                f"Add {len(missing_keywords)} missing keywords to improve ATS matching"
+                f"Add {missing_count} missing keywords to improve ATS matching"
             )
         if not resume_data.get('personal_info', {}).get('email'):
             recommendations.append("Add contact email for recruiter follow-up")
@@ -428,6 +964,32 @@ class OptimizationService:
             recommendations=recommendations[:5]  # Limit to 5 recommendations
         )
 
+    def _keyword_match(
+        self,
+        existing_skills: set[str],
+        job_analysis: dict,
+        matcher: SkillMatcher | SemanticSkillMatcher | None = None,
+    ) -> KeywordMatchScore:
+        all_required = self._job_keywords(job_analysis)['all']
+        if matcher is None:
+            matcher = self._skill_matcher(existing_skills)
+
+        matched_keywords = []
+        missing_keywords = []
+        for kw in all_required:
+            (matched_keywords if matcher.match(kw) else missing_keywords).append(kw)
+
+        total_keywords = len(all_required) if all_required else 1
+        keyword_percentage = int((len(matched_keywords) / total_keywords) * 100)
+
+        return KeywordMatchScore(
+            matched=len(matched_keywords),
+            total=total_keywords,
+            percentage=keyword_percentage,
+            matched_keywords=matched_keywords[:10],  # Limit to top 10
+            missing_keywords=missing_keywords[:10]   # Limit to top 10
+        )
+
     async def _generate_interview_questions(
         self, resume_data: dict, job_analysis: dict
     ) -> list[InterviewQuestion]:
@@ -478,49 +1040,49 @@ class OptimizationService:
         """
 
         messages = [{"role": "user", "content": prompt}]
-        response_text = ""
-
-        async for chunk in stream_llm_response(messages):
-            response_text += chunk
 
         try:
-            json_str = response_text.strip()
-            if json_str.startswith('```json'):
-                json_str = json_str[7:-3]
-            elif json_str.startswith('```'):
-                json_str = json_str[3:-3]
-
-            questions_data = json.loads(json_str)
-            return [InterviewQuestion(**q) for q in questions_data[:5]]
-        except (json.JSONDecodeError, Exception):
-            # Return default questions if parsing fails
-            return [
-                InterviewQuestion(
-                    category="technical",
-                    question=f"Describe your experience with {technologies[0] if technologies else 'relevant technologies'}.",
-                    tips="Use specific examples from past projects with metrics."
-                ),
-                InterviewQuestion(
-                    category="behavioral",
-                    question="Tell me about a challenging project and how you overcame obstacles.",
-                    tips="Use the STAR method: Situation, Task, Action, Result."
-                ),
-                InterviewQuestion(
-                    category="system_design",
-                    question=f"How would you design a scalable system for {job_title} responsibilities?",
-                    tips="Start with requirements, then discuss architecture and trade-offs."
-                ),
-                InterviewQuestion(
-                    category="role_specific",
-                    question=f"Why are you interested in the {job_title} role at {company}?",
-                    tips="Research the company and connect your experience to their mission."
-                ),
-                InterviewQuestion(
-                    category="technical",
-                    question="Walk me through how you would debug a production issue.",
-                    tips="Describe your systematic approach: logs, monitoring, isolation, fix."
-                ),
-            ]
+            questions = await request_json(
+                messages, list[InterviewQuestion],
+                call_site="optimization.interview_questions", complete=self._complete,
+                cache=True,
+            )
+            return questions[:5]
+        except LLMJSONError:
+            return self._default_interview_questions(job_analysis)
+
+    def _default_interview_questions(self, job_analysis: dict) -> list[InterviewQuestion]:
+        """Generic questions used when the LLM reply cannot be parsed"""
+        job_title = job_analysis.get('title', 'Software Engineer')
+        company = job_analysis.get('company', 'the company')
+        technologies = job_analysis.get('technologies', [])[:5]
+        return [
+            InterviewQuestion(
+                category="technical",
+                question=f"Describe your experience with {technologies[0] if technologies else 'relevant technologies'}.",
+                tips="Use specific examples from past projects with metrics."
+            ),
+            InterviewQuestion(
+                category="behavioral",
+                question="Tell me about a challenging project and how you overcame obstacles.",
+                tips="Use the STAR method: Situation, Task, Action, Result."
+            ),
+            InterviewQuestion(
+                category="system_design",
+                question=f"How would you design a scalable system for {job_title} responsibilities?",
+                tips="Start with requirements, then discuss architecture and trade-offs."
+            ),
+            InterviewQuestion(
+                category="role_specific",
+                question=f"Why are you interested in the {job_title} role at {company}?",
+                tips="Research the company and connect your experience to their mission."
+            ),
+            InterviewQuestion(
+                category="technical",
+                question="Walk me through how you would debug a production issue.",
+                tips="Describe your systematic approach: logs, monitoring, isolation, fix."
+            ),
+        ]
 
 
 # Global service instance
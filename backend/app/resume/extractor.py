@@ -0,0 +1,394 @@
+import re
+from dataclasses import dataclass
+from dataclasses import field
+
+# Canonical section names and the header spellings that map onto them
+SECTION_ALIASES = {
+    "experience": {
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "relevant experience",
+    },
+    "skills": {
+        "skills", "technical skills", "core competencies", "competencies",
+        "skills & tools", "skills and tools", "technologies", "tech stack",
+    },
+    "projects": {
+        "projects", "personal projects", "selected projects", "side projects",
+        "key projects", "open source", "open source projects",
+    },
+    "education": {
+        "education", "education & certifications", "academic background",
+        "academic history", "education and training",
+    },
+}
+
+RESUME_FIELDS = ["personal_info", "experience", "skills", "projects", "education"]
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"(?:\+?\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w.-]+(?:/[\w.-]+)?", re.IGNORECASE)
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/in/[\w.-]+/?", re.IGNORECASE)
+LOCATION_RE = re.compile(r"\b[A-Z][a-zA-Z.]+(?: [A-Z][a-zA-Z.]+)*, (?:[A-Z]{2}|[A-Z][a-z]+)\b")
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+DATE = rf"(?:{MONTH}\s+)?(?:19|20)\d{{2}}|(?:0?[1-9]|1[0-2])/(?:19|20)\d{{2}}"
+DURATION_RE = re.compile(
+    rf"(?:{DATE})\s*(?:-|–|—|to)\s*(?:{DATE}|present|current|now)|(?:{DATE})",
+    re.IGNORECASE,
+)
+GPA_RE = re.compile(r"\bGPA:?\s*([0-4]\.\d{1,2}(?:\s*/\s*[0-9.]+)?)", re.IGNORECASE)
+METRIC_RE = re.compile(r"\d+(?:\.\d+)?\s*(?:%|x\b|[kKmM]\+?|\+)|\$\d")
+BULLET_RE = re.compile(r"^\s*(?:[•●▪‣◦*\-–]|\d+\.)\s+")
+FIELD_SPLIT_RE = re.compile(r"\s+\|\s+|\s+—\s+|\s+–\s+|\s+at\s+|\s+@\s+")
+# Institutions often contain "at" ("University of Texas at Austin")
+EDUCATION_SPLIT_RE = re.compile(r"\s+\|\s+|\s+—\s+|\s+–\s+")
+DEGREE_RE = re.compile(
+    r"\b(?:bachelor|master|doctor|associate|ph\.?\s?d|mba|b\.?\s?s|m\.?\s?s|b\.?\s?a|m\.?\s?a"
+    r"|b\.?\s?sc|m\.?\s?sc|b\.?\s?eng|m\.?\s?eng|diploma|certificate)\b",
+    re.IGNORECASE,
+)
+INSTITUTION_RE = re.compile(r"\b(?:university|college|institute|school|academy|polytechnic)\b", re.IGNORECASE)
+
+
+@dataclass
+class ExtractionResult:
+    """Rule-based extraction output with a 0-1 confidence per top-level field"""
+    data: dict
+    confidence: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def overall_confidence(self) -> float:
+        if not self.confidence:
+            return 0.0
+        return min(self.confidence.values())
+
+    def low_confidence_fields(self, threshold: float) -> list[str]:
+        return [name for name in RESUME_FIELDS if self.confidence.get(name, 0.0) < threshold]
+
+
+class RuleBasedResumeExtractor:
+    """Deterministic extractor for resumes that use standard section headers.
+
+    Fills the ResumeData structure directly from the markdown produced by
+    ResumeParser, so well-structured resumes can skip the LLM entirely.
+    """
+
+    def extract(self, markdown_text: str, github_url: str | None = None) -> ExtractionResult:
+        header_lines, sections = self._split_sections(markdown_text)
+
+        personal_info, personal_conf = self._extract_personal_info(header_lines, markdown_text)
+        if github_url and not personal_info.get("github"):
+            personal_info["github"] = github_url
+
+        skills, skills_conf = self._extract_skills(sections.get("skills"))
+        known_skills = self._skill_vocabulary(skills)
+        experience, experience_conf = self._extract_experience(sections.get("experience"), known_skills)
+        projects, projects_conf = self._extract_projects(sections.get("projects"), known_skills)
+        education, education_conf = self._extract_education(sections.get("education"))
+
+        return ExtractionResult(
+            data={
+                "personal_info": personal_info,
+                "experience": experience,
+                "skills": skills,
+                "projects": projects,
+                "education": education,
+            },
+            confidence={
+                "personal_info": personal_conf,
+                "experience": experience_conf,
+                "skills": skills_conf,
+                "projects": projects_conf,
+                "education": education_conf,
+            },
+        )
+
+    def _section_name(self, line: str) -> str | None:
+        """Return the canonical section for a header line, or None"""
+        stripped = line.strip()
+        is_markdown_header = stripped.startswith("#")
+        text = stripped.lstrip("#").strip().rstrip(":").strip()
+        if not text or len(text) >= 50:
+            return None
+        if not (is_markdown_header or text.isupper() or stripped.endswith(":")):
+            return None
+        normalized = re.sub(r"\s+", " ", text.lower())
+        for section, aliases in SECTION_ALIASES.items():
+            if normalized in aliases:
+                return section
+        return None
+
+    def _split_sections(self, markdown_text: str) -> tuple[list[str], dict[str, list[str]]]:
+        """Split markdown into the pre-section header block and known sections"""
+        header_lines: list[str] = []
+        sections: dict[str, list[str]] = {}
+        current: list[str] | None = None
+
+        for raw_line in markdown_text.splitlines():
+            line = raw_line.strip()
+            section = self._section_name(line) if line else None
+            if section:
+                current = sections.setdefault(section, [])
+                continue
+            if current is not None and self._is_unknown_header(line):
+                # Unknown section (e.g. "Certifications") - stop collecting
+                current = None
+                continue
+            if current is None:
+                if not sections:
+                    header_lines.append(line)
+            else:
+                current.append(line)
+
+        return header_lines, sections
+
+    def _is_unknown_header(self, line: str) -> bool:
+        if line.startswith("#"):
+            return True
+        letters = re.sub(r"[^A-Za-z]", "", line)
+        return (
+            line.isupper() and len(line) < 50 and len(letters) >= 4
+            and not any(char in line for char in ",:|")
+        )
+
+    def _entries(self, lines: list[str]) -> list[list[str]]:
+        """Group section lines into entries: a non-bullet line opens a new entry"""
+        entries: list[list[str]] = []
+        for line in lines:
+            if not line:
+                continue
+            if BULLET_RE.match(line) and entries:
+                entries[-1].append(line)
+            elif entries and not BULLET_RE.match(line) and self._is_continuation(entries[-1], line):
+                entries[-1].append(line)
+            else:
+                entries.append([line])
+        return entries
+
+    def _is_continuation(self, entry: list[str], line: str) -> bool:
+        """Lines like a standalone date or 'GPA: 3.8' belong to the previous entry"""
+        if len(entry) == 1 and not DURATION_RE.search(entry[0]) and DURATION_RE.fullmatch(line.strip()):
+            return True
+        return bool(GPA_RE.match(line) or line.lower().startswith(("technologies:", "tech stack:", "github:")))
+
+    def _strip_bullet(self, line: str) -> str:
+        return BULLET_RE.sub("", line).strip()
+
+    def _split_list(self, text: str) -> list[str]:
+        """Split a comma/semicolon list while keeping parenthesised groups intact"""
+        items, depth, current = [], 0, []
+        for char in text:
+            if char in "([":
+                depth += 1
+            elif char in ")]":
+                depth = max(0, depth - 1)
+            if char in ",;" and depth == 0:
+                items.append("".join(current))
+                current = []
+            else:
+                current.append(char)
+        items.append("".join(current))
+        return [item.strip().rstrip(".") for item in items if item.strip()]
+
+    def _extract_personal_info(self, header_lines: list[str], full_text: str) -> tuple[dict, float]:
+        header_text = "\n".join(header_lines)
+        search_text = header_text or full_text
+
+        email = EMAIL_RE.search(search_text) or EMAIL_RE.search(full_text)
+        phone = PHONE_RE.search(search_text)
+        github = GITHUB_RE.search(search_text)
+        linkedin = LINKEDIN_RE.search(search_text)
+        location = LOCATION_RE.search(search_text)
+
+        name = None
+        for line in header_lines:
+            candidate = line.lstrip("#").strip()
+            if not candidate or EMAIL_RE.search(candidate) or PHONE_RE.search(candidate):
+                continue
+            words = candidate.split()
+            if 1 < len(words) <= 5 and all(w[0].isalpha() for w in words) and ":" not in candidate:
+                name = candidate.title() if candidate.isupper() else candidate
+                break
+
+        info = {
+            "name": name or "",
+            "email": email.group(0) if email else "",
+            "phone": phone.group(0).strip() if phone else None,
+            "location": location.group(0) if location else None,
+            "github": self._as_url(github.group(0)) if github else None,
+            "linkedin": self._as_url(linkedin.group(0)) if linkedin else None,
+        }
+        confidence = (0.5 if name else 0.0) + (0.5 if email else 0.0)
+        return info, confidence
+
+    def _as_url(self, value: str) -> str:
+        value = value.rstrip("/")
+        return value if value.lower().startswith("http") else f"https://{value}"
+
+    def _extract_skills(self, lines: list[str] | None) -> tuple[dict, float]:
+        skills: dict[str, list[str]] = {"technical": [], "soft_skills": [], "tools": [], "languages": []}
+        if not lines:
+            return skills, 0.0
+
+        labelled = 0
+        for raw_line in lines:
+            line = self._strip_bullet(raw_line)
+            if not line:
+                continue
+            label, sep, values = line.partition(":")
+            if sep and len(label) < 40:
+                labelled += 1
+                bucket = self._skill_bucket(label)
+            else:
+                values, bucket = line, "technical"
+            for skill in self._split_list(values):
+                if skill not in skills[bucket]:
+                    skills[bucket].append(skill)
+
+        total = sum(len(v) for v in skills.values())
+        if not total:
+            return skills, 0.0
+        return skills, 1.0 if labelled else 0.8
+
+    def _skill_bucket(self, label: str) -> str:
+        label = label.lower()
+        if "soft" in label or "interpersonal" in label:
+            return "soft_skills"
+        if "language" in label and "programming" not in label and "coding" not in label:
+            return "languages"
+        if any(word in label for word in ("tool", "cloud", "devops", "platform", "infrastructure")):
+            return "tools"
+        return "technical"
+
+    def _skill_vocabulary(self, skills: dict[str, list[str]]) -> dict[str, str]:
+        """Map lowercase skill names (including parenthesised parts) to display names"""
+        vocabulary: dict[str, str] = {}
+        for bucket in ("technical", "tools"):
+            for skill in skills[bucket]:
+                base = re.sub(r"\s*\(.*\)", "", skill).strip()
+                vocabulary[base.lower()] = base
+        return vocabulary
+
+    def _find_technologies(self, text: str, vocabulary: dict[str, str]) -> list[str]:
+        found = []
+        lowered = text.lower()
+        for key, display in vocabulary.items():
+            if re.search(rf"(?<![\w.+#]){re.escape(key)}(?![\w+#])", lowered) and display not in found:
+                found.append(display)
+        return found
+
+    def _split_heading(self, line: str) -> tuple[list[str], str]:
+        """Split an entry heading into its text parts and the duration"""
+        duration_match = DURATION_RE.search(line)
+        duration = duration_match.group(0).strip() if duration_match else ""
+        remainder = line.replace(duration, "") if duration else line
+        parts = [p.strip(" ,|–—-") for p in FIELD_SPLIT_RE.split(remainder)]
+        return [p for p in parts if p], duration
+
+    def _extract_experience(self, lines: list[str] | None, vocabulary: dict[str, str]) -> tuple[list, float]:
+        if not lines:
+            return [], 0.0
+
+        experience = []
+        complete = 0
+        for entry in self._entries(lines):
+            parts, duration = self._split_heading(" ".join(l for l in entry if not BULLET_RE.match(l)))
+            bullets = [self._strip_bullet(l) for l in entry if BULLET_RE.match(l)]
+            title = parts[0] if parts else ""
+            company = parts[1] if len(parts) > 1 else ""
+            experience.append({
+                "title": title,
+                "company": company,
+                "duration": duration,
+                "description": bullets,
+                "technologies": self._find_technologies(" ".join(bullets), vocabulary),
+            })
+            if title and company and duration and bullets:
+                complete += 1
+
+        if not experience:
+            return [], 0.0
+        return experience, complete / len(experience)
+
+    def _extract_projects(self, lines: list[str] | None, vocabulary: dict[str, str]) -> tuple[list, float]:
+        if not lines:
+            return [], 0.0
+
+        projects = []
+        complete = 0
+        for entry in self._entries(lines):
+            parts, _ = self._split_heading(entry[0])
+            name = parts[0] if parts else self._strip_bullet(entry[0])
+            description, technologies, metrics = [], [], []
+            github_url = None
+
+            for raw_line in entry[1:]:
+                line = self._strip_bullet(raw_line)
+                label, sep, value = line.partition(":")
+                if sep and label.strip().lower() in ("technologies", "tech stack", "stack", "built with"):
+                    technologies.extend(self._split_list(value))
+                    continue
+                url = GITHUB_RE.search(line)
+                if url:
+                    github_url = self._as_url(url.group(0))
+                    if label.strip().lower() == "github":
+                        continue
+                description.append(line)
+                if METRIC_RE.search(line):
+                    metrics.append(line)
+
+            if not technologies:
+                technologies = self._find_technologies(" ".join(description), vocabulary)
+
+            projects.append({
+                "name": name,
+                "description": " ".join(
+                    line if line.endswith((".", "!", "?")) else f"{line}." for line in description
+                ),
+                "technologies": technologies,
+                "github_url": github_url,
+                "impact_metrics": metrics,
+            })
+            if name and description:
+                complete += 1
+
+        if not projects:
+            return [], 0.0
+        return projects, complete / len(projects)
+
+    def _extract_education(self, lines: list[str] | None) -> tuple[list, float]:
+        if not lines:
+            return [], 0.0
+
+        education = []
+        complete = 0
+        for entry in self._entries(lines):
+            text = " | ".join(self._strip_bullet(l) for l in entry)
+            gpa_match = GPA_RE.search(text)
+            if gpa_match:
+                text = text.replace(gpa_match.group(0), "")
+            years = YEAR_RE.findall(text)
+            parts = [p.strip(" ,|–—-") for p in EDUCATION_SPLIT_RE.split(YEAR_RE.sub("", text))]
+            parts = [p for p in parts if p and not DURATION_RE.fullmatch(p)]
+
+            degree = next((p for p in parts if DEGREE_RE.search(p)), None)
+            institution = next((p for p in parts if INSTITUTION_RE.search(p) and p != degree), None)
+            if institution is None:
+                institution = next((p for p in parts if p != degree), None)
+
+            education.append({
+                "degree": degree,
+                "institution": institution,
+                "graduation_year": years[-1] if years else None,
+                "gpa": gpa_match.group(1).replace(" ", "") if gpa_match else None,
+            })
+            if degree and institution:
+                complete += 1
+
+        if not education:
+            return [], 0.0
+        return education, complete / len(education)
+
+
+# Global extractor instance
+rule_based_extractor = RuleBasedResumeExtractor()
@@ -1,9 +1,94 @@
-import json
+import logging
+from functools import lru_cache
 
 import pdfplumber
 from docx import Document
+from pydantic import BaseModel
+from pydantic import create_model
 
+from app.core.config import settings
+from app.core.llm import LLMPriority
+from app.core.llm import build_messages
 from app.core.llm import get_llm_response
+from app.core.llm import request_json
+from app.resume.extractor import RESUME_FIELDS
+from app.resume.extractor import rule_based_extractor
+from app.resume.schemas import Education
+from app.resume.schemas import Experience
+from app.resume.schemas import PersonalInfo
+from app.resume.schemas import Project
+from app.resume.schemas import Skills
+
+logger = logging.getLogger(__name__)
+
+# Pydantic type per top-level field, used to validate (partial) LLM output
+RESUME_FIELD_TYPES = {
+    "personal_info": PersonalInfo,
+    "experience": list[Experience],
+    "skills": Skills,
+    "projects": list[Project],
+    "education": list[Education],
+}
+
+
+@lru_cache(maxsize=None)
+def resume_output_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """Model requiring exactly ``fields``, so JSON repair and escalation see the resume schema"""
+    return create_model("ParsedResume", **{field: (RESUME_FIELD_TYPES[field], ...) for field in fields})
+
+
+# JSON schema snippets per top-level field, used to build (partial) LLM prompts
+RESUME_SCHEMA_SECTIONS = {
+    "personal_info": """"personal_info": {
+                "name": "Full Name",
+                "email": "email@example.com",
+                "phone": "phone number or null",
+                "location": "city, state or null",
+                "github": "github url or null",
+                "linkedin": "linkedin url or null"
+            }""",
+    "experience": """"experience": [
+                {
+                    "title": "Job Title",
+                    "company": "Company Name",
+                    "duration": "Start - End dates",
+                    "description": ["bullet point 1", "bullet point 2"],
+                    "technologies": ["tech1", "tech2"]
+                }
+            ]""",
+    "skills": """"skills": {
+                "technical": ["skill1", "skill2"],
+                "soft_skills": ["communication", "leadership", "problem-solving"],
+                "tools": ["tool1", "tool2"],
+                "languages": ["language1", "language2"]
+            }""",
+    "projects": """"projects": [
+                {
+                    "name": "Project Name",
+                    "description": "Project description",
+                    "technologies": ["tech1", "tech2"],
+                    "github_url": "url or null",
+                    "impact_metrics": ["metric1", "metric2"]
+                }
+            ]""",
+    "education": """"education": [
+                {
+                    "degree": "Degree Type",
+                    "institution": "School Name",
+                    "graduation_year": "Year",
+                    "gpa": "GPA or null"
+                }
+            ]""",
+}
+
+# Static system block: identical for every parse so the provider can cache it
+RESUME_PARSE_PROMPT = """Parse resumes into structured JSON format. Extract all information accurately.
+
+Return ONLY valid JSON in this exact structure, including only the top-level
+fields the user asks for:
+{
+            %s
+}""" % ",\n            ".join(RESUME_SCHEMA_SECTIONS[name] for name in RESUME_FIELDS)
 
 
 class ResumeParser:
@@ -24,9 +109,29 @@ class ResumeParser:
         else:
             raise ValueError("Unsupported file format")
 
-        # Stage 2: LLM processing to structured JSON
-        structured_data = await self._markdown_to_json(markdown_text, github_url)
+        # Stage 2: rule-based fast path, LLM only for low-confidence fields
+        if not settings.resume_fast_path_enabled:
+            return await self._markdown_to_json(markdown_text, github_url)
+
+        extraction = rule_based_extractor.extract(markdown_text, github_url)
+        llm_fields = extraction.low_confidence_fields(settings.resume_fast_path_min_confidence)
+
+        logger.info("resume.parse.fast_path", extra={
+            "confidence": extraction.confidence,
+            "llm_fields": llm_fields,
+        })
+
+        if not llm_fields:
+            return extraction.data
+
+        # Whole resume unreadable by rules: single full LLM parse as before
+        fields = None if len(llm_fields) == len(RESUME_FIELDS) else llm_fields
+        llm_data = await self._markdown_to_json(markdown_text, github_url, fields=fields)
 
+        structured_data = dict(extraction.data)
+        for field_name in llm_fields:
+            if field_name in llm_data:
+                structured_data[field_name] = llm_data[field_name]
         return structured_data
 
     def _parse_pdf(self, file_content: bytes) -> str:
@@ -71,77 +176,30 @@ class ResumeParser:
 
         return '\n'.join(markdown_lines)
 
-    async def _markdown_to_json(self, markdown_text: str, github_url: str | None = None) -> dict:
-        """Convert markdown resume to structured JSON using LLM"""
-
-        github_context = f"\nGitHub Profile: {github_url}" if github_url else ""
+    async def _markdown_to_json(
+        self, markdown_text: str, github_url: str | None = None, fields: list[str] | None = None
+    ) -> dict:
+        """Convert markdown resume to structured JSON using LLM
 
-        prompt = f"""
-        Parse this resume into structured JSON format. Extract all information accurately.
-        
-        Resume Text:
-        {markdown_text}
-        {github_context}
-        
-        Return ONLY valid JSON in this exact structure:
-        {{
-            "personal_info": {{
-                "name": "Full Name",
-                "email": "email@example.com",
-                "phone": "phone number or null",
-                "location": "city, state or null",
-                "github": "github url or null",
-                "linkedin": "linkedin url or null"
-            }},
-            "experience": [
-                {{
-                    "title": "Job Title",
-                    "company": "Company Name",
-                    "duration": "Start - End dates",
-                    "description": ["bullet point 1", "bullet point 2"],
-                    "technologies": ["tech1", "tech2"]
-                }}
-            ],
-            "skills": {{
-                "technical": ["skill1", "skill2"],
-                "soft_skills": ["communication", "leadership", "problem-solving"],
-                "tools": ["tool1", "tool2"],
-                "languages": ["language1", "language2"]
-            }},
-            "projects": [
-                {{
-                    "name": "Project Name",
-                    "description": "Project description",
-                    "technologies": ["tech1", "tech2"],
-                    "github_url": "url or null",
-                    "impact_metrics": ["metric1", "metric2"]
-                }}
-            ],
-            "education": [
-                {{
-                    "degree": "Degree Type",
-                    "institution": "School Name",
-                    "graduation_year": "Year",
-                    "gpa": "GPA or null"
-                }}
-            ]
-        }}
+        When ``fields`` is given, only those top-level sections are requested.
+        The schema lives in the static RESUME_PARSE_PROMPT system block.
         """
 
-        messages = [{"role": "user", "content": prompt}]
-        response = await get_llm_response(messages)
+        github_context = f"\nGitHub Profile: {github_url}" if github_url else ""
+        requested = ", ".join(fields or RESUME_FIELDS)
+
+        prompt = f"""Fields to return: {requested}
 
-        try:
-            # Clean response and parse JSON
-            json_str = response.strip()
-            if json_str.startswith('```json'):
-                json_str = json_str[7:-3]
-            elif json_str.startswith('```'):
-                json_str = json_str[3:-3]
+Resume Text:
+{markdown_text}
+{github_context}"""
 
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse LLM response as JSON: {e!s}")
+        messages = build_messages(RESUME_PARSE_PROMPT, prompt)
+        parsed = await request_json(
+            messages, resume_output_model(tuple(fields or RESUME_FIELDS)), call_site="resume.parse",
+            complete=get_llm_response, priority=LLMPriority.UPLOAD,
+        )
+        return parsed.model_dump()
 
 # Global parser instance
 resume_parser = ResumeParser()
@@ -8,6 +8,7 @@ from fastapi import UploadFile
 
 from app.core.config import settings
 from app.core.database import get_supabase_service_client
+from app.core.llm import LLMUnavailableError
 from app.resume.parser import resume_parser
 from app.resume.schemas import ResumeData
 from app.resume.schemas import ResumeUploadResponse
@@ -79,5 +80,7 @@ async def upload_resume(
             data=resume_data
         )
 
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse resume: {e!s}")
@@ -1,17 +1,55 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi import Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from fastapi.responses import PlainTextResponse
 
 from app.core.config import settings
+from app.core.llm import LLMUnavailableError
+from app.core.llm import get_circuit_breaker_stats
+from app.core.llm import get_json_parse_stats
+from app.core.llm import get_response_cache_stats
+from app.core.llm import get_route_stats
+from app.core.llm import get_scheduler_stats
+from app.core.llm import retry_after_seconds
+from app.core.skill_embeddings import get_skill_store
+from app.export.html_pdf import html_pdf_renderer
+from app.export.metrics import export_metrics
+from app.export.previews import template_previews
 from app.export.routes import router as export_router
+from app.export.workers import RenderPoolSaturatedError
+from app.export.workers import render_pool
 from app.github.routes import router as github_router
 from app.jobs.routes import router as jobs_router
 from app.optimization.routes import router as optimization_router
 from app.resume.routes import router as resume_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the skill embedding model, warm the export worker pools and template
+    previews; stop the pools on shutdown"""
+    if settings.semantic_matching_enabled:
+        # Model load (a download on first run) must not happen inside a request
+        await asyncio.to_thread(get_skill_store)
+    if settings.export_pdf_warm_on_startup:
+        html_pdf_renderer.start()
+        render_pool.start()
+    # Thumbnails render in the background so startup is not held up
+    previews = asyncio.create_task(template_previews.warm()) if settings.export_preview_warm_on_startup else None
+    yield
+    if previews:
+        previews.cancel()
+    html_pdf_renderer.shutdown()
+    render_pool.shutdown()
+
 app = FastAPI(
     title="Arete API",
     description="AI-powered resume optimizer for tech professionals",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -23,6 +61,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(LLMUnavailableError)
+async def llm_unavailable_handler(request: Request, exc: LLMUnavailableError) -> JSONResponse:
+    """Provider outages and rate limits fail fast as 503 with a retry hint"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(retry_after_seconds(exc))},
+    )
+
+@app.exception_handler(RenderPoolSaturatedError)
+async def render_pool_saturated_handler(request: Request, exc: RenderPoolSaturatedError) -> JSONResponse:
+    """Exports beyond the render queue depth are shed as 503 with a retry hint"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 # Include routers
 app.include_router(resume_router)
 app.include_router(jobs_router)
@@ -37,3 +93,28 @@ async def root() -> dict[str, str]:
 @app.get("/health")
 async def health_check() -> dict[str, str]:
     return {"status": "healthy", "app": settings.app_name}
+
+@app.get("/health/llm")
+async def llm_health() -> dict:
+    """LLM client counters: per-route cost, JSON parse failures, cache, queueing, breaker"""
+    return {
+        "routes": get_route_stats(),
+        "json_parsing": get_json_parse_stats(),
+        "response_cache": get_response_cache_stats(),
+        "scheduler": get_scheduler_stats(),
+        "circuit_breaker": get_circuit_breaker_stats(),
+    }
+
+@app.get("/health/export")
+async def export_health() -> dict:
+    """Export render pool occupancy, requests shed while saturated, and stage timings"""
+    return {
+        "render_pool": render_pool.stats(),
+        "html_pdf": html_pdf_renderer.stats(),
+        "metrics": export_metrics.snapshot(),
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Export metrics in the Prometheus text format, for scraping"""
+    return PlainTextResponse(export_metrics.render(), media_type="text/plain; version=0.0.4")
@@ -44,6 +44,9 @@ class TestJobsIntegration:
         assert "Python" in data["required_skills"]
         assert "id" in data
 
+        stored = mock_supabase.return_value.table.return_value.insert.call_args.args[0]
+        assert stored["keywords"]["all"] == ["fastapi", "postgresql", "python"]
+
     @patch.object(job_analysis_service, 'scrape_job_url')
     @patch.object(job_analysis_service, 'analyze_job_description')
     @patch('app.jobs.routes.get_supabase_service_client')
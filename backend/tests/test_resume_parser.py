@@ -3,6 +3,8 @@ Test suite for resume parsing functionality
 Following pytest standards from .kiro/reference/pytest-standard.md
 """
 
+import json
+from pathlib import Path
 from unittest.mock import Mock
 from unittest.mock import patch
 
@@ -11,6 +13,18 @@ import pytest
 from app.resume.parser import ResumeParser
 from app.resume.schemas import ResumeData
 
+FULL_RESUME = {
+    "personal_info": {"name": "John Doe", "email": "john@example.com"},
+    "experience": [],
+    "skills": {"technical": ["Python"], "soft_skills": [], "tools": [], "languages": []},
+    "projects": [],
+    "education": [],
+}
+
+SAMPLE_RESUME_PATH = (
+    Path(__file__).resolve().parents[2] / "scripts" / "testing" / "fixtures" / "test_sample_resume.txt"
+)
+
 
 class TestResumeParser:
     """Test cases for ResumeParser class"""
@@ -82,8 +96,8 @@ class TestResumeParser:
                 "experience": [],
                 "skills": {
                     "technical": ["Python", "FastAPI"],
-                    "frameworks": ["React"],
-                    "tools": [],
+                    "soft_skills": [],
+                    "tools": ["React"],
                     "languages": []
                 },
                 "projects": [],
@@ -124,6 +138,82 @@ class TestResumeParser:
             mock_parse_pdf.assert_called_once_with(mock_content)
             mock_to_json.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_parse_file_fast_path_skips_llm(self):
+        """Well-structured resumes are parsed without an LLM call"""
+        content = SAMPLE_RESUME_PATH.read_bytes()
+
+        with patch.object(self.parser, '_markdown_to_json') as mock_to_json:
+            result = await self.parser.parse_file(content, "resume.txt")
+
+            mock_to_json.assert_not_called()
+            assert result["personal_info"]["email"] == "john.doe@email.com"
+            assert len(result["experience"]) == 2
+            ResumeData(id="test", **result)
+
+    @pytest.mark.asyncio
+    async def test_parse_file_llm_only_for_low_confidence_fields(self):
+        """Only sections the rules could not read are requested from the LLM"""
+        content = (
+            b"John Doe\njohn@example.com\n\nSKILLS\nPython, Go\n\n"
+            b"EXPERIENCE\nI have worked at several companies building things.\n"
+        )
+
+        with patch.object(self.parser, '_markdown_to_json') as mock_to_json:
+            mock_to_json.return_value = {
+                "experience": [{"title": "Engineer", "company": "Acme", "duration": "2020",
+                                "description": [], "technologies": []}],
+                "projects": [],
+                "education": [],
+            }
+
+            result = await self.parser.parse_file(content, "resume.txt")
+
+            fields = mock_to_json.call_args.kwargs["fields"]
+            assert fields == ["experience", "projects", "education"]
+            assert result["skills"]["technical"] == ["Python", "Go"]
+            assert result["experience"][0]["company"] == "Acme"
+
+    @pytest.mark.asyncio
+    async def test_markdown_to_json_partial_schema(self):
+        """Requesting a subset of fields names only those in the user block"""
+        with patch('app.resume.parser.get_llm_response') as mock_llm:
+            mock_llm.return_value = '{"education": []}'
+
+            result = await self.parser._markdown_to_json("text", fields=["education"])
+
+            system, user = mock_llm.call_args[0][0]
+            assert user["content"].startswith("Fields to return: education\n")
+            assert "experience" not in user["content"]
+            assert result == {"education": []}
+
+    @pytest.mark.asyncio
+    async def test_markdown_to_json_static_system_block(self):
+        """The schema prompt is a cacheable system block shared by every parse"""
+        with patch('app.resume.parser.get_llm_response') as mock_llm:
+            mock_llm.return_value = json.dumps(FULL_RESUME)
+            await self.parser._markdown_to_json("resume one", fields=["education"])
+            await self.parser._markdown_to_json("resume two")
+
+            first, second = (call[0][0][0] for call in mock_llm.call_args_list)
+            assert first == second
+            assert first["role"] == "system"
+            assert first["content"][0]["cache_control"] == {"type": "ephemeral"}
+            assert '"experience"' in first["content"][0]["text"]
+
+    @pytest.mark.asyncio
+    async def test_markdown_to_json_retries_schema_invalid_reply(self):
+        """A reply missing resume fields is retried instead of passed through"""
+        incomplete = {**FULL_RESUME, "personal_info": {"name": "John Doe"}, "skills": ["Python"]}
+        with patch('app.resume.parser.get_llm_response') as mock_llm:
+            mock_llm.side_effect = [json.dumps(incomplete), json.dumps(FULL_RESUME)]
+
+            result = await self.parser._markdown_to_json("resume")
+
+            assert mock_llm.call_count == 2
+            assert result["personal_info"]["email"] == "john@example.com"
+            assert result["skills"]["technical"] == ["Python"]
+
     def test_unsupported_file_format(self):
         """Test handling of unsupported file formats"""
         mock_content = b"content"
@@ -0,0 +1,167 @@
+"""
+Unit tests for bulk export: one query, one categorization per resume and a
+ZIP streamed entry by entry
+"""
+import asyncio
+import io
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, Mock, AsyncMock
+import pytest
+from fastapi.testclient import TestClient
+
+from app.export.classic_pdf import write_classic_pdf
+from app.export.service import ExportService
+from app.export.workers import render_pool
+from app.export.zip_stream import ZipStream
+from main import app
+
+CATEGORIZED = {"Technical Skills": ["Python"]}
+
+
+def _record(resume_id, name):
+    return {
+        "id": resume_id,
+        "parsed_data": {
+            "personal_info": {"name": name, "email": f"{resume_id}@example.com"},
+            "experience": [],
+            "skills": {"technical_skills": ["Python"]},
+            "projects": [],
+            "education": [],
+        },
+        "optimized_data": None,
+    }
+
+
+def _supabase(records):
+    supabase = Mock()
+    supabase.table.return_value.select.return_value.in_.return_value.execute.return_value.data = records
+    return supabase
+
+
+async def _collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+class TestZipStream:
+    """Test the incrementally written archive"""
+
+    def test_entries_stream_as_added(self):
+        stream = ZipStream()
+        chunks = [stream.add(f"doc-{i}.pdf", b"%PDF-" + bytes(1000)) for i in range(3)]
+        chunks.append(stream.close())
+
+        # Each chunk holds one entry (header, data, descriptor), never the archive so far
+        assert all(1000 < len(chunk) < 1200 for chunk in chunks[:3])
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        assert archive.namelist() == ["doc-0.pdf", "doc-1.pdf", "doc-2.pdf"]
+        assert archive.read("doc-1.pdf") == b"%PDF-" + bytes(1000)
+
+
+class TestBulkExportService:
+    """Test fetching, categorization and rendering of a bulk export"""
+
+    def setup_method(self):
+        self.service = ExportService()
+
+    @pytest.mark.asyncio
+    async def test_bulk_export_archive(self):
+        supabase = _supabase([_record("r2", "John Roe"), _record("r1", "Jane Doe")])
+        with patch("app.export.service.get_supabase_service_client", return_value=supabase), \
+             patch.object(render_pool, "_executor", return_value=ThreadPoolExecutor(2)), \
+             patch("app.export.service.html_pdf_renderer.render", new_callable=AsyncMock, return_value=b"%PDF-modern"), \
+             patch.object(self.service, "_deduplicate_and_categorize_skills",
+                          new_callable=AsyncMock, return_value=CATEGORIZED) as categorize:
+            stream = await self.service.start_bulk_export(
+                ["r1", "r2", "r1"], ["pdf", "docx"], ["classic", "modern"]
+            )
+            data = await _collect(stream)
+
+        supabase.table.return_value.select.return_value.in_.assert_called_once_with("id", ["r1", "r2"])
+        assert categorize.await_count == 2
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        assert archive.namelist() == [
+            "r1/classic/Jane_Doe_resume.pdf",
+            "r1/modern/Jane_Doe_resume_modern.pdf",
+            "r1/Jane_Doe_resume.docx",
+            "r2/classic/John_Roe_resume.pdf",
+            "r2/modern/John_Roe_resume_modern.pdf",
+            "r2/John_Roe_resume.docx",
+        ]
+        assert archive.read("r1/classic/Jane_Doe_resume.pdf").startswith(b"%PDF")
+        assert archive.read("r2/modern/John_Roe_resume_modern.pdf") == b"%PDF-modern"
+
+    @pytest.mark.asyncio
+    async def test_disconnect_mid_archive_leaves_no_temp_files(self, tmp_path):
+        in_worker, released = threading.Event(), threading.Event()
+        calls = []
+
+        def write_blocked(out, *markup):
+            # The first document renders; the rest are still in a worker when the client leaves
+            calls.append(1)
+            if len(calls) > 1:
+                in_worker.set()
+                released.wait(5)
+            write_classic_pdf(out, *markup)
+
+        executor = ThreadPoolExecutor(2)
+        records = [_record(f"r{i}", f"Person {i}") for i in range(4)]
+        with patch("app.export.service.get_supabase_service_client", return_value=_supabase(records)), \
+             patch("app.export.service.settings.export_spool_dir", str(tmp_path)), \
+             patch("app.export.service.write_classic_pdf", write_blocked), \
+             patch.object(render_pool, "workers", 2), \
+             patch.object(render_pool, "_executor", return_value=executor), \
+             patch.object(self.service, "_deduplicate_and_categorize_skills",
+                          new_callable=AsyncMock, return_value=CATEGORIZED):
+            stream = await self.service.start_bulk_export([r["id"] for r in records], ["pdf"], ["classic"])
+            assert await stream.__anext__()
+            await asyncio.to_thread(in_worker.wait, 5)
+            await stream.aclose()
+
+            released.set()
+            await asyncio.to_thread(executor.shutdown)
+            while render_pool.pending:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0)
+
+        assert len(calls) == 2
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_missing_resume_fails_before_streaming(self):
+        supabase = _supabase([_record("r1", "Jane Doe")])
+        with patch("app.export.service.get_supabase_service_client", return_value=supabase):
+            with pytest.raises(ValueError, match="r2"):
+                await self.service.start_bulk_export(["r1", "r2"], ["pdf"], ["classic"])
+
+
+class TestBulkExportRoute:
+    """Test the /export/bulk endpoint"""
+
+    def setup_method(self):
+        self.client = TestClient(app)
+
+    def test_streams_zip(self):
+        async def archive():
+            yield b"PK-zip"
+
+        with patch("app.export.routes.export_service.start_bulk_export",
+                   new_callable=AsyncMock, return_value=archive()) as mock_start:
+            response = self.client.post("/export/bulk", json={"resume_ids": ["r1", "r2"], "formats": ["pdf", "docx"]})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        assert response.content == b"PK-zip"
+        mock_start.assert_awaited_once_with(["r1", "r2"], ["pdf", "docx"], ["classic"])
+
+    def test_missing_resume_returns_404(self):
+        with patch("app.export.routes.export_service.start_bulk_export",
+                   new_callable=AsyncMock, side_effect=ValueError("Resumes not found: r2")):
+            response = self.client.post("/export/bulk", json={"resume_ids": ["r1", "r2"]})
+
+        assert response.status_code == 404
+
+    def test_rejects_empty_batch(self):
+        response = self.client.post("/export/bulk", json={"resume_ids": []})
+        assert response.status_code == 422
@@ -0,0 +1,52 @@
+"""
+Unit tests for the classic ReportLab PDF renderer and its worker pool
+"""
+from unittest.mock import patch
+import pytest
+
+from app.export import classic_pdf
+from app.export.classic_pdf import classic_styles, render_classic_pdf
+from app.export.workers import RenderPool
+
+
+def _resume(name):
+    return {
+        "personal_info": {"name": name, "email": "jane@example.com"},
+        "experience": [{"title": "Engineer", "company": "Acme", "duration": "2020-2024", "description": ["Built APIs"]}],
+        "skills": {"technical_skills": ["Python"]},
+        "projects": [{"name": "Arete", "description": "Resume tool", "technologies": ["FastAPI"]}],
+        "education": [{"degree": "BSc", "institution": "State University", "graduation_year": "2019"}],
+    }
+
+
+class TestClassicPDF:
+    """Test style caching and document rendering"""
+
+    def test_styles_built_once(self):
+        assert classic_styles() is classic_styles()
+
+    def test_render_classic_pdf(self):
+        resume = _resume("Jane Doe")
+        pdf = render_classic_pdf(resume, {"Technical Skills": ["Python"]}, resume["projects"])
+        assert pdf.startswith(b"%PDF")
+
+    def test_exports_share_one_style_sheet(self):
+        classic_styles.cache_clear()
+        with patch.object(classic_pdf, "getSampleStyleSheet", wraps=classic_pdf.getSampleStyleSheet) as sheet:
+            pdfs = [render_classic_pdf(_resume(f"User {i}"), {}, []) for i in range(3)]
+        assert all(pdf.startswith(b"%PDF") for pdf in pdfs)
+        assert sheet.call_count == 1
+
+
+class TestRenderPool:
+    """Test the export worker processes"""
+
+    @pytest.mark.asyncio
+    async def test_run_in_worker_process(self):
+        pool = RenderPool(workers=1, queue_depth=0, retry_after=1)
+        try:
+            pdf = await pool.run(render_classic_pdf, _resume("Jane Doe"), {}, [])
+        finally:
+            pool.shutdown()
+        assert pdf.startswith(b"%PDF")
+
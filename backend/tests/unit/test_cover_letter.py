@@ -5,6 +5,7 @@ import json
 from unittest.mock import patch, Mock, AsyncMock
 import pytest
 
+from app.optimization.incremental import content_hash
 from app.optimization.service import OptimizationService
 
 
@@ -241,4 +242,54 @@ Mike Chen"""
             assert "Python" in result
             assert "Django" in result
             assert "PostgreSQL" in result
-            assert result.count("Python") >= 2  # Should mention Python multiple times
\ No newline at end of file
+            assert result.count("Python") >= 2  # Should mention Python multiple times
+
+class TestCoverLetterCache:
+    """Test cover letters are stored and reused per resume/job content"""
+
+    RESUME = {"personal_info": {"name": "Test User"}, "experience": [], "skills": {"technical": ["Go"]}}
+    JOB = {"title": "Developer", "company": "Test Co", "required_skills": [], "technologies": []}
+
+    def setup_method(self):
+        self.service = OptimizationService()
+
+    @pytest.mark.asyncio
+    async def test_streams_and_stores_letter(self):
+        """Test chunks are yielded as they arrive and the letter is saved with its hash"""
+        async def mock_stream_generator():
+            yield "Dear Hiring Manager,"
+            yield "\n\nThanks.  "
+
+        with patch.object(self.service, "get_cached_cover_letter", new_callable=AsyncMock, return_value=None), \
+             patch.object(self.service, "save_cover_letter", new_callable=AsyncMock) as mock_save, \
+             patch('app.optimization.service.stream_llm_response', return_value=mock_stream_generator()):
+            chunks = [c async for c in self.service.stream_cover_letter(self.RESUME, self.JOB, "r-1", "j-1")]
+
+        assert chunks == ["Dear Hiring Manager,", "\n\nThanks.  "]
+        resume_id, job_id, input_hash, letter = mock_save.await_args.args
+        assert (resume_id, job_id, letter) == ("r-1", "j-1", "Dear Hiring Manager,\n\nThanks.")
+        assert input_hash == content_hash({"resume": self.RESUME, "job": self.JOB})
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_llm(self):
+        """Test a stored letter for the same content is served without an LLM call"""
+        with patch.object(self.service, "get_cached_cover_letter", new_callable=AsyncMock,
+                          return_value="Stored letter") as mock_cached, \
+             patch('app.optimization.service.stream_llm_response') as mock_stream:
+            result = await self.service.generate_cover_letter(self.RESUME, self.JOB, "r-1", "j-1")
+
+        assert result == "Stored letter"
+        mock_stream.assert_not_called()
+        assert mock_cached.await_args.args[2] == content_hash({"resume": self.RESUME, "job": self.JOB})
+
+    @pytest.mark.asyncio
+    async def test_changed_content_misses_cache(self, mock_supabase):
+        """Test a stored letter generated from other content is not reused"""
+        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = Mock(
+            data=[{"cover_letter": "Old letter", "cover_letter_hash": "stale"}]
+        )
+
+        with patch('app.optimization.service.get_supabase_service_client', return_value=mock_supabase):
+            cached = await self.service.get_cached_cover_letter("r-1", "j-1", "fresh")
+
+        assert cached is None
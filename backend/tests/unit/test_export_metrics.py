@@ -0,0 +1,140 @@
+"""
+Unit tests for export timing spans, Prometheus metrics and Server-Timing
+"""
+from unittest.mock import patch, AsyncMock, Mock
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.export import metrics as metrics_module
+from app.export.metrics import ExportMetrics, export_trace, span
+from app.export.output import ExportFile
+from app.export.service import ExportService
+from main import app
+
+client = TestClient(app)
+
+RESUME = {
+    "personal_info": {"name": "Jane Doe", "email": "jane@example.com"},
+    "experience": [],
+    "skills": {"technical": ["Python", "Obscure Framework"]},
+    "projects": [],
+    "education": [],
+}
+
+
+@pytest.fixture
+def fresh_metrics():
+    """Route every span and counter to a fresh ExportMetrics"""
+    fresh = ExportMetrics()
+    with patch.object(metrics_module, "export_metrics", fresh), \
+            patch("app.export.service.export_metrics", fresh), \
+            patch("main.export_metrics", fresh):
+        yield fresh
+
+
+def _supabase(record):
+    client = Mock()
+    client.table.return_value.select.return_value.eq.return_value.execute.return_value = Mock(data=[record])
+    return client
+
+
+class TestSpans:
+    """Test spans feed both the histograms and the request trace"""
+
+    def test_span_records_histogram_and_trace(self, fresh_metrics):
+        with export_trace() as trace:
+            with span("fetch"):
+                pass
+            with span("render_classic"):
+                pass
+            with span("fetch"):
+                pass
+        with span("fetch"):
+            pass
+
+        assert fresh_metrics.stages["fetch"].count == 3
+        assert [stage for stage, _ in trace.spans] == ["fetch", "render_classic", "fetch"]
+        # Repeated stages are summed into one Server-Timing entry
+        assert [entry.split(";")[0] for entry in trace.server_timing().split(", ")] == ["fetch", "render_classic"]
+        assert all(";dur=" in entry for entry in trace.server_timing().split(", "))
+
+    def test_prometheus_text_format(self, fresh_metrics):
+        fresh_metrics.observe_stage("fetch", 0.02)
+        fresh_metrics.observe_output("pdf", 60_000)
+        fresh_metrics.record_export("pdf", "classic", "ok")
+        fresh_metrics.record_fallback("skill_categorization")
+
+        text = fresh_metrics.render()
+
+        assert '# TYPE arete_export_stage_duration_seconds histogram' in text
+        assert 'arete_export_stage_duration_seconds_bucket{stage="fetch",le="0.01"} 0' in text
+        assert 'arete_export_stage_duration_seconds_bucket{stage="fetch",le="0.025"} 1' in text
+        assert 'arete_export_stage_duration_seconds_bucket{stage="fetch",le="+Inf"} 1' in text
+        assert 'arete_export_output_bytes_bucket{format="pdf",le="100000"} 1' in text
+        assert 'arete_export_output_bytes_sum{format="pdf"} 60000' in text
+        assert 'arete_export_requests_total{format="pdf",template="classic",outcome="ok"} 1' in text
+        assert 'arete_export_fallbacks_total{kind="skill_categorization"} 1' in text
+        assert "arete_export_render_pool_capacity " in text
+
+
+class TestServiceInstrumentation:
+    """Test export stages, sizes and fallbacks are recorded"""
+
+    @pytest.mark.asyncio
+    async def test_export_records_stages_size_and_llm_fallback(self, fresh_metrics):
+        service = ExportService()
+        record = {"parsed_data": RESUME, "optimized_data": None}
+        with patch("app.export.service.get_supabase_service_client", return_value=_supabase(record)), \
+                patch("app.export.service.request_json", new_callable=AsyncMock, side_effect=RuntimeError("down")), \
+                patch("app.export.service.render_pool.run", new_callable=AsyncMock, return_value=(None, 1234)):
+            with export_trace() as trace:
+                export = await service.export_file("resume-1", "pdf", "classic")
+
+        assert export.size == 1234
+        assert {"total", "fetch", "prepare", "categorize", "render_classic"} <= fresh_metrics.stages.keys()
+        assert {stage for stage, _ in trace.spans} >= {"fetch", "categorize", "render_classic", "total"}
+        assert fresh_metrics.output_bytes["pdf"].total == 1234
+        assert fresh_metrics.exports[("pdf", "classic", "ok")] == 1
+        assert fresh_metrics.fallbacks["skill_categorization"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_export_counted_as_error(self, fresh_metrics):
+        service = ExportService()
+        client = Mock()
+        client.table.return_value.select.return_value.eq.return_value.execute.return_value = Mock(data=[])
+        with patch("app.export.service.get_supabase_service_client", return_value=client):
+            with pytest.raises(ValueError):
+                await service.export_file("missing", "docx")
+
+        assert fresh_metrics.exports[("docx", "classic", "error")] == 1
+
+
+class TestMetricsRoutes:
+    """Test the /metrics endpoint and the optional Server-Timing header"""
+
+    def test_metrics_endpoint(self, fresh_metrics):
+        fresh_metrics.record_export("docx", "classic", "ok")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'arete_export_requests_total{format="docx",template="classic",outcome="ok"} 1' in response.text
+
+    @pytest.mark.parametrize("enabled", [True, False])
+    def test_server_timing_header(self, fresh_metrics, enabled):
+        async def fake_export(*args):
+            with span("fetch"):
+                pass
+            return ExportFile.from_bytes(b"%PDF-1.4", "application/pdf", "resume.pdf")
+
+        with patch("app.export.service.export_service.export_file", side_effect=fake_export), \
+                patch.object(settings, "export_server_timing", enabled):
+            response = client.post("/export/pdf", json={"resume_id": "resume-1", "template": "classic"})
+
+        assert response.status_code == 200
+        if enabled:
+            assert response.headers["server-timing"].startswith("fetch;dur=")
+        else:
+            assert "server-timing" not in response.headers
@@ -0,0 +1,97 @@
+"""
+Unit tests for spooled export files and streamed downloads
+"""
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, Mock, AsyncMock
+import pytest
+
+from app.export.classic_pdf import write_classic_pdf
+from app.export.output import CHUNK_SIZE, ExportFile, write_to_spool
+from app.export.service import ExportService
+from app.export.workers import render_pool
+from app.export.zip_stream import ZipStream
+
+RESUME = {
+    "personal_info": {"name": "Jane Doe", "email": "jane@example.com"},
+    "experience": [
+        {"title": f"Engineer {i}", "company": "Acme", "duration": "2020", "description": ["Built APIs"] * 20}
+        for i in range(30)
+    ],
+    "skills": {},
+    "projects": [],
+    "education": [],
+}
+
+
+def _write_failing(out):
+    out.write(b"partial")
+    raise RuntimeError("render failed")
+
+
+class TestSpool:
+    """Test documents written to temp files by the render workers"""
+
+    def test_write_to_spool(self, tmp_path):
+        path, size = write_to_spool(write_classic_pdf, str(tmp_path), RESUME, {}, [])
+        assert os.path.getsize(path) == size
+        assert open(path, "rb").read(4) == b"%PDF"
+
+    def test_failed_render_leaves_no_file(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            write_to_spool(_write_failing, str(tmp_path))
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestExportFile:
+    """Test streaming a rendered export"""
+
+    def test_spooled_chunks_delete_file(self, tmp_path):
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(b"x" * (CHUNK_SIZE * 2 + 10))
+        export = ExportFile("application/pdf", "doc.pdf", path.stat().st_size, path=str(path))
+
+        chunks = list(export.chunks())
+        assert [len(chunk) for chunk in chunks] == [CHUNK_SIZE, CHUNK_SIZE, 10]
+        assert not path.exists()
+        export.discard()  # already gone; no error
+
+    def test_in_memory_chunks_are_views(self):
+        content = b"y" * (CHUNK_SIZE + 1)
+        chunks = list(ExportFile.from_bytes(content, "application/pdf", "doc.pdf").chunks())
+        assert all(isinstance(chunk, memoryview) for chunk in chunks)
+        assert b"".join(chunks) == content
+
+    def test_zip_entry_from_chunks(self):
+        stream = ZipStream()
+        content = b"z" * (CHUNK_SIZE * 3)
+        export = ExportFile.from_bytes(content, "application/pdf", "doc.pdf")
+        pieces = list(stream.add_chunks("doc.pdf", export.chunks()))
+        pieces.append(stream.close())
+
+        # No piece holds more than one chunk of the document
+        assert max(len(piece) for piece in pieces) < CHUNK_SIZE + 200
+        assert zipfile.ZipFile(io.BytesIO(b"".join(pieces))).read("doc.pdf") == content
+
+
+class TestExportFileService:
+    """Test the streamed export path end to end (renders in a thread here)"""
+
+    @pytest.mark.asyncio
+    async def test_export_file_is_spooled(self, tmp_path):
+        service = ExportService()
+        supabase = Mock()
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [{"parsed_data": RESUME}]
+        with patch("app.export.service.get_supabase_service_client", return_value=supabase), \
+             patch("app.export.service.settings.export_spool_dir", str(tmp_path)), \
+             patch.object(render_pool, "_executor", return_value=ThreadPoolExecutor(1)):
+            export = await service.export_file("resume-1", "docx")
+
+        assert export.content is None
+        assert export.filename == "Jane_Doe_resume.docx"
+        assert os.path.getsize(export.path) == export.size
+        data = b"".join(export.chunks())
+        assert len(data) == export.size
+        assert list(tmp_path.iterdir()) == []
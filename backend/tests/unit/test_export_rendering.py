@@ -0,0 +1,63 @@
+"""
+Unit tests for the export HTML builders
+"""
+from unittest.mock import AsyncMock, patch
+import pytest
+
+from app.export.rendering import display_url, minify_css, template_css
+from app.export.service import ExportService
+
+HOSTILE = {
+    "personal_info": {"name": "Ann <script>alert(1)</script>", "email": "ann@example.com", "location": "R&D Lab"},
+    "summary": "Likes <b>bold</b> claims",
+    "experience": [{"title": "Eng", "company": "A&B", "duration": "2020", "description": ["Cut cost <50%"]}],
+    "skills": {"technical": ["C++", "<Go>"]},
+    "projects": [{"name": "P", "description": "x", "link": "https://example.com/?a=1&b=2"}],
+    "education": [{"degree": "BS", "institution": "MIT"}],
+}
+
+
+class TestTemplates:
+    """Test CSS handling and escaping"""
+
+    def setup_method(self):
+        self.service = ExportService()
+
+    def test_css_read_and_minified_once(self):
+        template_css.cache_clear()
+        first = template_css("modern")
+
+        assert template_css("modern") is first
+        assert template_css.cache_info().misses == 1
+        assert "/*" not in first
+        assert 'content:"\\2022"' in first
+
+    def test_minify_css_keeps_strings(self):
+        css = '/* note */\n.a  >  b {\n  content: " | ";\n  margin: 0 auto;\n}\n'
+
+        assert minify_css(css) == '.a>b{content:" | ";margin:0 auto}'
+
+    def test_display_url(self):
+        assert display_url("https://github.com/ann") == "github.com/ann"
+
+    @pytest.mark.parametrize("builder", ["_build_html", "_build_printable_html", "_build_simple_html"])
+    def test_builders_escape_resume_text(self, builder):
+        html = getattr(self.service, builder)(HOSTILE)
+
+        assert "<script>" not in html
+        assert "Ann &lt;script&gt;" in html
+        assert "Cut cost &lt;50%" in html
+        assert "A&amp;B" in html
+        assert "R&amp;D Lab" in html
+
+    @pytest.mark.asyncio
+    async def test_modern_escapes_and_inlines_css(self):
+        with patch.object(self.service, "_deduplicate_and_categorize_skills", new_callable=AsyncMock,
+                          return_value={"Technical Skills": ["<Go>", "C++"]}):
+            html = await self.service._build_modern_html(HOSTILE)
+
+        assert "<script>" not in html
+        assert "Likes &lt;b&gt;bold&lt;/b&gt; claims" in html
+        assert "&lt;Go&gt;, C++" in html
+        assert 'href="https://example.com/?a=1&amp;b=2"' in html
+        assert str(template_css("modern")) in html
@@ -51,6 +51,17 @@ class TestExportService:
             assert "Tools" in result
             assert "CustomTool" in result["Tools"]
 
+    @pytest.mark.asyncio
+    async def test_llm_categorize_skills_static_rules_block(self):
+        """Test categorization rules are sent as a cacheable system block"""
+        with patch('app.export.service.get_llm_response', return_value='{"Tools": ["X"]}') as mock_llm:
+            await self.service._llm_categorize_skills(["X"])
+
+        system, user = mock_llm.call_args[0][0]
+        assert system["content"][0]["text"] == self.service.CATEGORIZATION_PROMPT
+        assert "cache_control" in system["content"][0]
+        assert user["content"] == 'Skills to categorize:\n["X"]'
+
     @pytest.mark.asyncio
     async def test_llm_categorize_skills_parse_error(self):
         """Test LLM categorization with parse error"""
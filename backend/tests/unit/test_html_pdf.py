@@ -0,0 +1,128 @@
+"""
+Unit tests for the WeasyPrint worker pool and the modern PDF export path
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch, AsyncMock
+import pytest
+
+from app.export import html_pdf
+from app.export.html_pdf import HTMLPDFRenderer
+from app.export.service import ExportService
+from app.export.workers import RenderPoolSaturatedError
+
+
+def _slow_render(html):
+    time.sleep(0.5)
+    return b"%PDF-late"
+
+
+class TestHTMLPDFRenderer:
+    """Test deadline and pool recovery behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_render_runs_in_executor(self):
+        renderer = HTMLPDFRenderer(workers=1, timeout=5)
+        with patch.object(renderer, "_executor", return_value=ThreadPoolExecutor(1)), \
+             patch.object(html_pdf, "render_pdf", lambda html: b"%PDF-" + html.encode()):
+            assert await renderer.render("<p>x</p>") == b"%PDF-<p>x</p>"
+
+    @pytest.mark.asyncio
+    async def test_render_deadline(self):
+        renderer = HTMLPDFRenderer(workers=1, timeout=0.05)
+        with patch.object(renderer, "_executor", return_value=ThreadPoolExecutor(1)), \
+             patch.object(html_pdf, "render_pdf", _slow_render):
+            with pytest.raises(TimeoutError):
+                await renderer.render("<p>x</p>")
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_cools_down(self):
+        """Test a pool that cannot start WeasyPrint is not respawned on every export"""
+        renderer = HTMLPDFRenderer(workers=1, timeout=5)
+
+        def broken(html):
+            raise BrokenProcessPool("initializer failed")
+
+        with patch.object(renderer, "_executor", return_value=ThreadPoolExecutor(1)) as mock_executor, \
+             patch.object(html_pdf, "render_pdf", broken):
+            with pytest.raises(BrokenProcessPool):
+                await renderer.render("<p>x</p>")
+            with pytest.raises(RuntimeError, match="unavailable"):
+                await renderer.render("<p>x</p>")
+
+        assert mock_executor.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_recycles_workers(self):
+        """Test a missed deadline kills the pool instead of leaving the render running"""
+        renderer = HTMLPDFRenderer(workers=1, timeout=0.05)
+        renderer._pool = pool = ThreadPoolExecutor(1)
+        with patch.object(html_pdf, "render_pdf", _slow_render):
+            with pytest.raises(TimeoutError):
+                await renderer.render("<p>x</p>")
+
+        assert renderer._pool is None
+        assert pool._shutdown
+        assert renderer.recycled == 1
+        assert renderer.pending == 0
+        # Recycling is not a broken pool: no cooldown
+        assert renderer._unavailable_until == 0.0
+
+    @pytest.mark.asyncio
+    async def test_saturated_renderer_sheds_load(self):
+        """Test renders beyond workers + queue depth are rejected immediately"""
+        renderer = HTMLPDFRenderer(workers=1, timeout=5, queue_depth=1, retry_after=3)
+        with patch.object(renderer, "_executor", return_value=ThreadPoolExecutor(1)), \
+             patch.object(html_pdf, "render_pdf", _slow_render):
+            running = [asyncio.ensure_future(renderer.render("<p>x</p>")) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(RenderPoolSaturatedError) as exc_info:
+                await renderer.render("<p>x</p>")
+            await asyncio.gather(*running)
+
+        assert exc_info.value.retry_after == 3
+        assert renderer.stats()["rejected"] == 1
+
+
+class TestModernPDFExport:
+    """Test the modern template returns real PDF bytes"""
+
+    def setup_method(self):
+        self.service = ExportService()
+
+    @pytest.mark.asyncio
+    async def test_modern_template_renders_pdf(self, sample_resume_data):
+        with patch("app.export.service.html_pdf_renderer.render", new_callable=AsyncMock,
+                   return_value=b"%PDF-modern") as mock_render, \
+             patch.object(self.service, "_deduplicate_and_categorize_skills", new_callable=AsyncMock,
+                          return_value={"Technical Skills": ["Python"]}):
+            content, content_type, filename = await self.service._generate_pdf(sample_resume_data, "resume-1", "modern")
+
+        assert content == b"%PDF-modern"
+        assert content_type == "application/pdf"
+        assert filename == "John_Doe_resume_modern.pdf"
+        assert "resume-container" in mock_render.await_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_render_failure_falls_back_to_classic(self, sample_resume_data):
+        with patch("app.export.service.html_pdf_renderer.render", new_callable=AsyncMock,
+                   side_effect=TimeoutError()), \
+             patch.object(self.service, "_deduplicate_and_categorize_skills", new_callable=AsyncMock,
+                          return_value={"Technical Skills": ["Python"]}):
+            content, content_type, filename = await self.service._generate_pdf(sample_resume_data, "resume-1", "modern")
+
+        assert content.startswith(b"%PDF")
+        assert content_type == "application/pdf"
+        assert filename == "John_Doe_resume.pdf"
+
+    @pytest.mark.asyncio
+    async def test_saturated_renderer_is_not_a_fallback(self, sample_resume_data):
+        """Test a full WeasyPrint pool returns 503 instead of piling onto ReportLab"""
+        with patch("app.export.service.html_pdf_renderer.render", new_callable=AsyncMock,
+                   side_effect=RenderPoolSaturatedError("busy", 2)), \
+             patch.object(self.service, "_deduplicate_and_categorize_skills", new_callable=AsyncMock,
+                          return_value={"Technical Skills": ["Python"]}):
+            with pytest.raises(RenderPoolSaturatedError):
+                await self.service._generate_pdf(sample_resume_data, "resume-1", "modern")
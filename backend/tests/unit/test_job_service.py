@@ -84,6 +84,23 @@ class TestJobAnalysisService:
             assert "Python" in result["required_skills"]
             assert "FastAPI" in result["required_skills"]
 
+    @pytest.mark.asyncio
+    async def test_analyze_job_description_static_prompt(self):
+        """Test instructions go in a static system block and the job text in the user block"""
+        mock_response = json.dumps({
+            "title": "Engineer", "company": "Acme", "required_skills": [], "preferred_skills": [],
+            "technologies": [], "experience_level": "Mid", "key_requirements": [],
+        })
+
+        with patch('app.jobs.service.get_llm_response', return_value=mock_response) as mock_llm:
+            await self.service.analyze_job_description("First job: Python")
+            await self.service.analyze_job_description("Second job: Go")
+
+        first, second = (call[0][0] for call in mock_llm.call_args_list)
+        assert first[0] == second[0]
+        assert first[0]["content"][0]["text"] == self.service.ANALYSIS_PROMPT
+        assert first[1] == {"role": "user", "content": "Job Description:\nFirst job: Python"}
+
     @pytest.mark.asyncio
     async def test_analyze_job_description_json_parse_error(self):
         """Test JSON parsing error handling"""
@@ -1,10 +1,22 @@
 """
 Unit tests for LLM wrapper
 """
-from unittest.mock import patch, Mock
+import json
+from unittest.mock import patch, Mock, AsyncMock
 import pytest
+from pydantic import BaseModel
 
-from app.core.llm import get_llm_response, stream_llm_response
+from app.core.llm import (
+    LLMError,
+    LLMJSONError,
+    get_json_parse_stats,
+    get_llm_response,
+    parse_llm_json,
+    repair_json,
+    request_json,
+    stream_json_objects,
+    stream_llm_response,
+)
 
 
 class TestLLMWrapper:
@@ -99,11 +111,12 @@ class TestLLMWrapper:
 
         with patch('app.core.llm.completion', side_effect=Exception("Stream Error")):
             chunks = []
-            async for chunk in stream_llm_response(messages):
-                chunks.append(chunk)
-            
-            assert len(chunks) == 1
-            assert "Error: Stream Error" in chunks[0]
+            with pytest.raises(LLMError, match="LLM request failed: Stream Error"):
+                async for chunk in stream_llm_response(messages):
+                    chunks.append(chunk)
+
+            # Errors are raised, never yielded into the response text
+            assert chunks == []
 
     @pytest.mark.asyncio
     async def test_stream_llm_response_custom_model(self):
@@ -124,4 +137,129 @@ class TestLLMWrapper:
                 messages=messages,
                 temperature=0.1,
                 stream=True
-            )
\ No newline at end of file
+            )
+
+
+class Item(BaseModel):
+    name: str
+    score: int
+
+
+class TestStructuredJSON:
+    """Test shared JSON extraction, repair and retry"""
+
+    def test_parse_fenced_json_with_prose(self):
+        """Code fences and surrounding prose are stripped"""
+        text = 'Here you go:\n```json\n{"a": [1, 2]}\n```\nHope that helps!'
+        assert parse_llm_json(text) == ({"a": [1, 2]}, False)
+
+    def test_parse_trailing_text_after_json(self):
+        """Text after a complete JSON value is ignored"""
+        assert parse_llm_json('[1, 2] and some notes')[0] == [1, 2]
+
+    def test_repair_truncated_json(self):
+        """Truncated output is closed and parsed"""
+        data, repaired = parse_llm_json('{"items": [{"name": "a", "score": 1}, {"name": "b')
+        assert repaired is True
+        assert data == {"items": [{"name": "a", "score": 1}, {"name": "b"}]}
+
+    def test_repair_trailing_comma_and_dangling_key(self):
+        """Trailing commas and a dangling key are dropped"""
+        assert repair_json('{"a": [1, 2,], "b":') == '{"a": [1, 2]}'
+
+    def test_parse_unrecoverable_raises(self):
+        """Plain prose cannot be parsed"""
+        with pytest.raises(ValueError):
+            parse_llm_json("Invalid JSON")
+
+    @pytest.mark.asyncio
+    async def test_request_json_validates_schema(self):
+        """Replies are validated into the requested pydantic type"""
+        complete = AsyncMock(return_value='[{"name": "a", "score": 3}]')
+
+        result = await request_json([], list[Item], call_site="test.validate", complete=complete)
+
+        assert result == [Item(name="a", score=3)]
+        complete.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_request_json_retries_once_with_repair_prompt(self):
+        """A bad reply triggers exactly one repair request"""
+        complete = AsyncMock(side_effect=["not json", '{"name": "a", "score": 1}'])
+        messages = [{"role": "user", "content": "Give me JSON"}]
+
+        result = await request_json(messages, Item, call_site="test.retry", complete=complete)
+
+        assert result.name == "a"
+        retry_messages = complete.call_args_list[1][0][0]
+        assert retry_messages[:1] == messages
+        assert retry_messages[1] == {"role": "assistant", "content": "not json"}
+        assert "ONLY the corrected JSON" in retry_messages[2]["content"]
+        stats = get_json_parse_stats()["test.retry"]
+        assert stats["first_pass_failures"] == 1
+        assert stats["failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_request_json_schema_mismatch_retries(self):
+        """Schema validation errors are reported in the repair prompt"""
+        complete = AsyncMock(side_effect=['{"name": "a"}', '{"name": "a", "score": 2}'])
+
+        result = await request_json([], Item, call_site="test.schema", complete=complete)
+
+        assert result.score == 2
+        assert "score" in complete.call_args_list[1][0][0][-1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_request_json_failure_tracked(self):
+        """Two bad replies raise LLMJSONError and count as a failure"""
+        complete = AsyncMock(return_value="still not json")
+
+        with pytest.raises(LLMJSONError, match="Failed to parse LLM response as JSON"):
+            await request_json([], Item, call_site="test.failure", complete=complete)
+
+        assert complete.call_count == 2
+        stats = get_json_parse_stats()["test.failure"]
+        assert stats["requests"] == 1
+        assert stats["failure_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_request_json_structured_output_for_models(self):
+        """Object-shaped models are sent as a provider response_format"""
+        complete = AsyncMock(return_value='{"name": "a", "score": 1}')
+
+        await request_json([], Item, call_site="test.format", complete=complete)
+        assert complete.call_args.kwargs["response_format"] is Item
+
+        list_complete = AsyncMock(return_value="[]")
+        await request_json([], list[Item], call_site="test.format", complete=list_complete)
+        assert "response_format" not in list_complete.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_request_json_transport_errors_propagate(self):
+        """LLM request failures are not swallowed as parse errors"""
+        complete = AsyncMock(side_effect=Exception("API Error"))
+
+        with pytest.raises(Exception, match="API Error"):
+            await request_json([], Item, call_site="test.transport", complete=complete)
+
+    @pytest.mark.asyncio
+    async def test_get_llm_response_passes_response_format(self):
+        """response_format is forwarded to LiteLLM only when given"""
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "{}"
+
+        with patch('app.core.llm.completion', return_value=mock_response) as mock_completion:
+            await get_llm_response([], response_format=Item)
+            assert mock_completion.call_args.kwargs["response_format"] is Item
+
+    @pytest.mark.asyncio
+    async def test_stream_json_objects_splits_array_items(self):
+        """Array items are emitted as they close, across chunk boundaries"""
+        async def chunks():
+            for part in ['Here you go:\n```json\n[{"a": "x}{", "b": [1', ', 2]}, {"a": "say \\"hi\\""}', "]\n```"]:
+                yield part
+
+        items = [item async for item in stream_json_objects(chunks())]
+
+        assert [json.loads(item) for item in items] == [{"a": "x}{", "b": [1, 2]}, {"a": 'say "hi"'}]
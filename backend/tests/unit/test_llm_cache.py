@@ -0,0 +1,155 @@
+"""
+Unit tests for the on-disk LLM response cache
+"""
+from unittest.mock import patch, Mock
+import pytest
+
+from app.core import llm
+from app.core.llm import LLMError, get_llm_response, request_json, stream_llm_response
+from app.core.llm_cache import LLMResponseCache, normalize_messages
+
+
+MESSAGES = [{"role": "user", "content": "Analyze this job"}]
+
+
+def _completion_response(content):
+    response = Mock()
+    response.choices = [Mock()]
+    response.choices[0].message.content = content
+    return response
+
+
+def _stream_chunks(*parts):
+    chunks = []
+    for part in parts:
+        chunk = Mock()
+        chunk.choices = [Mock()]
+        chunk.choices[0].delta.content = part
+        chunks.append(chunk)
+    return chunks
+
+
+class TestLLMResponseCache:
+    """Test key derivation, storage and eviction"""
+
+    def test_key_ignores_whitespace_and_cache_control(self):
+        """Test normalized messages produce the same key"""
+        plain = [{"role": "user", "content": "Hello   world\n"}]
+        blocks = [{"role": "user", "content": [
+            {"type": "text", "text": "Hello world", "cache_control": {"type": "ephemeral"}}
+        ]}]
+
+        assert normalize_messages(plain) == normalize_messages(blocks)
+        assert LLMResponseCache.make_key("m", plain, 0.1) == LLMResponseCache.make_key("m", blocks, 0.1)
+
+    def test_key_depends_on_model_and_temperature(self):
+        """Test model and temperature split the key space"""
+        key = LLMResponseCache.make_key("a", MESSAGES, 0.1)
+        assert key != LLMResponseCache.make_key("b", MESSAGES, 0.1)
+        assert key != LLMResponseCache.make_key("a", MESSAGES, 0.7)
+
+    def test_get_set_and_counters(self, tmp_path):
+        """Test round trip and hit/miss accounting"""
+        cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=1024)
+
+        assert cache.get("k") is None
+        cache.set("k", "value")
+        assert cache.get("k") == "value"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test size-based eviction drops the oldest access first"""
+        cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=20)
+        cache.set("a", "x" * 8)
+        cache.set("b", "y" * 8)
+        cache.get("a")  # a is now more recent than b
+        cache.set("c", "z" * 8)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "x" * 8
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["size_bytes"] <= 20
+
+    def test_skips_oversized_entries(self, tmp_path):
+        """Test a single response larger than the budget is not stored"""
+        cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=4)
+        cache.set("k", "too large")
+        assert cache.stats()["entries"] == 0
+
+
+class TestCachedLLMCalls:
+    """Test cache integration in get_llm_response and stream_llm_response"""
+
+    @pytest.fixture(autouse=True)
+    def enabled_cache(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=1024 * 1024)
+        with patch.object(llm.settings, "llm_cache_enabled", True), \
+             patch.object(llm.settings, "llm_cache_stream_chunk_chars", 4), \
+             patch.object(llm, "_response_cache", cache):
+            yield cache
+
+    @pytest.mark.asyncio
+    async def test_response_served_from_cache(self):
+        """Test identical requests call the provider once"""
+        with patch("app.core.llm.completion", return_value=_completion_response("cached")) as mock_completion:
+            first = await get_llm_response(MESSAGES, cache=True)
+            second = await get_llm_response(MESSAGES, cache=True)
+
+        assert first == second == "cached"
+        mock_completion.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cache_is_opt_in(self):
+        """Test calls without cache=True always reach the provider"""
+        with patch("app.core.llm.completion", return_value=_completion_response("fresh")) as mock_completion:
+            await get_llm_response(MESSAGES)
+            await get_llm_response(MESSAGES)
+
+        assert mock_completion.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_replayed_in_chunks(self):
+        """Test a cached stream is replayed as chunked output"""
+        with patch("app.core.llm.completion", return_value=_stream_chunks("Hello ", "world!")) as mock_completion:
+            first = [c async for c in stream_llm_response(MESSAGES, cache=True)]
+            replay = [c async for c in stream_llm_response(MESSAGES, cache=True)]
+
+        mock_completion.assert_called_once()
+        assert "".join(first) == "".join(replay) == "Hello world!"
+        assert replay == ["Hell", "o wo", "rld!"]
+
+    @pytest.mark.asyncio
+    async def test_failed_stream_not_cached(self, enabled_cache):
+        """Test a stream that errors midway is not stored"""
+        def broken_stream():
+            yield from _stream_chunks("partial")
+            raise Exception("connection reset")
+
+        chunks = []
+        with patch("app.core.llm.completion", return_value=broken_stream()):
+            with pytest.raises(LLMError):
+                async for chunk in stream_llm_response(MESSAGES, cache=True):
+                    chunks.append(chunk)
+
+        assert chunks == ["partial"]
+        assert enabled_cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_reply_evicted(self, enabled_cache):
+        """Test a reply that fails validation is not replayed from the cache"""
+        replies = [_completion_response("not json"), _completion_response('{"ok": true}'),
+                   _completion_response('{"ok": true}')]
+        with patch("app.core.llm.completion", side_effect=replies) as mock_completion, \
+             patch.object(llm.settings, "llm_structured_output", False):
+            first = await request_json(MESSAGES, dict[str, bool], call_site="test.cache", cache=True)
+            # The bad reply was evicted: a fresh, valid reply is fetched and cached
+            second = await request_json(MESSAGES, dict[str, bool], call_site="test.cache", cache=True)
+            third = await request_json(MESSAGES, dict[str, bool], call_site="test.cache", cache=True)
+
+        assert first == second == third == {"ok": True}
+        assert mock_completion.call_count == 3
@@ -0,0 +1,228 @@
+"""
+Unit tests for LLM retries, error classification and the circuit breaker
+"""
+from unittest.mock import patch, Mock, AsyncMock
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import llm
+from app.core.llm import get_llm_response, stream_llm_response
+from app.core.llm_resilience import (
+    CircuitBreaker,
+    LLMBadRequestError,
+    LLMError,
+    LLMRateLimitError,
+    LLMUnavailableError,
+    RetryPolicy,
+    classify_error,
+)
+from main import app
+
+MESSAGES = [{"role": "user", "content": "Test"}]
+
+
+class ProviderError(Exception):
+    """Stand-in for a litellm exception carrying an HTTP status"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.litellm_response_headers = headers or {}
+
+
+def _completion_response(content):
+    return Mock(choices=[Mock(message=Mock(content=content))])
+
+
+@pytest.fixture(autouse=True)
+def fresh_breaker():
+    """Isolate breaker state per test; retries never really sleep"""
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+    with patch.object(llm, "circuit_breaker", breaker), \
+         patch("app.core.llm.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        yield breaker, mock_sleep
+
+
+class TestClassifyError:
+    """Test mapping provider exceptions to typed errors"""
+
+    def test_rate_limit_reads_retry_after(self):
+        error = classify_error(ProviderError(429, {"retry-after": "7"}))
+        assert isinstance(error, LLMRateLimitError)
+        assert error.retry_after == 7.0
+
+    def test_server_errors_and_timeouts_are_unavailable(self):
+        assert type(classify_error(ProviderError(529))) is LLMUnavailableError
+        assert type(classify_error(TimeoutError("read timed out"))) is LLMUnavailableError
+
+    def test_client_errors_are_bad_requests(self):
+        assert isinstance(classify_error(ProviderError(400)), LLMBadRequestError)
+
+    def test_unknown_errors_keep_message(self):
+        error = classify_error(Exception("boom"))
+        assert type(error) is LLMError
+        assert str(error) == "LLM request failed: boom"
+
+
+class TestRetryPolicy:
+    """Test retry delays"""
+
+    def setup_method(self):
+        self.policy = RetryPolicy(max_retries=3, base_delay=0.5, max_delay=8.0, max_retry_after=20.0)
+
+    def test_backoff_is_capped_and_jittered(self):
+        error = LLMUnavailableError("down")
+        for attempt in range(3):
+            assert 0 <= self.policy.delay(error, attempt) <= min(8.0, 0.5 * 2 ** attempt)
+        assert self.policy.delay(error, 3) is None
+
+    def test_long_retry_after_gives_up(self):
+        assert self.policy.delay(LLMRateLimitError("slow down", retry_after=60), 0) is None
+        assert 2.0 <= self.policy.delay(LLMRateLimitError("slow down", retry_after=2), 0) <= 2.5
+
+    def test_bad_requests_not_retried(self):
+        assert self.policy.delay(LLMBadRequestError("bad"), 0) is None
+
+
+class TestRetries:
+    """Test retry behaviour of get_llm_response and stream_llm_response"""
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_honours_retry_after(self, fresh_breaker):
+        """Test a 429 waits for Retry-After then succeeds"""
+        _, mock_sleep = fresh_breaker
+        side_effect = [ProviderError(429, {"retry-after": "2"}), _completion_response("ok")]
+
+        with patch("app.core.llm.completion", side_effect=side_effect) as mock_completion:
+            assert await get_llm_response(MESSAGES) == "ok"
+
+        assert mock_completion.call_count == 2
+        assert mock_sleep.await_args[0][0] >= 2.0
+
+    @pytest.mark.asyncio
+    async def test_server_errors_retried_until_exhausted(self, fresh_breaker):
+        """Test 5xx responses retry with backoff, then raise LLMUnavailableError"""
+        _, mock_sleep = fresh_breaker
+        with patch.object(llm.retry_policy, "max_retries", 2), \
+             patch("app.core.llm.completion", side_effect=ProviderError(503)) as mock_completion:
+            with pytest.raises(LLMUnavailableError):
+                await get_llm_response(MESSAGES)
+
+        assert mock_completion.call_count == 3
+        assert mock_sleep.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_bad_request_not_retried(self):
+        """Test a 4xx fails immediately"""
+        with patch("app.core.llm.completion", side_effect=ProviderError(400)) as mock_completion:
+            with pytest.raises(LLMBadRequestError):
+                await get_llm_response(MESSAGES)
+
+        mock_completion.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_retried_before_first_chunk(self):
+        """Test a stream that fails to open is retried"""
+        chunks = [Mock(choices=[Mock(delta=Mock(content="hi"))])]
+        with patch("app.core.llm.completion", side_effect=[ProviderError(500), chunks]):
+            assert [c async for c in stream_llm_response(MESSAGES)] == ["hi"]
+
+
+class TestCircuitBreaker:
+    """Test the breaker opens, fails fast and recovers"""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_threshold_and_fails_fast(self, fresh_breaker):
+        breaker, _ = fresh_breaker
+        with patch.object(llm.retry_policy, "max_retries", 0), \
+             patch("app.core.llm.completion", side_effect=ProviderError(503)) as mock_completion:
+            for _ in range(3):
+                with pytest.raises(LLMUnavailableError):
+                    await get_llm_response(MESSAGES)
+            assert breaker.state == "open"
+
+            with pytest.raises(LLMUnavailableError, match="temporarily unavailable") as exc_info:
+                await get_llm_response(MESSAGES)
+
+        assert mock_completion.call_count == 3
+        assert exc_info.value.retry_after > 0
+        assert breaker.stats()["rejected"] == 1
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+        breaker.record_failure(LLMUnavailableError("down"))
+        breaker.opened_at -= 31
+
+        breaker.before_call()
+        assert breaker.state == "half_open"
+        with pytest.raises(LLMUnavailableError):
+            breaker.before_call()  # only one probe at a time
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_half_open_probe_failure_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+        breaker.record_failure(LLMUnavailableError("down"))
+        breaker.opened_at -= 31
+        breaker.before_call()
+
+        breaker.record_failure(LLMUnavailableError("still down"))
+        assert breaker.state == "open"
+        assert breaker.trips == 2
+
+    def test_rate_limits_do_not_trip(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+        breaker.record_failure(LLMRateLimitError("slow down"))
+        assert breaker.state == "closed"
+
+
+class TestUnavailableRoutes:
+    """Test routes surface provider outages as 503"""
+
+    def setup_method(self):
+        self.client = TestClient(app)
+
+    def test_job_analysis_returns_503_with_retry_after(self):
+        error = LLMRateLimitError("LLM request failed: rate limited", retry_after=12.5)
+        with patch("app.jobs.routes.job_analysis_service.analyze_job_description",
+                   new_callable=AsyncMock, side_effect=error):
+            response = self.client.post("/jobs/analyze", json={"job_text": "Python developer"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "13"
+
+    @patch("app.optimization.routes.optimization_service.get_resume_job_data", new_callable=AsyncMock)
+    def test_optimize_fails_fast_while_circuit_open(self, mock_get_data, fresh_breaker):
+        breaker, _ = fresh_breaker
+        mock_get_data.return_value = ({}, {})
+        breaker.record_failure(LLMUnavailableError("down"))
+        breaker.record_failure(LLMUnavailableError("down"))
+        breaker.record_failure(LLMUnavailableError("down"))
+
+        response = self.client.post("/optimize", json={
+            "resume_id": "123e4567-e89b-12d3-a456-426614174000",
+            "job_id": "123e4567-e89b-12d3-a456-426614174001",
+        })
+
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+
+    @patch("app.optimization.routes.optimization_service.get_resume_job_data", new_callable=AsyncMock)
+    def test_optimize_stream_emits_error_event(self, mock_get_data):
+        mock_get_data.return_value = ({}, {})
+
+        async def failing_optimize(resume_data, job_analysis, **kwargs):
+            raise LLMUnavailableError("LLM request failed: overloaded", retry_after=4)
+            yield  # pragma: no cover
+
+        with patch("app.optimization.routes.optimization_service.optimize_resume", failing_optimize):
+            response = self.client.post("/optimize", json={
+                "resume_id": "123e4567-e89b-12d3-a456-426614174000",
+                "job_id": "123e4567-e89b-12d3-a456-426614174001",
+            })
+
+        assert response.status_code == 200
+        assert "event: error" in response.text
+        assert '"retry_after": 4' in response.text
+        assert response.text.endswith("data: [DONE]\n\n")
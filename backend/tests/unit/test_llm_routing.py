@@ -0,0 +1,147 @@
+"""
+Unit tests for per call site model routing and cost accounting
+"""
+from unittest.mock import patch, Mock, AsyncMock
+import pytest
+from pydantic import BaseModel
+
+from app.core import llm_routing
+from app.core.llm import build_messages, get_llm_response, request_json, stream_llm_response
+from app.core.llm_routing import estimate_cost, get_route_stats, model_for
+
+
+class Category(BaseModel):
+    name: str
+
+
+@pytest.fixture(autouse=True)
+def clean_route_stats():
+    llm_routing.route_stats.clear()
+    yield
+    llm_routing.route_stats.clear()
+
+
+class TestModelRouting:
+    """Test the routing table and escalation"""
+
+    def test_classification_routes_to_fast_tier(self):
+        """Test configured call sites use the fast model, others the default"""
+        assert model_for("export.categorize_skills") == "claude-haiku-4-5"
+        assert model_for("optimization.experience") == "claude-sonnet-4-5"
+
+    def test_unknown_tier_falls_back_to_default(self):
+        with patch.dict(llm_routing.settings.llm_route_tiers, {"test.site": "missing"}):
+            assert model_for("test.site") == "claude-sonnet-4-5"
+
+    @pytest.mark.asyncio
+    async def test_validation_failure_escalates_to_default_model(self):
+        """Test bad output from the fast tier is retried on the larger model"""
+        complete = AsyncMock(side_effect=['{"wrong": 1}', '{"name": "ok"}'])
+        messages = [{"role": "user", "content": "Categorize"}]
+
+        result = await request_json(
+            messages, Category, call_site="export.categorize_skills", complete=complete
+        )
+
+        assert result.name == "ok"
+        first, second = complete.call_args_list
+        assert first.kwargs["model"] == "claude-haiku-4-5"
+        assert second.kwargs["model"] == "claude-sonnet-4-5"
+        assert second.args[0] == messages  # original prompt, no repair turn
+        assert get_route_stats()["export.categorize_skills"]["escalations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_default_tier_uses_repair_prompt(self):
+        """Test call sites already on the default model keep the repair retry"""
+        complete = AsyncMock(side_effect=["not json", '{"name": "ok"}'])
+
+        await request_json([], Category, call_site="optimization.keywords", complete=complete)
+
+        second = complete.call_args_list[1]
+        assert second.kwargs["model"] == "claude-sonnet-4-5"
+        assert second.args[0][-1]["role"] == "user"
+        assert "optimization.keywords" not in get_route_stats()
+
+
+class TestRouteAccounting:
+    """Test latency, token and cost counters"""
+
+    def test_estimate_cost(self):
+        assert estimate_cost("claude-haiku-4-5", 1_000_000, 100_000) == pytest.approx(1.5)
+        assert estimate_cost("unknown-model", 1000, 1000) == 0.0
+
+    def test_estimate_cost_prices_prompt_cache(self):
+        """Test cache reads bill at 10% and cache writes at 125% of input price"""
+        cost = estimate_cost(
+            "claude-sonnet-4-5", 1_000_000, 0, cache_read_tokens=500_000, cache_write_tokens=100_000
+        )
+        assert cost == pytest.approx((400_000 + 125_000 + 50_000) * 3.0 / 1_000_000)
+
+    @pytest.mark.asyncio
+    async def test_records_prompt_cache_usage(self):
+        """Test cache read/write tokens from the usage block are accounted"""
+        response = Mock()
+        response.choices = [Mock(message=Mock(content="ok"))]
+        response.usage = Mock(
+            prompt_tokens=1500, completion_tokens=10,
+            cache_read_input_tokens=1200, cache_creation_input_tokens=0,
+        )
+
+        with patch("app.core.llm.completion", return_value=response):
+            await get_llm_response(build_messages("static " * 10, "dynamic"), call_site="test.cached")
+
+        stats = get_route_stats()["test.cached"]
+        assert stats["cache_read_tokens"] == 1200
+        assert stats["cache_write_tokens"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_llm_response_records_usage(self):
+        """Test provider usage and routed model are accounted per call site"""
+        response = Mock()
+        response.choices = [Mock(message=Mock(content="{}"))]
+        response.usage = Mock(prompt_tokens=2000, completion_tokens=100)
+
+        with patch("app.core.llm.completion", return_value=response) as mock_completion:
+            await get_llm_response([{"role": "user", "content": "x"}], call_site="jobs.analyze")
+
+        assert mock_completion.call_args.kwargs["model"] == "claude-haiku-4-5"
+        stats = get_route_stats()["jobs.analyze"]
+        assert stats["calls"] == 1
+        assert stats["input_tokens"] == 2000
+        assert stats["output_tokens"] == 100
+        assert stats["cost_usd"] == pytest.approx(0.0025)
+        assert stats["models"] == {"claude-haiku-4-5": 1}
+
+    @pytest.mark.asyncio
+    async def test_stream_records_estimated_usage_and_errors(self):
+        """Test streams are accounted with estimated tokens; failures count as errors"""
+        chunks = [Mock(choices=[Mock(delta=Mock(content="a" * 40))])]
+        with patch("app.core.llm.completion", return_value=chunks):
+            [c async for c in stream_llm_response([{"role": "user", "content": "y" * 400}], call_site="test.stream")]
+
+        with patch("app.core.llm.completion", side_effect=Exception("boom")):
+            with pytest.raises(Exception):
+                [c async for c in stream_llm_response([], call_site="test.stream")]
+
+        stats = get_route_stats()["test.stream"]
+        assert stats["calls"] == 1
+        assert stats["errors"] == 1
+        assert stats["avg_ttft_ms"] is not None
+        assert stats["input_tokens"] == 101
+        assert stats["output_tokens"] == 10
+
+
+class TestBuildMessages:
+    """Test the static/dynamic prompt split"""
+
+    def test_static_block_marked_for_caching(self):
+        system, user = build_messages("rules", "data")
+        assert system == {"role": "system", "content": [
+            {"type": "text", "text": "rules", "cache_control": {"type": "ephemeral"}}
+        ]}
+        assert user == {"role": "user", "content": "data"}
+
+    def test_caching_can_be_disabled(self):
+        with patch.object(llm_routing.settings, "llm_prompt_caching", False):
+            system, _ = build_messages("rules", "data")
+        assert "cache_control" not in system["content"][0]
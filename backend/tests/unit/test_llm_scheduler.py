@@ -0,0 +1,116 @@
+"""
+Unit tests for the outbound LLM scheduler
+"""
+import asyncio
+from unittest.mock import patch
+import pytest
+
+from app.core.llm_scheduler import LLMPriority, LLMScheduler, TokenBucket, estimate_tokens
+
+
+class TestLLMScheduler:
+    """Test concurrency bound, priority ordering and stats"""
+
+    @pytest.mark.asyncio
+    async def test_bounds_in_flight_calls(self):
+        """Test no more than max_concurrency callers hold a slot"""
+        scheduler = LLMScheduler(max_concurrency=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with scheduler.slot():
+                peak = max(peak, scheduler.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert scheduler.in_flight == 0
+        assert scheduler.stats()["priorities"]["interactive"]["requests"] == 6
+
+    @pytest.mark.asyncio
+    async def test_waiters_served_by_priority(self):
+        """Test a queued interactive call overtakes earlier batch calls"""
+        scheduler = LLMScheduler(max_concurrency=1)
+        order = []
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot(LLMPriority.BATCH):
+                await release.wait()
+
+        async def call(name, priority):
+            async with scheduler.slot(priority):
+                order.append(name)
+
+        tasks = [asyncio.create_task(holder())]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("batch", LLMPriority.BATCH)))
+        tasks.append(asyncio.create_task(call("export", LLMPriority.EXPORT)))
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("interactive", LLMPriority.INTERACTIVE)))
+        await asyncio.sleep(0)
+
+        assert scheduler.stats()["queue_depth"] == 3
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert order == ["interactive", "export", "batch"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        """Test cancelling a queued call leaves the slot count intact"""
+        scheduler = LLMScheduler(max_concurrency=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot():
+                await release.wait()
+
+        hold = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await asyncio.gather(hold, waiter, return_exceptions=True)
+
+        assert scheduler.in_flight == 0
+        assert scheduler.stats()["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_request_bucket_throttles(self):
+        """Test calls beyond the per-minute budget wait for refill"""
+        scheduler = LLMScheduler(max_concurrency=4, requests_per_minute=60)
+        scheduler.request_bucket.available = 1
+
+        with patch("app.core.llm_scheduler.asyncio.sleep") as mock_sleep:
+            async with scheduler.slot():
+                pass
+            async with scheduler.slot():
+                pass
+
+        mock_sleep.assert_called_once()
+        assert mock_sleep.call_args[0][0] == pytest.approx(1.0, abs=0.05)
+        assert scheduler.stats()["throttled"]["requests"] == 1
+
+
+class TestTokenBucket:
+    """Test the per-minute token bucket"""
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_capped_at_capacity(self):
+        """Test a single request larger than the bucket cannot deadlock"""
+        bucket = TokenBucket(per_minute=600)
+        with patch("app.core.llm_scheduler.asyncio.sleep") as mock_sleep:
+            assert await bucket.acquire(10_000) == 0.0
+        mock_sleep.assert_not_called()
+
+    def test_estimate_tokens(self):
+        """Test prompt size estimate handles text and content blocks"""
+        messages = [
+            {"role": "system", "content": [{"type": "text", "text": "x" * 400}]},
+            {"role": "user", "content": "y" * 400},
+        ]
+        assert estimate_tokens(messages) == 201
@@ -0,0 +1,244 @@
+"""
+Unit tests for incremental re-optimization
+"""
+import json
+from unittest.mock import patch, AsyncMock
+import pytest
+
+from app.optimization.incremental import OptimizationRun, content_hash, section_hashes
+from app.optimization.schemas import InterviewQuestion, OptimizationSuggestion
+from app.optimization.service import OptimizationService
+
+
+def _suggestion(section, original):
+    return OptimizationSuggestion(
+        section=section, type="enhance_description", original=original,
+        suggested=f"{original} (improved)", reason="Impact", impact="high",
+    )
+
+
+QUESTIONS = [InterviewQuestion(category="technical", question=f"Question {i}?", tips="Tip") for i in range(5)]
+
+
+@pytest.fixture
+def resume_data(sample_resume_data):
+    return {**sample_resume_data, "experience": [
+        {"title": "Staff Engineer", "company": "A", "description": ["Led platform"]},
+        {"title": "Engineer", "company": "B", "description": ["Built APIs"]},
+    ]}
+
+
+def _role_reply(messages, **kwargs):
+    """One suggestion echoing the first bullet of the role in the prompt"""
+    bullet = next(line.strip()[2:] for line in messages[0]["content"].splitlines() if line.strip().startswith("- "))
+
+    async def reply():
+        yield json.dumps([_suggestion("experience", bullet).model_dump()])
+    return reply()
+
+
+class TestSectionHashes:
+    """Test content hashing and reuse rules"""
+
+    def test_hash_ignores_key_order(self):
+        assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+        assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+    def test_round_trip_through_record(self, resume_data, sample_job_analysis):
+        hashes = section_hashes(resume_data, sample_job_analysis, resume_data["experience"])
+        run = OptimizationRun(
+            section_hashes=hashes,
+            keywords=[_suggestion("skills", "Python")],
+            experience={hashes["experience"][0]: [_suggestion("experience", "Led platform")]},
+            interview_questions=QUESTIONS,
+        )
+
+        restored = OptimizationRun.from_record(json.loads(json.dumps(run.to_record())))
+
+        assert restored == run
+        assert OptimizationRun.from_record({"optimized_resume": {}}) is None
+
+    def test_failed_keywords_step_round_trips_as_none(self, resume_data, sample_job_analysis):
+        """Test a failed keywords step is regenerated, not reused as an empty result"""
+        hashes = section_hashes(resume_data, sample_job_analysis, resume_data["experience"])
+        run = OptimizationRun(
+            section_hashes=hashes,
+            keywords=None,
+            experience={role: [] for role in hashes["experience"]},
+            interview_questions=QUESTIONS,
+        )
+
+        restored = OptimizationRun.from_record(json.loads(json.dumps(run.to_record())))
+
+        assert restored.keywords is None
+        assert restored.reusable_for(hashes).keywords is None
+        assert not restored.reusable_for(hashes).is_complete
+
+    def test_reuse_rules(self, resume_data, sample_job_analysis):
+        """Test a job change reuses nothing and a skills change drops keywords only"""
+        hashes = section_hashes(resume_data, sample_job_analysis, resume_data["experience"])
+        run = OptimizationRun(
+            section_hashes=hashes,
+            keywords=[_suggestion("skills", "Python")],
+            experience={role: [] for role in hashes["experience"]},
+            interview_questions=QUESTIONS,
+        )
+        assert run.reusable_for(hashes).is_complete
+
+        other_job = section_hashes(resume_data, {**sample_job_analysis, "title": "Other"}, resume_data["experience"])
+        reuse = run.reusable_for(other_job)
+        assert reuse.keywords is None and reuse.experience == {} and reuse.interview_questions is None
+
+        new_skills = {**resume_data, "skills": {"technical": ["Rust"]}}
+        reuse = run.reusable_for(section_hashes(new_skills, sample_job_analysis, resume_data["experience"]))
+        assert reuse.keywords is None
+        assert reuse.experience.keys() == run.experience.keys()
+        assert reuse.interview_questions == QUESTIONS
+
+
+class TestIncrementalOptimization:
+    """Test /optimize reruns only re-send changed sections"""
+
+    def setup_method(self):
+        self.service = OptimizationService()
+
+    async def _run(self, resume_data, job_analysis, previous):
+        with patch.object(self.service, "get_previous_run", new_callable=AsyncMock, return_value=previous), \
+             patch.object(self.service, "save_run", new_callable=AsyncMock) as mock_save, \
+             patch.object(self.service, "_save_question_bank", new_callable=AsyncMock), \
+             patch("app.optimization.service.asyncio.sleep", new_callable=AsyncMock):
+            updates = [p async for p in self.service.optimize_resume(
+                resume_data, job_analysis, resume_id="resume-1", job_id="job-1"
+            )]
+        return updates, mock_save.await_args.args[2]
+
+    @pytest.mark.asyncio
+    async def test_only_changed_role_is_resent(self, resume_data, sample_job_analysis):
+        """Test an edited role is re-enhanced while the rest of the run is reused"""
+        with patch.object(self.service, "_generate_keyword_suggestions", new_callable=AsyncMock,
+                          return_value=[_suggestion("skills", "Python")]), \
+             patch.object(self.service, "_generate_interview_questions", new_callable=AsyncMock,
+                          return_value=QUESTIONS), \
+             patch("app.optimization.service.stream_llm_response", side_effect=_role_reply):
+            _, first_run = await self._run(resume_data, sample_job_analysis, previous=None)
+
+        edited = {**resume_data, "experience": [
+            resume_data["experience"][0],
+            {"title": "Engineer", "company": "B", "description": ["Built APIs used by 40 teams"]},
+        ]}
+        previous = OptimizationRun.from_record(json.loads(json.dumps(first_run.to_record())))
+        with patch.object(self.service, "_generate_keyword_suggestions", new_callable=AsyncMock) as mock_keywords, \
+             patch.object(self.service, "_generate_interview_questions", new_callable=AsyncMock) as mock_questions, \
+             patch("app.optimization.service.stream_llm_response", side_effect=_role_reply) as mock_stream:
+            updates, second_run = await self._run(edited, sample_job_analysis, previous)
+
+        mock_keywords.assert_not_awaited()
+        mock_questions.assert_not_awaited()
+        assert mock_stream.call_count == 1
+        assert "Built APIs used by 40 teams" in mock_stream.call_args.args[0][0]["content"]
+
+        final = updates[-1]
+        assert [s.original for s in final.suggestions] == [
+            "Python", "Led platform", "Built APIs used by 40 teams",
+        ]
+        assert final.interview_questions == QUESTIONS
+        assert len(second_run.experience) == 2
+
+    @pytest.mark.asyncio
+    async def test_unchanged_resume_replays_stored_run(self, resume_data, sample_job_analysis):
+        """Test a rerun with nothing changed makes no LLM calls"""
+        hashes = section_hashes(resume_data, sample_job_analysis, resume_data["experience"])
+        previous = OptimizationRun(
+            section_hashes=hashes,
+            keywords=[_suggestion("skills", "Python")],
+            experience={role: [_suggestion("experience", role)] for role in hashes["experience"]},
+            interview_questions=QUESTIONS,
+            ats_score=self.service._calculate_ats_score(resume_data, sample_job_analysis),
+        )
+
+        with patch("app.optimization.service.stream_llm_response") as mock_stream:
+            updates, _ = await self._run(resume_data, sample_job_analysis, previous)
+
+        mock_stream.assert_not_called()
+        assert len(updates) == 1
+        assert updates[0].completed is True
+        assert len(updates[0].suggestions) == 3
+        assert updates[0].ats_score == previous.ats_score
+
+    def test_ats_score_reuses_keyword_match(self, resume_data, sample_job_analysis):
+        """Test the incremental ATS score equals a full recomputation"""
+        full = self.service._calculate_ats_score(resume_data, sample_job_analysis)
+        without_projects = {**resume_data, "projects": []}
+
+        incremental = self.service._calculate_ats_score(
+            without_projects, sample_job_analysis, keyword_match=full.keyword_match
+        )
+
+        assert incremental == self.service._calculate_ats_score(without_projects, sample_job_analysis)
+
+
+class TestJobQuestionBank:
+    """Test interview questions are generated once per job"""
+
+    def setup_method(self):
+        self.service = OptimizationService()
+
+    async def _optimize(self, resume_data, job_analysis, question_bank, mode="multi_call"):
+        if question_bank:
+            job_analysis = {**job_analysis, "interview_questions": [q.model_dump() for q in question_bank]}
+        with patch.object(self.service, "get_previous_run", new_callable=AsyncMock, return_value=None), \
+             patch.object(self.service, "save_run", new_callable=AsyncMock), \
+             patch.object(self.service, "_save_question_bank", new_callable=AsyncMock) as mock_save_bank, \
+             patch.object(self.service, "_generate_keyword_suggestions", new_callable=AsyncMock, return_value=[]), \
+             patch.object(self.service, "_generate_interview_questions", new_callable=AsyncMock,
+                          return_value=QUESTIONS) as mock_generate, \
+             patch("app.optimization.service.stream_llm_response", side_effect=_role_reply) as mock_stream, \
+             patch("app.optimization.service.asyncio.sleep", new_callable=AsyncMock):
+            updates = [p async for p in self.service.optimize_resume(
+                resume_data, job_analysis, mode=mode, resume_id="resume-1", job_id="job-1"
+            )]
+        return updates[-1], mock_generate, mock_save_bank, mock_stream
+
+    @pytest.mark.asyncio
+    async def test_first_use_generates_and_stores_bank(self, resume_data, sample_job_analysis):
+        final, mock_generate, mock_save_bank, _ = await self._optimize(resume_data, sample_job_analysis, None)
+
+        mock_generate.assert_awaited_once()
+        mock_save_bank.assert_awaited_once_with("job-1", QUESTIONS)
+        assert final.interview_questions == QUESTIONS
+
+    @pytest.mark.asyncio
+    async def test_stored_bank_skips_generation(self, resume_data, sample_job_analysis):
+        bank = QUESTIONS[::-1]
+        final, mock_generate, mock_save_bank, _ = await self._optimize(resume_data, sample_job_analysis, bank)
+
+        mock_generate.assert_not_awaited()
+        mock_save_bank.assert_not_awaited()
+        assert final.interview_questions == bank
+
+    @pytest.mark.asyncio
+    async def test_single_call_prompt_omits_banked_questions(self, resume_data, sample_job_analysis):
+        """Test the merged prompt only asks for interview questions the job lacks"""
+        final, _, _, mock_stream = await self._optimize(resume_data, sample_job_analysis, QUESTIONS, mode="single_call")
+
+        prompt = mock_stream.call_args.args[0][0]["content"]
+        assert "### INTERVIEW" not in prompt
+        assert "exactly two sections" in prompt
+        assert final.interview_questions == QUESTIONS
+
+    @pytest.mark.asyncio
+    async def test_bank_comes_with_the_job_query(self, mock_supabase):
+        """Test the stored bank is read from the jobs row already fetched, without a second query"""
+        jobs = mock_supabase.table.return_value.select.return_value.eq.return_value.execute
+        jobs.return_value.data = [{
+            "optimized_data": None, "parsed_data": {"skills": {}},
+            "analysis": {"title": "Engineer"}, "keywords": None,
+            "interview_questions": [q.model_dump() for q in QUESTIONS],
+        }]
+
+        with patch("app.optimization.service.get_supabase_service_client", return_value=mock_supabase):
+            _, job_analysis = await self.service.get_resume_job_data("resume-1", "job-1")
+
+        assert jobs.call_count == 2  # one resumes query, one jobs query
+        assert self.service._question_bank(job_analysis) == QUESTIONS
+        assert section_hashes({}, job_analysis, [])["job"] == section_hashes({}, {"title": "Engineer"}, [])["job"]
@@ -1,10 +1,12 @@
 """
 Unit tests for optimization service
 """
+import asyncio
 import json
 from unittest.mock import patch, Mock, AsyncMock
 import pytest
 
+from app.core.llm import LLMUnavailableError
 from app.optimization.service import OptimizationService
 from app.optimization.schemas import OptimizationSuggestion
 
@@ -127,17 +129,21 @@ class TestOptimizationService:
     @pytest.mark.asyncio
     async def test_optimize_resume_full_flow(self, sample_resume_data, sample_job_analysis):
         """Test complete optimization flow"""
+        async def mock_experience(resume_data, job_analysis, **kwargs):
+            yield "role-hash", OptimizationSuggestion(
+                section="experience", type="enhance_description", original="Built apps",
+                suggested="Built scalable apps", reason="Added impact", impact="medium"
+            )
+
         with patch.object(self.service, '_generate_keyword_suggestions') as mock_keywords, \
-             patch.object(self.service, '_enhance_experience') as mock_experience:
+             patch.object(self.service, '_stream_experience_suggestions', mock_experience), \
+             patch.object(self.service, '_generate_interview_questions', return_value=[]), \
+             patch('app.optimization.service.asyncio.sleep', new_callable=AsyncMock):
             
             mock_keywords.return_value = [OptimizationSuggestion(
                 section="skills", type="add_keyword", original="Python", 
                 suggested="Python, Docker", reason="Missing Docker", impact="high"
             )]
-            mock_experience.return_value = [OptimizationSuggestion(
-                section="experience", type="enhance_description", original="Built apps",
-                suggested="Built scalable apps", reason="Added impact", impact="medium"
-            )]
             
             progress_updates = []
             async for progress in self.service.optimize_resume(sample_resume_data, sample_job_analysis):
@@ -146,4 +152,160 @@ class TestOptimizationService:
             assert len(progress_updates) >= 4  # At least 4 progress updates
             assert progress_updates[-1].completed is True
             assert progress_updates[-1].progress == 100
-            assert len(progress_updates[-1].suggestions) == 2
\ No newline at end of file
+            assert len(progress_updates[-1].suggestions) == 2
+
+class TestExperienceEnhancement:
+    """Test batched enhancement of all experience entries"""
+
+    def setup_method(self):
+        self.service = OptimizationService()
+
+    @pytest.fixture
+    def resume_data(self, sample_resume_data):
+        return {**sample_resume_data, "experience": [
+            {"title": "Staff Engineer", "company": "A", "description": ["Led platform", "Cut costs"]},
+            {"title": "Engineer", "company": "B", "description": ["Built APIs"]},
+            {"title": "Intern", "company": "C", "description": []},
+        ]}
+
+    @staticmethod
+    def _reply_per_bullet(messages, **kwargs):
+        prompt = messages[0]["content"]
+        bullets = [line.strip()[2:] for line in prompt.splitlines() if line.strip().startswith("- ")] or ["new"]
+
+        async def reply():
+            for bullet in bullets:
+                yield json.dumps([{
+                    "section": "experience", "type": "enhance_description", "original": bullet,
+                    "suggested": f"{bullet} (improved)", "reason": "Impact", "impact": "high",
+                }])[1:-1] + ","
+        return reply()
+
+    @pytest.mark.asyncio
+    async def test_all_roles_enhanced_per_bullet(self, resume_data, sample_job_analysis):
+        """Test every role is enhanced with one suggestion per bullet"""
+        with patch("app.optimization.service.stream_llm_response", side_effect=self._reply_per_bullet) as mock_stream:
+            suggestions = await self.service._enhance_experience(resume_data, sample_job_analysis)
+
+        assert mock_stream.call_count == 3
+        assert sorted(s.original for s in suggestions) == ["Built APIs", "Cut costs", "Led platform", "new"]
+
+    def test_bullet_cap_limits_roles(self, resume_data):
+        """Test the bullet budget drops older roles and trims bullets"""
+        with patch("app.optimization.service.settings.optimization_max_experience_bullets", 3):
+            selected = self.service._select_experience(resume_data)
+
+        assert [(item["company"], bullets) for item, bullets in selected] == [
+            ("A", ["Led platform", "Cut costs"]), ("B", ["Built APIs"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self, resume_data, sample_job_analysis):
+        """Test no more than optimization_experience_concurrency roles are in flight"""
+        in_flight = 0
+        peak = 0
+
+        def reply(messages, **kwargs):
+            async def stream():
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                yield "[]"
+            return stream()
+
+        with patch("app.optimization.service.settings.optimization_experience_concurrency", 2), \
+             patch("app.optimization.service.stream_llm_response", side_effect=reply):
+            suggestions = await self.service._enhance_experience(resume_data, sample_job_analysis)
+
+        assert peak == 2
+        assert suggestions[0].reason == "Improve alignment with job requirements"  # fallback
+
+    @pytest.mark.asyncio
+    async def test_llm_errors_propagate(self, resume_data, sample_job_analysis):
+        """Test provider failures are not swallowed by the fan-out"""
+        def reply(messages, **kwargs):
+            async def stream():
+                raise LLMUnavailableError("down")
+                yield  # pragma: no cover
+            return stream()
+
+        with patch("app.optimization.service.stream_llm_response", side_effect=reply):
+            with pytest.raises(LLMUnavailableError):
+                await self.service._enhance_experience(resume_data, sample_job_analysis)
+
+
+def _stream(*chunks):
+    async def reply(messages, **kwargs):
+        for chunk in chunks:
+            yield chunk
+    return reply
+
+
+SINGLE_CALL_REPLY = (
+    "### KEYWORDS\n"
+    '[{"section": "skills", "type": "add_keyword", "original": "Python", "suggested": "Python, Kubernetes",'
+    ' "reason": "Job requires Kubernetes", "impact": "high"}]\n'
+    "### EXPERIENCE\n"
+    '[{"section": "experience", "type": "enhance_description", "original": "Built apps",'
+    ' "suggested": "Built apps serving 1M users", "reason": "Quantified impact", "impact": "high"}]\n'
+    "### INTERVIEW\n"
+    '[{"category": "technical", "question": "How do you roll out on Kubernetes?", "tips": "Mention probes."}]'
+)
+
+
+class TestSingleCallOptimization:
+    """Test the merged single-call optimization mode"""
+
+    def setup_method(self):
+        self.service = OptimizationService()
+
+    @pytest.fixture
+    def job_analysis(self, sample_job_analysis):
+        return {**sample_job_analysis, "technologies": sample_job_analysis["technologies"] + ["Kubernetes"]}
+
+    @pytest.mark.asyncio
+    async def test_sections_streamed_in_order(self, sample_resume_data, job_analysis):
+        """Test one LLM call yields keyword, experience and interview results as they arrive"""
+        # Split mid-marker so section detection must work across chunk boundaries
+        split = SINGLE_CALL_REPLY.index("### EXP") + 5
+        reply = _stream(SINGLE_CALL_REPLY[:split], SINGLE_CALL_REPLY[split:])
+
+        with patch("app.optimization.service.stream_llm_response", side_effect=reply) as mock_stream:
+            updates = [p async for p in self.service.optimize_resume(
+                sample_resume_data, job_analysis, mode="single_call"
+            )]
+
+        mock_stream.assert_called_once()
+        assert mock_stream.call_args.kwargs["call_site"] == "optimization.single_call"
+        assert [u.step for u in updates] == ["analyzing", "keywords", "experience", "complete"]
+        assert updates[1].suggestions[0].suggested == "Python, Kubernetes"
+        assert len(updates[2].suggestions) == 2
+        assert updates[-1].completed is True
+        assert updates[-1].interview_questions[0].question == "How do you roll out on Kubernetes?"
+
+    @pytest.mark.asyncio
+    async def test_bad_section_falls_back(self, sample_resume_data, job_analysis):
+        """Test an invalid or missing section uses that section's fallback only"""
+        reply = SINGLE_CALL_REPLY.split("### INTERVIEW")[0].replace('"impact": "high"}]\n### EXP', '}]\n### EXP')
+
+        with patch("app.optimization.service.stream_llm_response", side_effect=_stream(reply)):
+            updates = [p async for p in self.service.optimize_resume(
+                sample_resume_data, job_analysis, mode="single_call"
+            )]
+
+        final = updates[-1]
+        assert final.suggestions[0].reason == "Failed to parse AI suggestions"
+        assert final.suggestions[1].suggested == "Built apps serving 1M users"
+        assert len(final.interview_questions) == 5
+
+    @pytest.mark.asyncio
+    async def test_mode_defaults_to_settings(self, sample_resume_data, job_analysis):
+        """Test settings.optimization_mode selects the path when no mode is given"""
+        with patch("app.optimization.service.settings.optimization_mode", "single_call"), \
+             patch.object(self.service, "_optimize_single_call") as mock_single:
+            mock_single.return_value.__aiter__.return_value = []
+            [p async for p in self.service.optimize_resume(sample_resume_data, job_analysis)]
+
+        assert mock_single.call_args.args[:2] == (sample_resume_data, job_analysis)
@@ -0,0 +1,130 @@
+"""
+Unit tests for the prepared resume stage shared by every export renderer
+"""
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, AsyncMock
+import pytest
+
+from app.core.config import settings
+from app.export.classic_pdf import render_classic_pdf
+from app.export.prepared import PreparedResume, escape_markup
+from app.export.service import ExportService
+from app.export.workers import render_pool
+
+CATEGORIZED = {"Technical Skills": ["Python"]}
+
+
+def _resume(**overrides):
+    resume = {
+        "personal_info": {"name": "Jane Doe", "email": "jane@example.com"},
+        "experience": [
+            {"title": "R&D Engineer", "company": "AT&T", "duration": "2020", "description": ["Improved <b>throughput"]}
+        ],
+        "skills": {"technical": ["Python"]},
+        "projects": [
+            {"name": "Tracer", "description": "OSS", "github_url": "https://github.com/jane/tracer"},
+            {"name": "Billing", "description": "Internal"},
+        ],
+        "education": [],
+    }
+    resume.update(overrides)
+    return resume
+
+
+class TestEscapeMarkup:
+    """Test ReportLab markup escaping"""
+
+    def test_escapes_nested_strings(self):
+        value = {"a": ["R&D", {"b": "<i>x"}], "gpa": 3.9, "year": None}
+        assert escape_markup(value) == {"a": ["R&amp;D", {"b": "&lt;i&gt;x"}], "gpa": 3.9, "year": None}
+
+    def test_classic_pdf_renders_markup_characters(self):
+        """Test unbalanced tags in resume text no longer break the classic PDF"""
+        prepared = PreparedResume.build("digest", _resume(), CATEGORIZED, [])
+        assert prepared.markup[0]["experience"][0]["description"] == ["Improved &lt;b&gt;throughput"]
+        assert render_classic_pdf(*prepared.markup).startswith(b"%PDF")
+
+
+class TestPrepare:
+    """Test preparation is computed once per resume content"""
+
+    def setup_method(self):
+        self.service = ExportService()
+
+    @pytest.mark.asyncio
+    async def test_prepared_once_per_content(self):
+        with patch.object(self.service, "_deduplicate_and_categorize_skills",
+                          new_callable=AsyncMock, return_value=CATEGORIZED) as categorize:
+            first = await self.service.prepare(_resume())
+            second = await self.service.prepare(_resume())
+            changed = await self.service.prepare(_resume(skills={"technical": ["Go"]}))
+
+        assert first is second
+        assert changed is not first
+        assert categorize.await_count == 2
+        assert [p["name"] for p in first.projects] == ["Billing", "Tracer"]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_of_input(self):
+        resume = _resume()
+        with patch.object(self.service, "_deduplicate_and_categorize_skills",
+                          new_callable=AsyncMock, return_value=CATEGORIZED):
+            prepared = await self.service.prepare(resume)
+        resume["personal_info"]["name"] = "Edited"
+        assert prepared.data["personal_info"]["name"] == "Jane Doe"
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self):
+        with patch.object(settings, "export_prepared_cache_size", 2), \
+             patch.object(self.service, "_deduplicate_and_categorize_skills",
+                          new_callable=AsyncMock, return_value=CATEGORIZED) as categorize:
+            for name in ("A", "B", "A", "C", "A", "B"):
+                await self.service.prepare(_resume(personal_info={"name": name}))
+
+        # A stays cached; B is evicted by C and prepared again
+        assert categorize.await_count == 4
+        assert len(self.service._prepared) == 2
+
+    @pytest.mark.asyncio
+    async def test_formats_share_one_preparation(self):
+        with patch.object(self.service, "_deduplicate_and_categorize_skills",
+                          new_callable=AsyncMock, return_value=CATEGORIZED) as categorize, \
+             patch("app.export.service.html_pdf_renderer.render", new_callable=AsyncMock, side_effect=RuntimeError("down")), \
+             patch.object(render_pool, "_executor", return_value=ThreadPoolExecutor(1)):
+            await self.service._generate_pdf(_resume(), "resume-1", "modern")
+            await self.service._generate_docx(_resume(), "resume-1")
+
+        assert categorize.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_fallback_not_cached(self):
+        """Test skills filed under Other after an LLM failure are retried on the next export"""
+        skills = {"technical": ["Obscure Framework"]}
+        with patch("app.export.service.request_json", new_callable=AsyncMock,
+                   side_effect=[RuntimeError("LLM down"), {"tools": ["Obscure Framework"]}]) as llm:
+            first = await self.service.prepare(_resume(skills=skills))
+            second = await self.service.prepare(_resume(skills=skills))
+            third = await self.service.prepare(_resume(skills=skills))
+
+        assert first.skills == {"Other": ["Obscure Framework"]}
+        assert second.skills == {"Technical Skills": ["Obscure Framework"]}
+        assert third is second
+        assert llm.await_count == 2
+
+
+class TestSkillDeduplication:
+    """Test case-insensitive deduplication keeps the first spelling"""
+
+    @pytest.mark.asyncio
+    async def test_dedup_across_categories(self):
+        service = ExportService()
+        skills = {
+            "technical": ["Python", "python", "Docker"],
+            "tools": ["DOCKER", "Git"],
+            "soft_skills": ["Leadership", "leadership"],
+        }
+        with patch.object(service, "_llm_categorize_skills", new_callable=AsyncMock, return_value={}):
+            result = await service._deduplicate_and_categorize_skills(skills)
+
+        assert result["Technical Skills"] == ["Docker", "Git", "Python"]
+        assert result["Soft Skills"] == ["Leadership"]
@@ -0,0 +1,130 @@
+"""
+Load tests for the export render pool: admission limit, 503 shedding and
+event loop responsiveness while documents render
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, Mock, AsyncMock
+import httpx
+import pytest
+
+from app.export.workers import RenderPool, RenderPoolSaturatedError, render_pool
+from main import app
+
+RESUME = {
+    "personal_info": {"name": "Jane Doe", "email": "jane@example.com"},
+    "experience": [],
+    "skills": {},
+    "projects": [],
+    "education": [],
+}
+
+
+def _slow_render(*args):
+    time.sleep(0.2)
+    return b"%PDF-slow"
+
+
+def _slow_write(out, *args):
+    out.write(_slow_render())
+
+
+def _busy_render(seconds):
+    """CPU-bound stand-in for ReportLab: holds the GIL of whichever process runs it"""
+    deadline = time.process_time() + seconds
+    while time.process_time() < deadline:
+        pass
+    return b"%PDF-busy"
+
+
+async def _max_heartbeat_gap(work) -> float:
+    """Largest gap between 10 ms heartbeats on the event loop while ``work`` runs"""
+    gaps = []
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    try:
+        await work
+    finally:
+        beat.cancel()
+    return max(gaps)
+
+
+class TestRenderPoolAdmission:
+    """Test the queue-depth limit"""
+
+    @pytest.mark.asyncio
+    async def test_rejects_beyond_capacity(self):
+        pool = RenderPool(workers=1, queue_depth=1, retry_after=3)
+        with patch.object(pool, "_executor", return_value=ThreadPoolExecutor(1)):
+            results = await asyncio.gather(*(pool.run(_slow_render) for _ in range(5)), return_exceptions=True)
+
+        assert results.count(b"%PDF-slow") == 2
+        rejected = [r for r in results if isinstance(r, RenderPoolSaturatedError)]
+        assert len(rejected) == 3
+        assert rejected[0].retry_after == 3
+        assert pool.stats() == {"workers": 1, "capacity": 2, "pending": 0, "rejected": 3}
+
+    @pytest.mark.asyncio
+    async def test_slot_freed_after_failure(self):
+        pool = RenderPool(workers=1, queue_depth=0, retry_after=1)
+
+        def failing():
+            raise ValueError("bad document")
+
+        with patch.object(pool, "_executor", return_value=ThreadPoolExecutor(1)):
+            with pytest.raises(ValueError):
+                await pool.run(failing)
+            assert await pool.run(_slow_render) == b"%PDF-slow"
+        assert pool.pending == 0
+
+
+class TestEventLoopResponsiveness:
+    """Test concurrent renders in worker processes leave the event loop free"""
+
+    @pytest.mark.asyncio
+    async def test_loop_keeps_ticking_during_renders(self):
+        pool = RenderPool(workers=2, queue_depth=2, retry_after=1)
+        try:
+            await pool.run(_busy_render, 0)  # spawn the workers outside the measurement
+            gap = await _max_heartbeat_gap(asyncio.gather(*(pool.run(_busy_render, 0.4) for _ in range(4))))
+        finally:
+            pool.shutdown()
+
+        # Rendering inline would block the loop for the whole 0.4 s of each render
+        assert gap < 0.2
+
+
+class TestExportSheddingUnderLoad:
+    """Test a burst of exports gets 503 + Retry-After beyond capacity"""
+
+    @pytest.mark.asyncio
+    async def test_burst_of_exports(self):
+        supabase = Mock()
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+            {"parsed_data": RESUME}
+        ]
+        with patch("app.export.service.get_supabase_service_client", return_value=supabase), \
+             patch("app.export.service.write_classic_pdf", _slow_write), \
+             patch.object(render_pool, "_executor", return_value=ThreadPoolExecutor(1)), \
+             patch.multiple(render_pool, workers=1, queue_depth=1, retry_after=4, rejected=0):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                responses = await asyncio.gather(*(
+                    client.post("/export/pdf", json={"resume_id": "resume-1", "template": "classic"})
+                    for _ in range(6)
+                ))
+
+        statuses = sorted(response.status_code for response in responses)
+        assert statuses == [200, 200, 503, 503, 503, 503]
+        shed = [response for response in responses if response.status_code == 503]
+        assert all(response.headers["Retry-After"] == "4" for response in shed)
+        assert render_pool.pending == 0
@@ -0,0 +1,139 @@
+"""
+Unit tests for the rule-based resume extractor (LLM fast path)
+"""
+from app.resume.extractor import RuleBasedResumeExtractor
+from app.resume.schemas import ResumeData
+
+
+STRUCTURED_RESUME = """JANE SMITH
+Backend Engineer
+jane.smith@example.com | +1 555-987-6543 | Austin, TX
+GitHub: github.com/janesmith | LinkedIn: linkedin.com/in/janesmith
+
+EXPERIENCE
+
+Backend Engineer | DataCorp | Jan 2021 - Present
+• Built event pipelines in Python and Kafka processing 2M+ events daily
+• Cut API latency by 35% with Redis caching
+
+Software Developer | WebShop | 2018 - 2020
+• Maintained Django services backed by PostgreSQL
+
+SKILLS
+
+Programming Languages: Python, Go, SQL
+Frameworks: Django, FastAPI
+Tools: Docker, Kafka, Redis, PostgreSQL
+Soft Skills: Mentoring, Communication
+
+PROJECTS
+
+Log Search | 2022
+• Full-text log search engine written in Go
+• Technologies: Go, Elasticsearch
+• GitHub: github.com/janesmith/log-search
+
+CERTIFICATIONS
+
+AWS Certified Developer
+
+EDUCATION
+
+B.S. Computer Science | University of Texas | 2018
+GPA: 3.6/4.0
+"""
+
+
+class TestRuleBasedResumeExtractor:
+    """Test deterministic section extraction and confidence scoring"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.extractor = RuleBasedResumeExtractor()
+
+    def test_extracts_personal_info(self):
+        """Test header block contact details"""
+        result = self.extractor.extract(STRUCTURED_RESUME)
+        info = result.data["personal_info"]
+
+        assert info["name"] == "Jane Smith"
+        assert info["email"] == "jane.smith@example.com"
+        assert info["location"] == "Austin, TX"
+        assert info["github"] == "https://github.com/janesmith"
+        assert info["linkedin"] == "https://linkedin.com/in/janesmith"
+        assert result.confidence["personal_info"] == 1.0
+
+    def test_extracts_experience_entries(self):
+        """Test pipe-delimited experience headings and bullets"""
+        result = self.extractor.extract(STRUCTURED_RESUME)
+        experience = result.data["experience"]
+
+        assert len(experience) == 2
+        assert experience[0]["title"] == "Backend Engineer"
+        assert experience[0]["company"] == "DataCorp"
+        assert experience[0]["duration"] == "Jan 2021 - Present"
+        assert len(experience[0]["description"]) == 2
+        assert "Kafka" in experience[0]["technologies"]
+        assert result.confidence["experience"] == 1.0
+
+    def test_extracts_skill_buckets(self):
+        """Test labelled skill lines map onto schema buckets"""
+        skills = self.extractor.extract(STRUCTURED_RESUME).data["skills"]
+
+        assert skills["technical"] == ["Python", "Go", "SQL", "Django", "FastAPI"]
+        assert "Docker" in skills["tools"]
+        assert skills["soft_skills"] == ["Mentoring", "Communication"]
+
+    def test_extracts_projects_and_stops_at_unknown_section(self):
+        """Test project fields; CERTIFICATIONS must not leak into projects"""
+        projects = self.extractor.extract(STRUCTURED_RESUME).data["projects"]
+
+        assert len(projects) == 1
+        assert projects[0]["name"] == "Log Search"
+        assert projects[0]["technologies"] == ["Go", "Elasticsearch"]
+        assert projects[0]["github_url"] == "https://github.com/janesmith/log-search"
+
+    def test_extracts_education(self):
+        """Test degree, institution, year and GPA"""
+        education = self.extractor.extract(STRUCTURED_RESUME).data["education"]
+
+        assert education == [{
+            "degree": "B.S. Computer Science",
+            "institution": "University of Texas",
+            "graduation_year": "2018",
+            "gpa": "3.6/4.0",
+        }]
+
+    def test_output_validates_against_schema(self):
+        """Test fast-path output is a valid ResumeData payload"""
+        data = self.extractor.extract(STRUCTURED_RESUME).data
+        resume = ResumeData(id="test", **data)
+        assert resume.personal_info.name == "Jane Smith"
+
+    def test_markdown_headers_from_pdf(self):
+        """Test '## HEADER' lines produced by _parse_pdf are recognised"""
+        markdown = STRUCTURED_RESUME.replace("\nEXPERIENCE\n", "\n## EXPERIENCE\n")
+        result = self.extractor.extract(markdown)
+        assert len(result.data["experience"]) == 2
+
+    def test_unstructured_text_has_low_confidence(self):
+        """Test free-form text falls back to the LLM for every field"""
+        result = self.extractor.extract("I am a developer who likes Python and cloud things.")
+
+        assert result.overall_confidence == 0.0
+        assert result.low_confidence_fields(0.8) == [
+            "personal_info", "experience", "skills", "projects", "education"
+        ]
+
+    def test_missing_section_is_low_confidence(self):
+        """Test only the missing section is flagged for the LLM"""
+        markdown = STRUCTURED_RESUME.split("PROJECTS")[0]
+        result = self.extractor.extract(markdown)
+
+        assert result.low_confidence_fields(0.8) == ["projects", "education"]
+
+    def test_github_url_fallback(self):
+        """Test github_url from the upload form fills a missing profile link"""
+        markdown = STRUCTURED_RESUME.replace("GitHub: github.com/janesmith | ", "")
+        result = self.extractor.extract(markdown, github_url="https://github.com/jane")
+        assert result.data["personal_info"]["github"] == "https://github.com/jane"
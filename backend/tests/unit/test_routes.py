@@ -8,6 +8,7 @@ from fastapi.testclient import TestClient
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from app.export.output import ExportFile
 from main import app
 
 client = TestClient(app)
@@ -131,14 +132,35 @@ class TestOptimizationRoutes:
         data = response.json()
         assert data["cover_letter"] == "Test cover letter"
 
+    @patch('app.optimization.service.optimization_service.get_resume_job_data', new_callable=AsyncMock)
+    def test_stream_cover_letter_success(self, mock_get_data):
+        """Test cover letter chunks are streamed as SSE events"""
+        mock_get_data.return_value = ({}, {})
+
+        async def mock_stream(resume_data, job_analysis, **kwargs):
+            yield "Dear "
+            yield "Hiring Manager"
+
+        with patch('app.optimization.service.optimization_service.stream_cover_letter', mock_stream):
+            response = client.post("/optimize/cover-letter/stream", json={
+                "resume_id": "550e8400-e29b-41d4-a716-446655440000",
+                "job_id": "550e8400-e29b-41d4-a716-446655440001"
+            })
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert 'data: {"chunk": "Dear "}' in response.text
+        assert '"completed": true' in response.text
+        assert response.text.endswith("data: [DONE]\n\n")
+
 
 class TestExportRoutes:
     """Test export routes"""
 
-    @patch('app.export.service.export_service.export_resume', new_callable=AsyncMock)
+    @patch('app.export.service.export_service.export_file', new_callable=AsyncMock)
     def test_export_pdf_success(self, mock_export):
         """Test successful PDF export"""
-        mock_export.return_value = (
+        mock_export.return_value = ExportFile.from_bytes(
             b"PDF content", "application/pdf", "resume.pdf"
         )
         
@@ -148,11 +170,13 @@ class TestExportRoutes:
         
         assert response.status_code == 200
         assert response.headers["content-type"] == "application/pdf"
+        assert response.headers["content-length"] == str(len(b"PDF content"))
+        assert response.content == b"PDF content"
 
-    @patch('app.export.service.export_service.export_resume', new_callable=AsyncMock)
+    @patch('app.export.service.export_service.export_file', new_callable=AsyncMock)
     def test_export_docx_success(self, mock_export):
         """Test successful DOCX export"""
-        mock_export.return_value = (
+        mock_export.return_value = ExportFile.from_bytes(
             b"DOCX content", 
             "application/vnd.openxmlformats-officedocument.wordprocessingml.document", 
             "resume.docx"
@@ -172,7 +196,7 @@ class TestExportRoutes:
         
         assert response.status_code == 422
 
-    @patch('app.export.service.export_service.export_resume', new_callable=AsyncMock)
+    @patch('app.export.service.export_service.export_file', new_callable=AsyncMock)
     def test_export_resume_not_found(self, mock_export):
         """Test export with resume not found"""
         mock_export.side_effect = ValueError("Resume not found")
@@ -0,0 +1,141 @@
+"""
+Unit tests for the optional semantic skill matcher
+"""
+import asyncio
+from unittest.mock import patch
+import pytest
+
+from app.core import skill_embeddings
+from app.core.config import settings
+from app.optimization.service import OptimizationService
+
+# Hand-made 3-d "embeddings": orchestration terms point one way, languages another
+VECTORS = {
+    "kubernetes": [1.0, 0.1, 0.0],
+    "container orchestration": [0.9, 0.2, 0.0],
+    "python": [0.0, 1.0, 0.1],
+    "cobol": [0.0, 0.0, 1.0],
+}
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [VECTORS[text] for text in texts]
+
+
+@pytest.fixture
+def store(tmp_path):
+    pytest.importorskip("numpy")
+    return skill_embeddings.SkillEmbeddingStore(tmp_path / "skills", "fake-model", FakeEmbedder())
+
+
+class TestSkillEmbeddingStore:
+    """Test the float32 store and cosine retrieval"""
+
+    def test_vectors_are_cached_per_key(self, store):
+        np = pytest.importorskip("numpy")
+        store.vectors_for(["kubernetes", "python"])
+        store.vectors_for(["python", "container orchestration"])
+
+        assert store.embed.calls == [["kubernetes", "python"], ["container orchestration"]]
+        assert store.vectors.dtype == np.float32
+        assert np.allclose(np.linalg.norm(store.vectors, axis=1), 1.0)
+
+    def test_top_k_orders_by_cosine(self, store):
+        ranked = store.top_k("container orchestration", ["python", "kubernetes", "cobol"], k=2)
+
+        assert [key for key, _ in ranked] == ["kubernetes", "python"]
+        assert ranked[0][1] > 0.95
+
+    def test_store_persists_across_instances(self, store, tmp_path):
+        store.vectors_for(["kubernetes"])
+
+        reloaded = skill_embeddings.SkillEmbeddingStore(tmp_path / "skills", "fake-model", FakeEmbedder())
+        reloaded.vectors_for(["kubernetes"])
+        assert reloaded.embed.calls == []
+
+        other_model = skill_embeddings.SkillEmbeddingStore(tmp_path / "skills", "other-model", FakeEmbedder())
+        other_model.vectors_for(["kubernetes"])
+        assert other_model.embed.calls == [["kubernetes"]]
+
+    def test_nearest_batches_and_persists_only_candidates(self, store, tmp_path):
+        nearest = store.nearest(["container orchestration", "cobol"], ["kubernetes", "python"])
+
+        assert store.embed.calls == [["kubernetes", "python", "container orchestration", "cobol"]]
+        assert nearest["container orchestration"][0] == "kubernetes"
+        assert list(store.index) == ["kubernetes", "python"]
+
+        store.nearest(["container orchestration"], ["kubernetes"])
+        assert len(store.embed.calls) == 1
+
+        reloaded = skill_embeddings.SkillEmbeddingStore(tmp_path / "skills", "fake-model", FakeEmbedder())
+        assert "cobol" not in reloaded.index
+
+    def test_job_keys_are_bounded(self, tmp_path):
+        pytest.importorskip("numpy")
+        store = skill_embeddings.SkillEmbeddingStore(tmp_path / "skills", "fake-model", FakeEmbedder(), max_transient=1)
+
+        store.nearest(["container orchestration", "cobol"], ["kubernetes"])
+
+        assert list(store.transient) == ["cobol"]
+
+
+class TestSemanticMatching:
+    """Test the ATS score and missing skills use semantic matches"""
+
+    def test_semantic_fallback_after_lexical(self, store):
+        matcher = skill_embeddings.SemanticSkillMatcher(["Kubernetes", "Python"], store, threshold=0.9)
+
+        assert matcher.match("Python") == "python"
+        assert matcher.match("Container Orchestration") == "kubernetes"
+        assert matcher.match("COBOL") is None
+
+    def test_prepare_embeds_keywords_in_one_batch(self, store):
+        matcher = skill_embeddings.SemanticSkillMatcher(["Kubernetes", "Python"], store, threshold=0.9)
+
+        matcher.prepare(["Python", "Container Orchestration", "COBOL"])
+        calls = len(store.embed.calls)
+
+        assert calls == 1
+        assert matcher.match("Container Orchestration") == "kubernetes"
+        assert matcher.match("COBOL") is None
+        assert len(store.embed.calls) == calls
+
+    @pytest.mark.asyncio
+    async def test_service_prepares_matching_off_the_event_loop(self, store):
+        service = OptimizationService()
+        resume = {"skills": {"technical": ["Kubernetes"]}}
+        job = {"required_skills": ["Container orchestration"], "technologies": ["COBOL"]}
+
+        with patch("app.optimization.service.get_skill_store", return_value=store), \
+             patch("app.optimization.service.asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+            matcher = await service._prepared_skill_matcher(resume, job)
+            existing = service._get_existing_skills(resume)
+            with patch.object(store, "nearest", side_effect=AssertionError("matched on the event loop")):
+                score = service._calculate_ats_score(resume, job, matcher=matcher)
+                missing = service._find_missing_skills(job, existing, matcher)
+
+        mock_to_thread.assert_called_once()
+        assert score.keyword_match.matched_keywords == ["container orchestration"]
+        assert missing == {"technologies": ["COBOL"]}
+
+    def test_service_uses_store_when_enabled(self, store):
+        service = OptimizationService()
+        existing = service._get_existing_skills({"skills": {"technical": ["Kubernetes"]}})
+        job = {"required_skills": ["Container orchestration"], "technologies": ["COBOL"]}
+
+        with patch("app.optimization.service.get_skill_store", return_value=store):
+            assert service._keyword_match(existing, job).matched_keywords == ["container orchestration"]
+            assert service._find_missing_skills(job, existing) == {"technologies": ["COBOL"]}
+
+    def test_unavailable_model_falls_back_to_lexical(self):
+        with patch.object(settings, "semantic_matching_enabled", True), \
+             patch.object(skill_embeddings, "_skill_store", None), \
+             patch.object(skill_embeddings, "_store_unavailable", False), \
+             patch.object(skill_embeddings, "_local_embedder", side_effect=ImportError("fastembed")):
+            assert skill_embeddings.get_skill_store() is None
+            assert skill_embeddings._store_unavailable is True
@@ -0,0 +1,100 @@
+"""
+Unit tests for skill normalization, keyword matching and precomputed job keywords
+"""
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.core.skills import SkillMatcher, bounded_distance, canonical_skill, job_keywords, skill_key
+from app.optimization.service import OptimizationService
+
+
+class TestSkillNormalization:
+    """Test alias resolution"""
+
+    def test_aliases_resolve_to_canonical_form(self):
+        assert canonical_skill("k8s") == "Kubernetes"
+        assert canonical_skill(" Postgres ") == "PostgreSQL"
+        assert canonical_skill("Haskell") == "Haskell"
+
+    def test_keys_are_case_insensitive(self):
+        assert skill_key("ReactJS") == skill_key("react") == "react"
+
+    def test_job_keywords_align_with_analysis(self):
+        keywords = job_keywords({
+            "required_skills": ["Postgres", "K8s", "Python"],
+            "technologies": ["PostgreSQL", "Node"],
+        })
+
+        assert keywords["required_skills"] == ["postgresql", "kubernetes", "python"]
+        assert keywords["technologies"] == ["postgresql", "node.js"]
+        assert keywords["all"] == ["kubernetes", "node.js", "postgresql", "python"]
+
+
+class TestAliasAwareScoring:
+    """Test ATS matching uses the normalized keys"""
+
+    def setup_method(self):
+        self.service = OptimizationService()
+        self.job = {"required_skills": ["Postgres", "k8s"], "technologies": ["AWS"]}
+        self.resume = {"skills": {"technical": ["PostgreSQL", "Kubernetes"]}}
+
+    def test_aliases_count_as_matches(self):
+        existing = self.service._get_existing_skills(self.resume)
+
+        match = self.service._keyword_match(existing, self.job)
+        missing = self.service._find_missing_skills(self.job, existing)
+
+        assert sorted(match.matched_keywords) == ["kubernetes", "postgresql"]
+        assert missing == {"technologies": ["AWS"]}
+
+    def test_stored_keywords_are_used(self):
+        job = {**self.job, "keywords": {"required_skills": ["x", "y"], "technologies": ["z"], "all": ["x", "y", "z"]}}
+
+        assert self.service._job_keywords(job) is job["keywords"]
+
+    def test_stale_keywords_are_recomputed(self):
+        job = {**self.job, "keywords": {"required_skills": ["x"], "technologies": [], "all": ["x"]}}
+
+        assert self.service._job_keywords(job) == job_keywords(self.job)
+
+
+class TestSkillMatcher:
+    """Test token-set and bounded edit-distance matching"""
+
+    def setup_method(self):
+        self.skills = ["PostgreSQL", "React", "Kubernetes", "Google Cloud Platform", "MySQL", "Machine Learning"]
+        self.matcher = SkillMatcher(self.skills)
+
+    def test_token_set_ignores_order_punctuation_and_js_suffix(self):
+        assert self.matcher.match("React JS") == "react"
+        assert self.matcher.match("machine-learning") == "machine learning"
+        assert self.matcher.match("Platform Google Cloud") == "gcp"
+
+    def test_typos_within_budget_match(self):
+        assert self.matcher.match("Kubernets") == "kubernetes"
+        assert self.matcher.match("PostgresQL 15") is None  # extra token, not a typo
+
+    def test_short_names_never_fuzzy_match(self):
+        assert self.matcher.match("MSSQL") is None
+        assert self.matcher.match("Reakt") is None
+
+    def test_exact_mode_only_resolves_aliases(self):
+        exact = SkillMatcher(self.skills, mode="exact")
+
+        assert exact.match("postgres") == "postgresql"
+        assert exact.match("React JS") is None
+        assert exact.match("Kubernets") is None
+
+    def test_bounded_distance(self):
+        assert bounded_distance("kubernetes", "kubernets", 1) == 1
+        assert bounded_distance("kubernetes", "kubernates", 1) == 1
+        assert bounded_distance("terraform", "terrafrm2", 1) is None
+
+    def test_ats_mode_is_selectable(self):
+        service = OptimizationService()
+        existing = service._get_existing_skills({"skills": {"technical": ["Kubernetes"]}})
+        job = {"required_skills": ["kubernets"], "technologies": []}
+
+        assert service._keyword_match(existing, job).matched == 1
+        with patch.object(settings, "ats_keyword_matching", "exact"):
+            assert service._keyword_match(existing, job).matched == 0
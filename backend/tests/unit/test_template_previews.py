@@ -0,0 +1,115 @@
+"""
+Unit tests for template preview thumbnails
+"""
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, AsyncMock
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.export.previews import PreviewUnavailableError, SAMPLE_RESUME, TemplatePreviews, rasterize_first_page, template_previews
+from app.export.classic_pdf import render_classic_pdf
+from app.export.registry import template_registry
+from app.export.workers import render_pool
+from main import app
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture
+def thread_pool():
+    with patch.object(render_pool, "_executor", return_value=ThreadPoolExecutor(2)):
+        yield
+
+
+class TestRasterize:
+    """Test PDF first page to PNG"""
+
+    def test_png_of_requested_width(self):
+        pdf = render_classic_pdf({"personal_info": {"name": "Alex"}}, {}, [])
+        png = rasterize_first_page(pdf, 120)
+
+        assert png.startswith(PNG_SIGNATURE)
+        assert Image.open(io.BytesIO(png)).width == 120
+
+
+class TestTemplatePreviews:
+    """Test thumbnails are rendered once per template version"""
+
+    @pytest.mark.asyncio
+    async def test_rendered_once_and_reused(self, tmp_path, thread_pool):
+        previews = TemplatePreviews(tmp_path, 120)
+        with patch.object(previews, "_render", wraps=previews._render) as render:
+            paths = await asyncio.gather(*(previews.get("classic") for _ in range(3)))
+            again = await TemplatePreviews(tmp_path, 120).get("classic")
+
+        assert render.await_count == 1
+        assert paths[0].read_bytes().startswith(PNG_SIGNATURE)
+        assert again == paths[0]
+        assert paths[0].name == f"classic-{template_registry.version('classic')}.png"
+
+    @pytest.mark.asyncio
+    async def test_new_version_replaces_old_thumbnail(self, tmp_path, thread_pool):
+        previews = TemplatePreviews(tmp_path, 120)
+        old = await previews.get("classic")
+        with patch.object(template_registry, "version", return_value="v2"):
+            new = await previews.get("classic")
+
+        assert new.name == "classic-v2.png"
+        assert not old.exists()
+
+    @pytest.mark.asyncio
+    async def test_html_template_without_renderer(self, tmp_path):
+        previews = TemplatePreviews(tmp_path, 120)
+        with patch("app.export.previews.html_pdf_renderer.render", new_callable=AsyncMock, side_effect=RuntimeError("no pango")):
+            with pytest.raises(PreviewUnavailableError):
+                await previews.get("modern")
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_html_template_rendered_from_sample(self, tmp_path, thread_pool):
+        previews = TemplatePreviews(tmp_path, 120)
+        pdf = render_classic_pdf({"personal_info": {"name": "Alex"}}, {}, [])
+        with patch("app.export.previews.html_pdf_renderer.render", new_callable=AsyncMock, return_value=pdf) as render:
+            path = await previews.get("modern")
+
+        assert SAMPLE_RESUME["personal_info"]["name"] in render.await_args.args[0]
+        assert path.read_bytes().startswith(PNG_SIGNATURE)
+
+    def test_version_tracks_template_files(self):
+        assert template_registry.version("modern") != template_registry.version("classic")
+        assert template_registry.version("modern") == template_registry.version("modern")
+
+
+class TestPreviewRoute:
+    """Test the preview endpoint and template listing"""
+
+    def setup_method(self):
+        self.client = TestClient(app)
+
+    def test_serves_png_with_long_cache(self, tmp_path, thread_pool):
+        with patch.object(template_previews, "directory", tmp_path):
+            response = self.client.get("/export/templates/classic/preview")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert response.content.startswith(PNG_SIGNATURE)
+
+    def test_unknown_template(self):
+        assert self.client.get("/export/templates/nope/preview").status_code == 404
+
+    def test_unavailable_preview(self, tmp_path):
+        with patch.object(template_previews, "directory", tmp_path), \
+             patch("app.export.previews.html_pdf_renderer.render", new_callable=AsyncMock, side_effect=RuntimeError("no pango")):
+            response = self.client.get("/export/templates/modern/preview")
+
+        assert response.status_code == 503
+
+    def test_templates_list_versioned_preview_urls(self):
+        templates = {t["id"]: t for t in self.client.get("/export/templates").json()}
+        version = template_registry.version("modern")
+
+        assert templates["modern"]["preview_image"] == f"/export/templates/modern/preview?v={version}"
@@ -0,0 +1,126 @@
+"""
+Unit tests for the export template registry
+"""
+import json
+from unittest.mock import patch, AsyncMock
+import pytest
+from fastapi.testclient import TestClient
+from jinja2 import DictLoader
+from pydantic import ValidationError
+
+from app.export import rendering
+from app.export.registry import TemplateRegistry, TemplateSpec, template_registry
+from app.export.rendering import TEMPLATES_DIR, get_template
+from app.export.schemas import ExportRequest
+from app.export.service import ExportService
+from main import app
+
+RESUME = {
+    "personal_info": {"name": "Jane Doe", "email": "jane@example.com"},
+    "experience": [],
+    "skills": {},
+    "projects": [],
+    "education": [],
+}
+
+# A template dropped in as a Jinja file rather than a built-in builder
+MINIMAL = TemplateSpec(id="minimal", name="Minimal", description="", engine="html", formats=("pdf",), html="minimal.html")
+
+
+@pytest.fixture
+def minimal_html():
+    get_template.cache_clear()
+    loader = DictLoader({"minimal.html": "<html><style>{{ css }}</style><h1>{{ personal['name'] }}</h1></html>"})
+    with patch.object(rendering._env, "loader", loader):
+        yield
+    get_template.cache_clear()
+
+
+class TestDiscovery:
+    """Test templates are discovered from manifests"""
+
+    def test_builtin_templates(self):
+        registry = TemplateRegistry(TEMPLATES_DIR)
+
+        assert registry.ids() == ["classic", "modern"]
+        assert registry.get("classic").formats == ("pdf", "docx")
+        assert registry.get("modern").engine == "html"
+
+    def test_invalid_manifest_skipped(self, tmp_path):
+        (tmp_path / "good.json").write_text(json.dumps({"name": "Good", "engine": "reportlab"}))
+        (tmp_path / "bad.json").write_text(json.dumps({"name": "Bad", "engine": "latex"}))
+        (tmp_path / "broken.json").write_text("{")
+
+        assert TemplateRegistry(tmp_path).ids() == ["good"]
+
+    def test_unknown_template(self):
+        with pytest.raises(ValueError, match="Unknown template"):
+            template_registry.get("nope")
+
+    def test_unknown_builder_skipped(self, tmp_path):
+        (tmp_path / "fancy.json").write_text(json.dumps({"name": "Fancy", "engine": "html", "builder": "nope"}))
+
+        assert TemplateRegistry(tmp_path).ids() == []
+
+    def test_compiled_lazily_and_cached(self, minimal_html):
+        registry = TemplateRegistry(TEMPLATES_DIR)
+        registry.specs()
+        assert get_template.cache_info().currsize == 0
+
+        with patch.object(registry, "_specs", {**registry.specs(), "minimal": MINIMAL}):
+            first = registry.compiled("minimal")
+            assert registry.compiled("minimal") is first
+        assert get_template.cache_info().misses == 1
+
+    def test_builtin_html_template_uses_builder(self):
+        registry = TemplateRegistry(TEMPLATES_DIR)
+        html = registry.render_html("modern", RESUME, {"Technical Skills": ["Go"]}, [])
+
+        assert registry.get("modern").builder == "modern"
+        assert "Jane Doe" in html and str(registry.stylesheet("modern")) in html
+        with pytest.raises(ValueError, match="not rendered from a Jinja file"):
+            registry.compiled("modern")
+
+    def test_render_cost(self):
+        registry = TemplateRegistry(TEMPLATES_DIR)
+        assert registry.render_cost("modern") == {"tier": "high", "renders": 0, "mean_ms": None}
+
+        registry.record_render("classic", 0.02)
+        registry.record_render("classic", 0.04)
+        assert registry.render_cost("classic") == {"tier": "low", "renders": 2, "mean_ms": 30.0}
+
+
+class TestRegisteredTemplates:
+    """Test requests and rendering go through the registry"""
+
+    def test_request_rejects_unknown_template(self):
+        with pytest.raises(ValidationError):
+            ExportRequest(resume_id="r1", template="nope")
+        assert ExportRequest(resume_id="r1", template="modern").template == "modern"
+
+    def test_export_route_rejects_unknown_template(self):
+        response = TestClient(app).post("/export/pdf", json={"resume_id": "r1", "template": "nope"})
+        assert response.status_code == 422
+
+    def test_templates_endpoint_reports_capabilities(self):
+        response = TestClient(app).get("/export/templates")
+
+        assert response.status_code == 200
+        templates = {template["id"]: template for template in response.json()}
+        assert templates["classic"]["formats"] == ["pdf", "docx"]
+        assert templates["modern"]["engine"] == "html"
+        assert templates["modern"]["render_cost"]["tier"] == "high"
+
+    @pytest.mark.asyncio
+    async def test_new_html_template_needs_no_service_change(self, minimal_html):
+        """Test a template added to the registry renders through the html engine"""
+        service = ExportService()
+        specs = {**template_registry.specs(), "minimal": MINIMAL}
+        with patch.object(template_registry, "_specs", specs), \
+             patch.object(service, "_deduplicate_and_categorize_skills", new_callable=AsyncMock, return_value={}), \
+             patch("app.export.service.html_pdf_renderer.render", new_callable=AsyncMock, return_value=b"%PDF-minimal") as render:
+            content, content_type, filename = await service._generate_pdf(RESUME, "r1", "minimal")
+
+        assert content == b"%PDF-minimal"
+        assert filename == "Jane_Doe_resume_minimal.pdf"
+        assert "Jane Doe" in render.await_args.args[0]
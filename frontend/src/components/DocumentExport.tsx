@@ -20,7 +20,7 @@ const TEMPLATES = [
   {
     id: 'modern' as TemplateType,
     name: 'Modern Professional',
-    description: 'Clean design with accent colors. Opens print dialog.',
+    description: 'Clean design with accent colors. Direct PDF download.',
     icon: Sparkles,
     color: 'blue',
   },
@@ -127,7 +127,7 @@ export const DocumentExport = ({ resumeId }: DocumentExportProps) => {
               <h3 className="font-semibold text-gray-900 dark:text-gray-100">PDF Format</h3>
               <p className="text-sm text-gray-600 dark:text-gray-400">
                 {selectedTemplate === 'modern'
-                  ? 'Opens print dialog for PDF save'
+                  ? 'Styled layout, direct download'
                   : 'ATS-friendly, direct download'}
               </p>
             </div>
@@ -160,7 +160,6 @@ export const DocumentExport = ({ resumeId }: DocumentExportProps) => {
         {selectedTemplateInfo && (
           <p className="text-xs text-gray-500 dark:text-gray-400 mt-4 text-center">
             Using <span className="font-medium">{selectedTemplateInfo.name}</span> template
-            {selectedTemplate === 'modern' && ' - A new tab will open for printing'}
           </p>
         )}
       </div>
@@ -59,6 +59,11 @@ export const OptimizationDisplay = ({ resumeData, jobAnalysis }: OptimizationDis
           if (line.startsWith('data: ')) {
             try {
               const data = JSON.parse(line.slice(6));
+              if (data.error) {
+                setError(data.error);
+                setIsOptimizing(false);
+                return;
+              }
               setCurrentProgress(data);
               if (data.suggestions?.length > 0) {
                 setAllSuggestions(data.suggestions);
@@ -206,11 +206,20 @@ export const optimizationApi = {
   },
 };
 
+export interface TemplateRenderCost {
+  tier: 'low' | 'high';
+  renders: number;
+  mean_ms: number | null;
+}
+
 export interface TemplateInfo {
   id: string;
   name: string;
   description: string;
   preview_image: string | null;
+  engine: string;
+  formats: Array<'pdf' | 'docx'>;
+  render_cost: TemplateRenderCost;
 }
 
 export const exportApi = {
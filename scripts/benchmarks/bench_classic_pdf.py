@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark classic (ReportLab) PDF export for batches of 1, 10 and 100 resumes.
+
+Reports wall-clock milliseconds per document for each batch size. Skill
+categorization is done up front, so only PDF building is measured.
+
+Modes:
+- setup per export: the style sheet is rebuilt for every document (the
+  behaviour before styles were cached at module level)
+- cached styles: documents rendered one by one, styles built once
+- render pool: one spooled job per document in warm worker processes, as
+  bulk export renders them (--workers, default 1)
+
+Usage:
+    python scripts/benchmarks/bench_classic_pdf.py
+    python scripts/benchmarks/bench_classic_pdf.py --sizes 1 10 100 1000 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+sys.path.insert(0, str(ROOT / "backend"))
+# Settings require these at import time; nothing here talks to a service
+for var in ("SUPABASE_URL", "SUPABASE_KEY", "SUPABASE_SERVICE_KEY", "CLAUDE_API_KEY"):
+    os.environ.setdefault(var, "benchmark")
+
+from app.export.classic_pdf import classic_styles  # noqa: E402
+from app.export.classic_pdf import render_classic_pdf  # noqa: E402
+from app.export.classic_pdf import write_classic_pdf  # noqa: E402
+from app.export.output import write_to_spool  # noqa: E402
+from app.export.workers import RenderPool  # noqa: E402
+
+SKILLS = {"Technical Skills": ["Python", "Go", "Kafka", "PostgreSQL", "Kubernetes"], "Soft Skills": ["Mentoring"]}
+
+
+def resume(i: int) -> dict:
+    return {
+        "personal_info": {"name": f"Alex Example {i}", "email": "alex@example.com", "phone": "+1 555 0100", "location": "Berlin"},
+        "experience": [
+            {
+                "title": f"Senior Engineer {r}", "company": f"Company {r}", "duration": "2019 - 2023",
+                "description": [f"Delivered project {r}.{b}, cutting p95 latency by {b * 3}%" for b in range(5)],
+            }
+            for r in range(4)
+        ],
+        "skills": {"technical_skills": SKILLS["Technical Skills"]},
+        "projects": [
+            {"name": f"Project {p}", "description": "Open-source tooling for distributed tracing", "technologies": ["Go", "Kafka"]}
+            for p in range(3)
+        ],
+        "education": [{"degree": "MSc Computer Science", "institution": "TU Berlin", "graduation_year": "2015"}],
+    }
+
+
+def per_export_setup(documents) -> None:
+    for document in documents:
+        classic_styles.cache_clear()
+        render_classic_pdf(*document)
+
+
+def cached_styles(documents) -> None:
+    for document in documents:
+        render_classic_pdf(*document)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    pool = RenderPool(workers=args.workers, queue_depth=max(args.sizes))
+    pool.start()
+    spool_dir = tempfile.mkdtemp(prefix="bench-classic-pdf-")
+    warm = (resume(0), SKILLS, resume(0)["projects"])
+    asyncio.run(pool.run(render_classic_pdf, *warm))
+    render_classic_pdf(*warm)
+
+    def render_pool(documents) -> None:
+        async def run_all():
+            return await asyncio.gather(
+                *(pool.run(write_to_spool, write_classic_pdf, spool_dir, *document) for document in documents)
+            )
+
+        for path, _ in asyncio.run(run_all()):
+            os.unlink(path)
+
+    modes = [("setup per export", per_export_setup), ("cached styles", cached_styles), (f"render pool, {args.workers} worker(s)", render_pool)]
+    print(f"{'mode':<26}" + "".join(f"{f'{n} docs':>12}" for n in args.sizes))
+    print("-" * (26 + 12 * len(args.sizes)))
+    try:
+        for label, run in modes:
+            row = f"{label:<26}"
+            for size in args.sizes:
+                documents = [(resume(i), SKILLS, resume(i)["projects"]) for i in range(size)]
+                start = time.perf_counter()
+                run(documents)
+                row += f"{(time.perf_counter() - start) * 1000 / size:>12.2f}"
+            print(row)
+    finally:
+        pool.shutdown()
+        os.rmdir(spool_dir)
+    print("-" * (26 + 12 * len(args.sizes)))
+    print("Wall-clock ms per document; worker processes are started and warmed before timing.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark the export HTML builders on large synthetic resumes.
+
+Renders every builder (ats, printable, simple, modern) for resumes with
+many roles, bullets and projects, and reports CPU time and peak traced
+allocation per render. Skill categorization is stubbed so only HTML
+building is measured; the current modern builder renders from a resume
+prepared once up front (categorized skills, sorted projects), as every
+format and template of an export shares one.
+
+The current builders (escaped f-strings, CSS minified once) are compared
+with ExportService at a git revision: by default the last one with the
+original unescaped builders (BASELINE_REV); ``--baseline REV`` picks
+another one, e.g. the Jinja template version.
+
+Usage:
+    python scripts/benchmarks/bench_export_render.py
+    python scripts/benchmarks/bench_export_render.py --baseline <rev> --roles 40
+"""
+
+import argparse
+import asyncio
+import functools
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+sys.path.insert(0, str(ROOT / "backend"))
+# Settings require these at import time; nothing here talks to a service
+for var in ("SUPABASE_URL", "SUPABASE_KEY", "SUPABASE_SERVICE_KEY", "CLAUDE_API_KEY"):
+    os.environ.setdefault(var, "benchmark")
+
+from app.export import rendering  # noqa: E402
+from app.export.service import ExportService  # noqa: E402
+
+# Last revision with the original (unescaped) f-string HTML builders
+BASELINE_REV = "e775c49"
+
+BUILDERS = ("_build_html", "_build_printable_html", "_build_simple_html", "_build_modern_html")
+
+
+def large_resume(roles: int, bullets: int, projects: int) -> dict:
+    return {
+        "personal_info": {
+            "name": "Alex Example", "email": "alex@example.com", "phone": "+1 555 0100",
+            "location": "Berlin & Remote", "github": "https://github.com/alex",
+            "linkedin": "https://linkedin.com/in/alex",
+        },
+        "summary": "Platform engineer focused on reliability <and> developer experience. " * 3,
+        "experience": [
+            {
+                "title": f"Senior Engineer {i}", "company": f"Company {i} & Co", "duration": "2019 - 2023",
+                "description": [f"Delivered project {i}.{j}, cutting p95 latency by {j * 3}% for 2M users" for j in range(bullets)],
+            }
+            for i in range(roles)
+        ],
+        "skills": {"technical": [f"Skill {i}" for i in range(60)], "soft_skills": ["Mentoring", "Writing"]},
+        "projects": [
+            {
+                "name": f"Project {i}", "description": "Open-source tooling for distributed tracing " * 2,
+                "technologies": ["Go", "Kafka", "PostgreSQL"], "github_url": f"https://github.com/alex/p{i}",
+            }
+            for i in range(projects)
+        ],
+        "education": [{"degree": "MSc Computer Science", "institution": "TU Berlin", "graduation_year": "2015", "gpa": "1.3"}],
+        "certifications": [{"name": "CKA", "issuer": "CNCF", "date": "2022"}],
+    }
+
+
+async def _categorized(skills):
+    return {"Technical Skills": sorted(skills.get("technical", [])), "Soft Skills": skills.get("soft_skills", [])}
+
+
+def measure(service, builder: str, resume: dict, repeats: int) -> tuple[float, float]:
+    """Mean CPU ms per render, and traced peak KiB of one render (traced separately)"""
+    method = getattr(service, builder)
+    run = (lambda: asyncio.run(method(resume))) if asyncio.iscoroutinefunction(method) else (lambda: method(resume))
+    run()  # warm caches
+    start = time.process_time()
+    for _ in range(repeats):
+        run()
+    cpu = (time.process_time() - start) * 1000 / repeats
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def load_baseline(rev: str):
+    """ExportService class from service.py at a git revision"""
+    source = subprocess.run(
+        ["git", "show", f"{rev}:backend/app/export/service.py"], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as handle:
+        handle.write(source)
+    spec = importlib.util.spec_from_file_location("baseline_export_service", handle.name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    service = module.ExportService()
+    # The templates directory (modern.css) is shared with the current tree
+    service.templates_dir = rendering.TEMPLATES_DIR
+    return service
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--roles", type=int, default=25)
+    parser.add_argument("--bullets", type=int, default=8)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--baseline", default=BASELINE_REV, help="git revision to compare against")
+    args = parser.parse_args()
+
+    resume = large_resume(args.roles, args.bullets, args.projects)
+    service = ExportService()
+    service._deduplicate_and_categorize_skills = _categorized
+    prepared = asyncio.run(service.prepare(resume))
+    service._build_modern_html = functools.partial(service._build_modern_html, prepared=prepared)
+
+    baseline = load_baseline(args.baseline)
+    baseline._deduplicate_and_categorize_skills = _categorized
+    variants = [(f"baseline {args.baseline[:10]}", baseline), ("current", service)]
+
+    print(f"{'builder':<24}{'variant':<22}{'cpu ms':>9}{'peak KiB':>10}{'vs base':>9}")
+    print("-" * 74)
+    for builder in BUILDERS:
+        base_cpu = None
+        for label, target in variants:
+            cpu, peak = measure(target, builder, resume, args.repeats)
+            base_cpu = base_cpu or cpu
+            print(f"{builder:<24}{label:<22}{cpu:>9.2f}{peak:>10.0f}{cpu / base_cpu:>8.1f}x")
+    print("-" * 74)
+    print(f"{args.roles} roles x {args.bullets} bullets, {args.projects} projects; "
+          f"mean of {args.repeats} renders, skill categorization stubbed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+A/B benchmark of the multi-call and single-call optimization modes.
+
+Both modes run through OptimizationService.optimize_resume over every
+resume x job pair in the fixture corpus (resumes/*.expected.json and
+jobs/*.analysis.json), so the benchmark measures the prompts production sends.
+
+Modes:
+- default: offline comparison - LLM round trips and estimated prompt tokens
+  per optimization for each mode
+- --record FILE: call the provider (needs CLAUDE_API_KEY) in both modes and
+  save latency, time to first suggestion, per call site token usage and the
+  generated suggestions to FILE. The UI pacing sleeps of the multi-call path
+  are skipped so only LLM time is measured.
+- --replay FILE: summarise a recording - latency, tokens, cost and quality
+  proxies (missing-skill coverage, interview questions that mention the job's
+  technologies, fallback rate)
+
+Usage:
+    python scripts/benchmarks/bench_optimization_modes.py
+    python scripts/benchmarks/bench_optimization_modes.py --record scripts/benchmarks/fixtures/optimization_modes.json
+    python scripts/benchmarks/bench_optimization_modes.py --replay scripts/benchmarks/fixtures/optimization_modes.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[2]
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+sys.path.insert(0, str(ROOT / "backend"))
+# Settings require these at import time; only --record talks to the provider
+for var in ("SUPABASE_URL", "SUPABASE_KEY", "SUPABASE_SERVICE_KEY", "CLAUDE_API_KEY"):
+    os.environ.setdefault(var, "benchmark")
+
+from app.core.config import settings  # noqa: E402
+from app.core.llm_routing import get_route_stats, route_stats  # noqa: E402
+from app.core.llm_scheduler import estimate_tokens  # noqa: E402
+from app.optimization import service as optimization_module  # noqa: E402
+
+MODES = ("multi_call", "single_call")
+
+
+def load_resume(path: Path) -> dict:
+    """Annotated parser fixture as stored resume data (skills flattened in the fixture)"""
+    resume = json.loads(path.read_text())
+    return {**resume, "skills": {"technical": resume.get("skills", [])}}
+
+
+def load_pairs() -> list[tuple[str, dict, dict]]:
+    resumes = sorted((FIXTURES_DIR / "resumes").glob("*.expected.json"))
+    jobs = sorted((FIXTURES_DIR / "jobs").glob("*.analysis.json"))
+    return [
+        (f"{r.name.split('.')[0]} x {j.name.split('.')[0]}", load_resume(r), json.loads(j.read_text()))
+        for r in resumes for j in jobs
+    ]
+
+
+async def _no_pacing(delay, result=None):
+    return result
+
+
+async def run_mode(mode: str, resume: dict, job: dict) -> dict:
+    """One optimization; returns timings and the final suggestions"""
+    start = time.perf_counter()
+    first_suggestion = None
+    final = None
+    with patch.object(optimization_module.asyncio, "sleep", _no_pacing):
+        async for progress in optimization_module.optimization_service.optimize_resume(resume, job, mode=mode):
+            if first_suggestion is None and progress.suggestions:
+                first_suggestion = time.perf_counter() - start
+            final = progress
+    return {
+        "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        "first_suggestion_ms": round((first_suggestion or 0) * 1000, 1),
+        "suggestions": [s.model_dump() for s in final.suggestions],
+        "interview_questions": [q.model_dump() for q in final.interview_questions or []],
+    }
+
+
+async def compare_offline(pairs) -> None:
+    """Count round trips and prompt tokens with a stub that returns empty sections"""
+    captured: dict[str, list[list[dict]]] = {mode: [] for mode in MODES}
+    current = {"mode": MODES[0]}
+
+    async def stub(messages, **kwargs):
+        captured[current["mode"]].append(messages)
+        yield "### KEYWORDS\n[]\n### EXPERIENCE\n[]\n### INTERVIEW\n[]" if current["mode"] == "single_call" else "[]"
+
+    with patch.object(optimization_module, "stream_llm_response", stub):
+        for mode in MODES:
+            current["mode"] = mode
+            for _, resume, job in pairs:
+                await run_mode(mode, resume, job)
+
+    print(f"{'mode':<14}{'calls/opt':>10}{'prompt tok/opt':>16}{'vs multi':>10}")
+    print("-" * 50)
+    baseline = None
+    for mode in MODES:
+        calls = len(captured[mode]) / len(pairs)
+        tokens = sum(estimate_tokens(m) for m in captured[mode]) / len(pairs)
+        baseline = baseline or tokens
+        print(f"{mode:<14}{calls:>10.1f}{tokens:>16.0f}{tokens / baseline:>10.0%}")
+    print("-" * 50)
+    print(f"{len(pairs)} resume x job pairs; token counts are estimates (~4 chars/token), "
+          "prompt side only. Use --record for latency, output tokens and quality.")
+
+
+async def record(pairs, output: Path, repeats: int) -> None:
+    settings.llm_cache_enabled = False
+    samples = []
+    for name, resume, job in pairs:
+        for mode in MODES:
+            for attempt in range(repeats):
+                route_stats.clear()
+                result = await run_mode(mode, resume, job)
+                usage = {
+                    site: {key: stats[key] for key in ("calls", "input_tokens", "output_tokens", "cost_usd")}
+                    for site, stats in get_route_stats().items() if site.startswith("optimization.")
+                }
+                samples.append({"pair": name, "mode": mode, "attempt": attempt, "usage": usage,
+                                "job": job, "resume_skills": resume.get("skills", {}), **result})
+                print(f"  {name} {mode} #{attempt}: {result['latency_ms']} ms, "
+                      f"first suggestion {result['first_suggestion_ms']} ms")
+
+    output.write_text(json.dumps({"recorded_at": time.strftime("%Y-%m-%d"), "samples": samples}, indent=2))
+    print(f"Recorded {len(samples)} samples to {output}")
+
+
+def quality(sample: dict) -> dict:
+    service = optimization_module.optimization_service
+    missing = service._find_missing_skills(sample["job"], service._get_existing_skills({"skills": sample["resume_skills"]}))
+    missing = missing.get("required_skills", []) + missing.get("technologies", [])
+    keyword_text = " ".join(s["suggested"] for s in sample["suggestions"] if s["section"] == "skills").lower()
+    questions = sample["interview_questions"]
+    technologies = [t.lower() for t in sample["job"].get("technologies", [])]
+
+    fallbacks = [s for s in sample["suggestions"] if s["reason"] == "Failed to parse AI suggestions"]
+    default_questions = [q.model_dump() for q in service._default_interview_questions(sample["job"])]
+    return {
+        "coverage": sum(skill.lower() in keyword_text for skill in missing) / len(missing) if missing else 1.0,
+        "tech_questions": sum(any(t in q["question"].lower() for t in technologies) for q in questions) / max(len(questions), 1),
+        "five_questions": len(questions) == 5,
+        "fallback": bool(fallbacks) or questions == default_questions,
+    }
+
+
+def replay(path: Path) -> None:
+    samples = json.loads(path.read_text())["samples"]
+    print(f"{'mode':<14}{'latency':>9}{'p95':>8}{'1st sugg':>10}{'in tok':>8}{'out tok':>9}{'$/opt':>9}"
+          f"{'coverage':>10}{'tech Qs':>9}{'5 Qs':>6}{'fallback':>10}")
+    print("-" * 102)
+    for mode in MODES:
+        group = [s for s in samples if s["mode"] == mode]
+        if not group:
+            continue
+        latencies = [s["latency_ms"] for s in group]
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        scores = [quality(s) for s in group]
+        print(
+            f"{mode:<14}{statistics.mean(latencies):>9.0f}{p95:>8.0f}"
+            f"{statistics.mean(s['first_suggestion_ms'] for s in group):>10.0f}"
+            f"{statistics.mean(sum(u['input_tokens'] for u in s['usage'].values()) for s in group):>8.0f}"
+            f"{statistics.mean(sum(u['output_tokens'] for u in s['usage'].values()) for s in group):>9.0f}"
+            f"{statistics.mean(sum(u['cost_usd'] for u in s['usage'].values()) for s in group):>9.4f}"
+            f"{statistics.mean(q['coverage'] for q in scores):>10.0%}"
+            f"{statistics.mean(q['tech_questions'] for q in scores):>9.0%}"
+            f"{statistics.mean(q['five_questions'] for q in scores):>6.0%}"
+            f"{statistics.mean(q['fallback'] for q in scores):>10.0%}"
+        )
+    print("-" * 102)
+    print("latency columns in ms; streamed token counts are estimates unless the provider reports usage.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--record", type=Path, help="call the provider and save a recording")
+    parser.add_argument("--replay", type=Path, help="summarise a saved recording")
+    parser.add_argument("--repeats", type=int, default=2, help="runs per pair and mode when recording")
+    args = parser.parse_args()
+
+    if args.replay:
+        replay(args.replay)
+        return
+
+    pairs = load_pairs()
+    if args.record:
+        asyncio.run(record(pairs, args.record, args.repeats))
+    else:
+        asyncio.run(compare_offline(pairs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Benchmark provider-side prompt caching on the static system prompts.
+
+Prompts are captured from the real service code paths (resume parsing, job
+analysis, skill categorization) over the fixture corpus, so the benchmark
+always measures what production sends.
+
+Modes:
+- default: offline projection - static vs dynamic prompt tokens per call
+  site, whether the static block reaches the provider's minimum cacheable
+  length, and projected input spend per 1,000 calls with and without caching
+- --record FILE: call the provider (needs CLAUDE_API_KEY) with caching off
+  and on, streaming each prompt to time the first token, and save TTFT,
+  latency and the provider's usage block to FILE
+- --replay FILE: summarise a recording (TTFT and input-token spend)
+
+Usage:
+    python scripts/benchmarks/bench_prompt_cache.py
+    python scripts/benchmarks/bench_prompt_cache.py --record scripts/benchmarks/fixtures/prompt_cache.json
+    python scripts/benchmarks/bench_prompt_cache.py --replay scripts/benchmarks/fixtures/prompt_cache.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+sys.path.insert(0, str(ROOT / "backend"))
+# Settings require these at import time; only --record talks to the provider
+for var in ("SUPABASE_URL", "SUPABASE_KEY", "SUPABASE_SERVICE_KEY", "CLAUDE_API_KEY"):
+    os.environ.setdefault(var, "benchmark")
+
+from app.core.config import settings  # noqa: E402
+from app.core.llm_routing import estimate_cost, model_for  # noqa: E402
+from app.core.llm_scheduler import estimate_tokens  # noqa: E402
+from app.export import service as export_module  # noqa: E402
+from app.jobs import service as jobs_module  # noqa: E402
+from app.resume import parser as parser_module  # noqa: E402
+
+# Minimum prompt prefix the provider will cache, per model (provider docs)
+MIN_CACHEABLE_TOKENS = {"claude-sonnet-4-5": 1024, "claude-haiku-4-5": 4096}
+
+
+async def capture_prompts() -> dict[str, list[list[dict]]]:
+    """Run the service code paths with a recording LLM stub"""
+    captured: dict[str, list[list[dict]]] = {}
+
+    def recorder(call_site: str, reply: str):
+        async def complete(messages, **kwargs):
+            captured.setdefault(call_site, []).append(messages)
+            return reply
+        return complete
+
+    resumes = sorted(p for p in (FIXTURES_DIR / "resumes").iterdir() if p.suffix in (".txt", ".md"))
+    jobs = sorted((FIXTURES_DIR / "jobs").glob("*.txt"))
+
+    # The parse reply is validated against the resume schema, so stub a complete one
+    parser_module.get_llm_response = recorder("resume.parse", json.dumps({
+        "personal_info": {"name": "", "email": ""}, "experience": [],
+        "skills": {"technical": [], "soft_skills": [], "tools": [], "languages": []},
+        "projects": [], "education": [],
+    }))
+    for path in resumes:
+        await parser_module.resume_parser._markdown_to_json(path.read_text())
+
+    jobs_module.get_llm_response = recorder("jobs.analyze", json.dumps({
+        "title": "", "company": "", "required_skills": [], "preferred_skills": [],
+        "technologies": [], "experience_level": "", "key_requirements": [],
+    }))
+    for path in jobs:
+        await jobs_module.job_analysis_service.analyze_job_description(path.read_text())
+
+    export_module.get_llm_response = recorder("export.categorize_skills", "{}")
+    for path in resumes:
+        expected = json.loads(path.with_name(f"{path.stem}.expected.json").read_text())
+        await export_module.export_service._llm_categorize_skills(expected["skills"])
+
+    return captured
+
+
+def split_tokens(messages: list[dict]) -> tuple[int, int]:
+    """(static system, dynamic user) token estimates for one prompt"""
+    static = [m for m in messages if m["role"] == "system"]
+    dynamic = [m for m in messages if m["role"] != "system"]
+    return estimate_tokens(static), estimate_tokens(dynamic)
+
+
+def project(captured: dict[str, list[list[dict]]]) -> None:
+    print(f"{'call site':<28}{'model':<20}{'static':>8}{'dynamic':>9}{'cacheable':>11}"
+          f"{'$/1k calls':>12}{'cached':>9}")
+    print("-" * 97)
+    for call_site, prompts in captured.items():
+        model = model_for(call_site)
+        static, dynamic = zip(*(split_tokens(m) for m in prompts))
+        static_tokens = static[0]
+        dynamic_tokens = statistics.mean(dynamic)
+        minimum = MIN_CACHEABLE_TOKENS.get(model, 1024)
+        cacheable = static_tokens >= minimum
+
+        total = static_tokens + dynamic_tokens
+        uncached = estimate_cost(model, total, 0) * 1000
+        # Steady state: every call reads the static prefix from cache
+        cached = estimate_cost(model, total, 0, cache_read_tokens=static_tokens) * 1000 if cacheable else uncached
+        print(f"{call_site:<28}{model:<20}{static_tokens:>8}{dynamic_tokens:>9.0f}"
+              f"{('yes' if cacheable else f'no (<{minimum})'):>11}{uncached:>12.4f}{cached:>9.4f}")
+
+    print("-" * 97)
+    print("Token counts are estimates (~4 chars/token); input cost only. Use --record for provider numbers.")
+
+
+def record(captured: dict[str, list[list[dict]]], output: Path, repeats: int) -> None:
+    from litellm import completion
+
+    def strip_cache_control(messages):
+        stripped = json.loads(json.dumps(messages))
+        for message in stripped:
+            if isinstance(message["content"], list):
+                for block in message["content"]:
+                    block.pop("cache_control", None)
+        return stripped
+
+    samples = []
+    for call_site, prompts in captured.items():
+        model = model_for(call_site)
+        for index, messages in enumerate(prompts):
+            for caching in (False, True):
+                payload = messages if caching else strip_cache_control(messages)
+                for attempt in range(repeats):
+                    start = time.perf_counter()
+                    ttft = None
+                    usage = {}
+                    stream = completion(
+                        model=model, messages=payload, temperature=0.1, stream=True,
+                        stream_options={"include_usage": True},
+                    )
+                    for chunk in stream:
+                        if ttft is None and chunk.choices and chunk.choices[0].delta.content:
+                            ttft = time.perf_counter() - start
+                        if getattr(chunk, "usage", None):
+                            usage = {
+                                "prompt_tokens": chunk.usage.prompt_tokens,
+                                "completion_tokens": chunk.usage.completion_tokens,
+                                "cache_read_input_tokens": getattr(chunk.usage, "cache_read_input_tokens", 0) or 0,
+                                "cache_creation_input_tokens": getattr(chunk.usage, "cache_creation_input_tokens", 0) or 0,
+                            }
+                    samples.append({
+                        "call_site": call_site, "model": model, "prompt": index, "caching": caching,
+                        "attempt": attempt, "ttft_ms": round((ttft or 0) * 1000, 1),
+                        "latency_ms": round((time.perf_counter() - start) * 1000, 1), "usage": usage,
+                    })
+                    print(f"  {call_site} #{index} caching={caching} attempt={attempt}: "
+                          f"ttft {samples[-1]['ttft_ms']} ms, usage {usage}")
+
+    output.write_text(json.dumps({"recorded_at": time.strftime("%Y-%m-%d"), "samples": samples}, indent=2))
+    print(f"Recorded {len(samples)} samples to {output}")
+
+
+def replay(path: Path) -> None:
+    samples = json.loads(path.read_text())["samples"]
+    print(f"{'call site':<28}{'caching':>8}{'ttft ms':>10}{'p95 ms':>9}{'input tok':>11}"
+          f"{'cache read':>12}{'input $':>10}")
+    print("-" * 88)
+    for call_site in sorted({s["call_site"] for s in samples}):
+        for caching in (False, True):
+            # Skip the first attempt with caching on: it pays the cache write
+            group = [s for s in samples if s["call_site"] == call_site and s["caching"] == caching
+                     and not (caching and s["attempt"] == 0)]
+            if not group:
+                continue
+            ttfts = [s["ttft_ms"] for s in group]
+            p95 = statistics.quantiles(ttfts, n=20)[-1] if len(ttfts) > 1 else ttfts[0]
+            prompt_tokens = statistics.mean(s["usage"].get("prompt_tokens", 0) for s in group)
+            cache_read = statistics.mean(s["usage"].get("cache_read_input_tokens", 0) for s in group)
+            cost = statistics.mean(
+                estimate_cost(s["model"], s["usage"].get("prompt_tokens", 0), 0,
+                              s["usage"].get("cache_read_input_tokens", 0),
+                              s["usage"].get("cache_creation_input_tokens", 0))
+                for s in group
+            )
+            print(f"{call_site:<28}{('on' if caching else 'off'):>8}{statistics.mean(ttfts):>10.1f}"
+                  f"{p95:>9.1f}{prompt_tokens:>11.0f}{cache_read:>12.0f}{cost:>10.5f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--record", type=Path, help="call the provider and save a recording")
+    parser.add_argument("--replay", type=Path, help="summarise a saved recording")
+    parser.add_argument("--repeats", type=int, default=3, help="calls per prompt and mode when recording")
+    args = parser.parse_args()
+
+    if args.replay:
+        replay(args.replay)
+        return
+
+    settings.llm_prompt_caching = True
+    captured = asyncio.run(capture_prompts())
+    if args.record:
+        record(captured, args.record, args.repeats)
+    else:
+        project(captured)
+
+
+if __name__ == "__main__":
+    main()
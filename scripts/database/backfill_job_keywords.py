@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Backfill script for the jobs.keywords column (migration 007).
+Computes normalized keywords for jobs analyzed before the column existed.
+Safe to re-run: only rows with no keywords are updated.
+"""
+
+import os
+import sys
+from pathlib import Path
+from supabase import create_client
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.core.skills import job_keywords  # noqa: E402
+
+def main():
+    # Load environment variables
+    load_dotenv()
+    
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_service_key = os.getenv("SUPABASE_SERVICE_KEY")
+    
+    if not supabase_url or not supabase_service_key:
+        print("Error: SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in .env")
+        return
+    
+    # Create Supabase client with service key (admin privileges)
+    supabase = create_client(supabase_url, supabase_service_key)
+    
+    try:
+        rows = supabase.table("jobs").select("id, analysis").is_("keywords", "null").execute().data
+    except Exception as e:
+        print(f"❌ Could not read jobs: {e}")
+        print("Note: apply supabase/migrations/007_add_job_keywords.sql first")
+        return
+    
+    updated = 0
+    for row in rows:
+        try:
+            supabase.table("jobs").update(
+                {"keywords": job_keywords(row.get("analysis") or {})}
+            ).eq("id", row["id"]).execute()
+            updated += 1
+        except Exception as e:
+            print(f"❌ Failed to backfill job {row['id']}: {e}")
+    
+    print(f"✅ Backfilled keywords for {updated}/{len(rows)} jobs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+-- Store each /optimize run per resume and job
+-- Section content hashes let a rerun reuse suggestions for unchanged sections
+
+ALTER TABLE optimizations ADD COLUMN IF NOT EXISTS section_hashes JSONB;
+ALTER TABLE optimizations ADD COLUMN IF NOT EXISTS suggestions JSONB;
+ALTER TABLE optimizations ADD COLUMN IF NOT EXISTS ats_score JSONB;
+
+-- One stored run per resume/job pair (upsert target)
+CREATE UNIQUE INDEX IF NOT EXISTS optimizations_resume_job_idx ON optimizations (resume_id, job_id);
+
+-- Add comments for documentation
+COMMENT ON COLUMN optimizations.section_hashes IS 'Content hashes of the job, skills and each enhanced experience role at the time of the run.';
+COMMENT ON COLUMN optimizations.suggestions IS 'Suggestions grouped by section: {"keywords": [...], "experience": {role_hash: [...]}}.';
+COMMENT ON COLUMN optimizations.ats_score IS 'ATS score of the run; its keyword match is reused while skills are unchanged.';
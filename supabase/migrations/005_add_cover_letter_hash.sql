@@ -0,0 +1,7 @@
+-- Cache generated cover letters per resume and job
+-- optimizations.cover_letter is reused while the content hash still matches
+
+ALTER TABLE optimizations ADD COLUMN IF NOT EXISTS cover_letter_hash TEXT;
+
+-- Add comment for documentation
+COMMENT ON COLUMN optimizations.cover_letter_hash IS 'Content hash of the resume and job data the stored cover_letter was generated from.';
@@ -0,0 +1,7 @@
+-- Per-job interview question bank
+-- Questions depend only on the job analysis; generated on first optimization and reused
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS interview_questions JSONB;
+
+-- Add comment for documentation
+COMMENT ON COLUMN jobs.interview_questions IS 'Interview preparation questions generated for this job. NULL until the first optimization against it.';
@@ -0,0 +1,8 @@
+-- Precomputed job keywords for ATS matching
+-- Alias-resolved keys of required_skills and technologies, written at /jobs/analyze.
+-- Existing rows: run scripts/database/backfill_job_keywords.py (rows left NULL are computed on read)
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS keywords JSONB;
+
+-- Add comment for documentation
+COMMENT ON COLUMN jobs.keywords IS 'Normalized skill keys {required_skills, technologies, all} derived from analysis via app.core.skills.job_keywords.';